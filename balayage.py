@@ -0,0 +1,159 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields, replace
+
+import numpy as np
+
+import physique_roue as phys
+from integrateur import IntegrateurFixe, borner_etats
+
+
+# ==================== BALAYAGE DE PARAMÈTRES ====================
+# Chaque lot de jeux de paramètres est simulé en une passe vectorisée
+# (derivee_vectorisee), et les lots sont répartis sur un pool de processus.
+
+# Indicateurs calculés pour chaque configuration
+METRIQUES = (
+    "vitesse_finale",           # m/s
+    "vitesse_max",              # m/s
+    "temp_surface_finale",      # °C
+    "temp_surface_max",         # °C
+    "temp_carcasse_finale",     # °C
+    "temp_carcasse_max",        # °C
+    "usure_finale",             # 0 à 1
+    "valide",                   # 1 si la simulation reste finie, 0 si elle diverge
+)
+
+
+def grille_parametres(base=phys.PARAMETRES_DEFAUT, **valeurs):
+    """
+    Construit le produit cartésien des valeurs données.
+
+    Exemple: grille_parametres(pac_b=[10, 12], mu_0=[1.6, 1.8]) -> 4 jeux
+
+    Args:
+        base: Jeu de paramètres de départ pour les champs non balayés
+        **valeurs: Nom de champ de Parametres -> liste de valeurs
+    Returns:
+        Liste d'instances de Parametres
+    """
+    noms = list(valeurs)
+    return [replace(base, **dict(zip(noms, combinaison)))
+            for combinaison in itertools.product(*valeurs.values())]
+
+
+def _derivee_lot(t, X, moment_accel, moment_frein, params):
+    return phys.derivee_vectorisee(X, moment_accel, moment_frein, params)
+
+
+def simuler_lot(liste_params, duree=10.0, pourcentage_accel=1.0, pourcentage_frein=0.0,
+                frequence=1000.0, etat_initial=phys.ETAT_INITIAL):
+    """
+    Simule un lot de configurations en parallèle (vectorisé) et relève
+    les indicateurs finaux et maximaux.
+
+    Args:
+        liste_params: Séquence de N instances de Parametres
+        duree: Durée simulée en s
+        pourcentage_accel: Pédale d'accélérateur entre 0 et 1
+        pourcentage_frein: Pédale de frein entre 0 et 1
+        frequence: Fréquence de l'intégrateur RK4 en Hz
+        etat_initial: État de départ commun
+    Returns:
+        Tableau (N, len(METRIQUES)) des indicateurs; NaN (et valide = 0)
+        pour une configuration qui diverge, sans arrêter les autres
+    """
+    params = phys.empiler_parametres(liste_params)
+    n = len(liste_params)
+    moment_accel = phys.get_couple_moteur(pourcentage_accel, params)
+    moment_frein = phys.get_couple_frein(pourcentage_frein, params)
+
+    integrateur = IntegrateurFixe(_derivee_lot, np.tile(etat_initial, (n, 1)),
+                                  frequence=frequence, projection=borner_etats,
+                                  verifier_fini=False)
+    etats = integrateur.etat
+    maxima = etats.copy()
+
+    with np.errstate(all="ignore"):
+        for _ in range(int(round(duree * frequence))):
+            integrateur.avancer(integrateur.pas, moment_accel, moment_frein, params)
+            # Une configuration qui diverge reste à NaN (maxima compris)
+            etats[~np.all(np.isfinite(etats), axis=1)] = np.nan
+            np.maximum(maxima, etats, out=maxima)
+
+    return np.column_stack([
+        etats[:, 0], maxima[:, 0],
+        etats[:, 2], maxima[:, 2],
+        etats[:, 3], maxima[:, 3],
+        etats[:, 4],
+        np.all(np.isfinite(etats), axis=1),
+    ])
+
+
+def _simuler_lot_kwargs(args):
+    liste_params, options = args
+    return simuler_lot(liste_params, **options)
+
+
+def executer_balayage(liste_params, processus=None, taille_lot=256, **options):
+    """
+    Répartit les configurations sur un pool de processus et rassemble les
+    résultats dans une seule table.
+
+    Args:
+        liste_params: Séquence de jeux de paramètres (voir grille_parametres)
+        processus: Nombre de processus (None = nombre de cœurs, 1 = sans pool)
+        taille_lot: Nombre de configurations simulées ensemble par tâche
+        **options: Scénario transmis à simuler_lot (duree, pourcentage_accel...)
+    Returns:
+        Tableau structuré NumPy: une ligne par configuration, une colonne par
+        paramètre qui varie puis une colonne par indicateur de METRIQUES
+        (vide, avec les seules colonnes de METRIQUES, pour une liste vide)
+    """
+    liste_params = list(liste_params)
+    if not liste_params:
+        # Rien à simuler: table vide, colonnes des indicateurs seulement
+        return np.empty(0, dtype=[(nom, float) for nom in METRIQUES])
+    lots = [liste_params[i:i + taille_lot] for i in range(0, len(liste_params), taille_lot)]
+    taches = [(lot, options) for lot in lots]
+
+    if processus is None:
+        processus = os.cpu_count() or 1
+
+    if processus == 1 or len(lots) == 1:
+        resultats = [_simuler_lot_kwargs(tache) for tache in taches]
+    else:
+        with ProcessPoolExecutor(max_workers=processus) as pool:
+            resultats = list(pool.map(_simuler_lot_kwargs, taches))
+
+    # Seuls les paramètres qui varient apparaissent dans la table
+    premier = liste_params[0]
+    variables = [champ.name for champ in fields(phys.Parametres)
+                 if any(getattr(p, champ.name) != getattr(premier, champ.name)
+                        for p in liste_params)]
+
+    table = np.empty(len(liste_params),
+                     dtype=[(nom, float) for nom in variables + list(METRIQUES)])
+    for nom in variables:
+        table[nom] = [getattr(p, nom) for p in liste_params]
+    metriques = np.vstack(resultats)
+    for i, nom in enumerate(METRIQUES):
+        table[nom] = metriques[:, i]
+
+    return table
+
+
+if __name__ == "__main__":
+    import time
+
+    grille = grille_parametres(pac_b=[10.0, 12.0, 14.0],
+                               mu_0=[1.6, 1.8, 2.0],
+                               transfert_air=[40.0, 60.0, 80.0])
+    debut = time.perf_counter()
+    table = executer_balayage(grille, duree=10.0)
+    print(f"{len(grille)} configurations en {time.perf_counter() - debut:.2f}s\n")
+
+    print(" ".join(f"{nom:>12.12}" for nom in table.dtype.names))
+    for ligne in table:
+        print(" ".join(f"{valeur:12.3f}" for valeur in ligne))
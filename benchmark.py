@@ -0,0 +1,272 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import replace
+
+import numpy as np
+
+import physique_roue as phys
+
+
+# ==================== BANC DE MESURE ====================
+# Mesure les performances du cœur physique et de la boucle de rendu sur
+# des scénarios fixes, et écrit un rapport JSON comparable d'une révision
+# à l'autre:
+#
+#   python benchmark.py --sortie base.json
+#   python benchmark.py --sortie nouveau.json
+#   python benchmark.py --comparer base.json nouveau.json
+#
+# Chaque durée est le minimum de REPETITIONS mesures (le moins bruité).
+
+REPETITIONS = 5
+ETATS_ECHANTILLON = 2000        # États de trajectoire utilisés pour derivee()
+TAILLE_LOT = 10000              # États par appel de derivee_vectorisee
+IMAGES_RENDU = 300              # Images mesurées en rendu headless
+SEUIL_REGRESSION = 0.10         # Écart relatif signalé par --comparer
+
+SCENARIOS = {
+    # nom: (état initial, pédale accélérateur, pédale frein, durée en s)
+    "pleine_acceleration": (phys.ETAT_INITIAL, 1.0, 0.0, 10.0),
+    "freinage_bloque": ([60.0, 60.0 / phys.RAYON, 95.0, 85.0, 0.0], 0.0, 1.0, 5.0),
+    "chauffe_longue": ([50.0, 50.0 / phys.RAYON, 60.0, 60.0, 0.0], 0.3, 0.0, 300.0),
+}
+
+# Sens d'amélioration de chaque mesure (+1: plus grand est mieux)
+SENS = {
+    "derivee_appels_par_s": +1,
+    "derivee_tabulee_appels_par_s": +1,
+    "vectorise_etats_par_s": +1,
+    "vectorise_tabule_etats_par_s": +1,
+    "traction_appels_par_s": +1,
+    "traction_tabulee_appels_par_s": +1,
+    "solve_ivp_s": -1,
+    "solve_ivp_nfev": -1,
+    "interface_ms": -1,
+    "particules_ms": -1,
+}
+
+
+def _chronometrer(fonction, repetitions=REPETITIONS):
+    """Meilleure durée (s) d'un appel de `fonction` sur `repetitions` essais."""
+    meilleure = float("inf")
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fonction()
+        meilleure = min(meilleure, time.perf_counter() - debut)
+    return meilleure
+
+
+def mesurer_scenario(nom, repetitions=REPETITIONS):
+    """
+    Mesure solve_ivp, derivee() et derivee_vectorisee() sur un scénario,
+    avec la Magic Formula analytique puis tabulée (pacejka_tabulee).
+
+    Args:
+        nom: Clé de SCENARIOS
+        repetitions: Nombre d'essais par mesure
+    Returns:
+        Dictionnaire des mesures (voir SENS)
+    """
+    from scipy.integrate import solve_ivp
+
+    etat, accel, frein, duree = SCENARIOS[nom]
+    moment_accel = phys.get_couple_moteur(accel)
+    moment_frein = phys.get_couple_frein(frein)
+    args = (moment_accel, moment_frein)
+
+    solution = None
+
+    def resoudre():
+        nonlocal solution
+        solution = solve_ivp(phys.derivee, (0.0, duree), etat, method='RK45',
+                             max_step=0.01, args=args)
+
+    temps_solveur = _chronometrer(resoudre, max(1, repetitions // 2))
+
+    # États rencontrés sur la trajectoire: les deux régimes sont représentés
+    indices = np.linspace(0, solution.y.shape[1] - 1, ETATS_ECHANTILLON).astype(int)
+    etats = solution.y[:, indices].T.copy()
+    etats_liste = etats.tolist()
+
+    def scalaire(params=phys.PARAMETRES_DEFAUT):
+        for X in etats_liste:
+            phys.derivee(0.0, X, moment_accel, moment_frein, params)
+
+    lot = np.resize(etats, (TAILLE_LOT, 5))
+    tabulee = replace(phys.PARAMETRES_DEFAUT, pacejka_tabulee=True)
+    temps_scalaire = _chronometrer(scalaire, repetitions)
+    temps_scalaire_tabulee = _chronometrer(lambda: scalaire(tabulee), repetitions)
+    temps_lot = _chronometrer(lambda: phys.derivee_vectorisee(lot, moment_accel, moment_frein),
+                              repetitions)
+    temps_lot_tabule = _chronometrer(
+        lambda: phys.derivee_vectorisee(lot, moment_accel, moment_frein, tabulee), repetitions)
+
+    # Force de Pacejka seule, aux (kappa, charge, friction) de la trajectoire
+    entrees = [(phys.calculer_glissement(X[0], X[1]),
+                phys.PARAMETRES_DEFAUT.charge_roue,
+                phys.calculer_friction(X[2], X[4])) for X in etats_liste]
+
+    def traction(params=phys.PARAMETRES_DEFAUT):
+        for kappa, charge, mu in entrees:
+            phys.calculer_force_traction(kappa, charge, mu, params)
+
+    temps_traction = _chronometrer(traction, repetitions)
+    temps_traction_tabulee = _chronometrer(lambda: traction(tabulee), repetitions)
+
+    return {
+        "derivee_appels_par_s": len(etats_liste) / temps_scalaire,
+        "derivee_tabulee_appels_par_s": len(etats_liste) / temps_scalaire_tabulee,
+        "vectorise_etats_par_s": TAILLE_LOT / temps_lot,
+        "vectorise_tabule_etats_par_s": TAILLE_LOT / temps_lot_tabule,
+        "traction_appels_par_s": len(entrees) / temps_traction,
+        "traction_tabulee_appels_par_s": len(entrees) / temps_traction_tabulee,
+        "solve_ivp_s": temps_solveur,
+        "solve_ivp_nfev": solution.nfev,
+    }
+
+
+def mesurer_rendu(images=IMAGES_RENDU):
+    """
+    Temps par image de dessiner_interface et de la mise à jour des
+    particules, avec les pilotes SDL factices (sans fenêtre ni son).
+
+    Args:
+        images: Nombre d'images mesurées
+    Returns:
+        Dictionnaire {"interface_ms", "particules_ms"} (médianes par image)
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    import simulation_visuelle as sv
+    sv.initialiser()
+
+    sl_accel = sv.Slider(40, 510, sv.LARGEUR_BOUTON, val=0.5, couleur=sv.VERT, label="Seuil gaz")
+    sl_frein = sv.Slider(520, 510, sv.LARGEUR_BOUTON, val=0.5, couleur=sv.ROUGE, label="Seuil frein")
+    btn_accel = pygame.Rect(40, 540, sv.LARGEUR_BOUTON, sv.HAUTEUR_BOUTON)
+    btn_frein = pygame.Rect(520, 540, sv.LARGEUR_BOUTON, sv.HAUTEUR_BOUTON)
+
+    # Patinage soutenu: le cas le plus chargé en particules
+    kappa = 0.6
+    temps_interface, temps_particules = [], []
+    particules = sv.PoolParticules(graine=0)
+    for i in range(images):
+        etat = [20.0 + 0.1 * i, 0.2 * i, 95.0, 85.0, 0.01]
+
+        debut = time.perf_counter()
+        sv.dessiner_interface(etat, kappa, 1.0, 0.0, sl_accel, sl_frein,
+                              btn_accel, btn_frein, True, False, w_reelle=80.0)
+        temps_interface.append(time.perf_counter() - debut)
+
+        debut = time.perf_counter()
+        particules.emettre(sv.CX, sv.CY + sv.RAYON_ROUE, -1, int(abs(kappa) * 5))
+        particules.update()
+        zone = particules.draw(sv.screen)
+        temps_particules.append(time.perf_counter() - debut)
+        sv.tableau.afficher(zone)
+
+    return {
+        "interface_ms": 1e3 * float(np.median(temps_interface)),
+        "particules_ms": 1e3 * float(np.median(temps_particules)),
+    }
+
+
+def _revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def executer(scenarios=None, rendu=True, repetitions=REPETITIONS):
+    """
+    Lance toutes les mesures.
+
+    Args:
+        scenarios: Noms de SCENARIOS à mesurer (None = tous)
+        rendu: Mesure aussi la boucle de rendu (pygame requis)
+        repetitions: Nombre d'essais par mesure
+    Returns:
+        Rapport sérialisable en JSON
+    """
+    rapport = {
+        "revision": _revision(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "scenarios": {},
+    }
+    for nom in scenarios or SCENARIOS:
+        rapport["scenarios"][nom] = mesurer_scenario(nom, repetitions)
+    if rendu:
+        rapport["rendu"] = mesurer_rendu()
+    return rapport
+
+
+def comparer(ancien, nouveau, seuil=SEUIL_REGRESSION):
+    """
+    Compare deux rapports mesure par mesure.
+
+    Args:
+        ancien, nouveau: Rapports renvoyés par executer()
+        seuil: Écart relatif au-delà duquel une dégradation est signalée
+    Returns:
+        Liste de (groupe, mesure, ancienne valeur, nouvelle valeur,
+        écart relatif, régression)
+    """
+    groupes = [("scenarios", nom) for nom in nouveau["scenarios"]] + [("rendu", None)]
+    lignes = []
+    for section, nom in groupes:
+        a = ancien.get(section, {})
+        b = nouveau.get(section, {})
+        if nom is not None:
+            a, b = a.get(nom, {}), b.get(nom, {})
+        for mesure, valeur in b.items():
+            if mesure not in a or not a[mesure]:
+                continue
+            ecart = valeur / a[mesure] - 1.0
+            regression = SENS[mesure] * ecart < -seuil
+            lignes.append((nom or section, mesure, a[mesure], valeur, ecart, regression))
+    return lignes
+
+
+def main(arguments=None):
+    """
+    Lance les mesures ou compare deux rapports (--comparer ANCIEN NOUVEAU).
+
+    Args:
+        arguments: Options de la ligne de commande (sys.argv[1:] par défaut)
+    """
+    if arguments is None:
+        arguments = sys.argv[1:]
+
+    if "--comparer" in arguments:
+        i = arguments.index("--comparer")
+        with open(arguments[i + 1]) as f:
+            ancien = json.load(f)
+        with open(arguments[i + 2]) as f:
+            nouveau = json.load(f)
+        lignes = comparer(ancien, nouveau)
+        print(f"{ancien.get('revision')} -> {nouveau.get('revision')}")
+        for groupe, mesure, a, b, ecart, regression in lignes:
+            marque = "  RÉGRESSION" if regression else ""
+            print(f"  {groupe:20s} {mesure:28s} {a:12.4g} -> {b:12.4g} ({ecart:+.1%}){marque}")
+        sys.exit(1 if any(ligne[-1] for ligne in lignes) else 0)
+
+    rapport = executer(rendu="--sans-rendu" not in arguments)
+    texte = json.dumps(rapport, indent=2)
+    if "--sortie" in arguments:
+        with open(arguments[arguments.index("--sortie") + 1], "w") as f:
+            f.write(texte + "\n")
+    print(texte)
+
+
+if __name__ == "__main__":
+    main()
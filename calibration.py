@@ -0,0 +1,261 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+
+import numpy as np
+from scipy.optimize import differential_evolution
+
+import physique_roue as phys
+from integrateur import IntegrateurFixe, borner_etats
+from telemetrie import ouvrir_telemetrie
+
+
+# ==================== CALIBRATION SUR TÉLÉMÉTRIE ====================
+# Le modèle est rejoué le long des pédales enregistrées, pour toute une
+# population de jeux de paramètres à la fois (derivee_vectorisee), et
+# comparé aux traces mesurées de vitesse, de rotation de roue et de
+# température de surface. La population de l'évolution différentielle
+# (scipy, vectorized=True) est évaluée en une passe, éventuellement
+# découpée en parts réparties sur un pool de processus.
+#
+# Le coût d'un jeu est la moyenne sur les canaux de l'erreur quadratique
+# normalisée par la variance mesurée (0 = ajustement parfait, 1 = pas
+# mieux que la moyenne de la trace).
+
+# Paramètres ajustés par défaut -> bornes (min, max)
+BORNES_DEFAUT = {
+    "pac_b": (4.0, 20.0),
+    "pac_c": (1.2, 2.0),
+    "pac_e": (0.8, 1.0),
+    "mu_0": (1.0, 2.5),
+    "transfert_interne": (10.0, 150.0),
+    "transfert_air": (10.0, 150.0),
+    "capacite_surface": (1000.0, 8000.0),
+    "capacite_carcasse": (1000.0, 10000.0),
+}
+
+# Canal comparé -> colonne de l'état
+CANAUX = {
+    "vx": 0,                    # m/s
+    "w": 1,                     # rad/s
+    "temp_ext": 2,              # °C
+}
+
+INTERVALLE_COMPARAISON = 0.05   # Pas de rééchantillonnage des traces en s
+COUT_INVALIDE = 1e6             # Coût d'une simulation qui diverge
+
+
+def charger_mesures(dossier, intervalle=INTERVALLE_COMPARAISON, debut=0.0, fin=None):
+    """
+    Lit un enregistrement de télémétrie et le rééchantillonne.
+
+    Args:
+        dossier: Dossier écrit par EnregistreurTelemetrie
+        intervalle: Pas minimal entre deux échantillons gardés en s
+        debut, fin: Fenêtre de temps gardée en s (fin=None: jusqu'au bout)
+    Returns:
+        Dictionnaire de tableaux (K,): t, accel, frein, les canaux de CANAUX,
+        et temp_int/usure s'ils ont été enregistrés (état initial)
+    Raises:
+        ValueError: Si une colonne indispensable manque ou s'il reste
+            moins de deux échantillons
+    """
+    colonnes = ouvrir_telemetrie(dossier)
+    manquantes = {"t", "accel", "frein", *CANAUX} - set(colonnes)
+    if manquantes:
+        raise ValueError(f"Colonnes absentes de la télémétrie: {', '.join(sorted(manquantes))}")
+
+    t = np.asarray(colonnes["t"])
+    fin = t[-1] if fin is None else fin
+    grille = np.arange(debut, fin + 0.5 * intervalle, intervalle)
+    indices = np.unique(np.clip(np.searchsorted(t, grille), 0, len(t) - 1))
+    indices = indices[(t[indices] >= debut) & (t[indices] <= fin)]
+    if len(indices) < 2:
+        raise ValueError("Moins de deux échantillons dans la fenêtre demandée")
+
+    return {nom: np.array(colonnes[nom][indices])
+            for nom in ("t", "accel", "frein", "temp_int", "usure", *CANAUX)
+            if nom in colonnes}
+
+
+def _etat_initial(mesures):
+    return [mesures["vx"][0], mesures["w"][0], mesures["temp_ext"][0],
+            mesures["temp_int"][0] if "temp_int" in mesures else phys.ETAT_INITIAL[3],
+            mesures["usure"][0] if "usure" in mesures else 0.0]
+
+
+def _derivee_lot(t, X, moment_accel, moment_frein, params):
+    return phys.derivee_vectorisee(X, moment_accel, moment_frein, params)
+
+
+def simuler_traces(params, mesures, frequence=1000.0):
+    """
+    Rejoue le modèle le long des pédales mesurées pour N jeux de paramètres.
+    Les pédales d'un échantillon sont tenues jusqu'au suivant.
+
+    Args:
+        params: Parametres à champs scalaires ou tableaux (N,)
+        mesures: Dictionnaire renvoyé par charger_mesures
+        frequence: Fréquence de l'intégrateur RK4 en Hz
+    Returns:
+        Tableau (N, K, len(CANAUX)) des canaux simulés aux instants mesurés;
+        une simulation qui diverge donne NaN à partir de l'instant fautif
+    """
+    t = mesures["t"]
+    taille = max([np.size(v) for v in vars(params).values()])
+    integrateur = IntegrateurFixe(_derivee_lot, np.tile(_etat_initial(mesures), (taille, 1)),
+                                  frequence=frequence, projection=borner_etats,
+                                  sous_pas_max=10**9, verifier_fini=False)
+    colonnes = list(CANAUX.values())
+    traces = np.empty((taille, len(t), len(CANAUX)))
+    traces[:, 0] = integrateur.etat[:, colonnes]
+
+    with np.errstate(all="ignore"):
+        for k in range(len(t) - 1):
+            etats = integrateur.avancer(t[k + 1] - t[k],
+                                        phys.get_couple_moteur(mesures["accel"][k], params),
+                                        phys.get_couple_frein(mesures["frein"][k], params),
+                                        params)
+            # Un jeu qui diverge reste à NaN (COUT_INVALIDE) sans arrêter le lot
+            etats[~np.all(np.isfinite(etats), axis=1)] = np.nan
+            traces[:, k + 1] = etats[:, colonnes]
+    return traces
+
+
+def erreurs_normalisees(traces, mesures):
+    """
+    Erreur quadratique moyenne de chaque canal, divisée par la variance mesurée.
+
+    Args:
+        traces: Tableau (N, K, len(CANAUX)) de simuler_traces
+        mesures: Dictionnaire renvoyé par charger_mesures
+    Returns:
+        Tableau (N, len(CANAUX)); COUT_INVALIDE là où la simulation diverge
+    """
+    mesure = np.column_stack([mesures[nom] for nom in CANAUX])
+    variance = np.maximum(mesure.var(axis=0), 1e-12)
+    with np.errstate(all="ignore"):
+        erreurs = np.mean((traces - mesure) ** 2, axis=1) / variance
+    return np.where(np.isfinite(erreurs), erreurs, COUT_INVALIDE)
+
+
+def _evaluer_part(args):
+    # x: (nombre de paramètres ajustés, n) -> coûts (n,)
+    x, noms, base, mesures, frequence = args
+    params = replace(base, **dict(zip(noms, x)))
+    return erreurs_normalisees(simuler_traces(params, mesures, frequence), mesures).mean(axis=1)
+
+
+class _Objectif:
+    """Coût vectorisé pour differential_evolution, avec pool optionnel."""
+
+    def __init__(self, noms, base, mesures, frequence, pool, parts):
+        self.noms = noms
+        self.base = base
+        self.mesures = mesures
+        self.frequence = frequence
+        self.pool = pool
+        self.parts = parts
+        self.evaluations = 0
+
+    def __call__(self, x):
+        x = np.atleast_2d(np.asarray(x, dtype=float).T).T    # (S,) -> (S, 1)
+        self.evaluations += x.shape[1]
+        if self.pool is None or x.shape[1] < 2:
+            return _evaluer_part((x, self.noms, self.base, self.mesures, self.frequence))
+        morceaux = np.array_split(x, min(self.parts, x.shape[1]), axis=1)
+        return np.concatenate(list(self.pool.map(
+            _evaluer_part,
+            [(m, self.noms, self.base, self.mesures, self.frequence) for m in morceaux])))
+
+
+def calibrer(mesures, bornes=None, base=phys.PARAMETRES_DEFAUT, frequence=1000.0,
+             processus=1, population=8, iterations_max=30, tolerance=1e-3, graine=0,
+             affichage=False):
+    """
+    Ajuste les paramètres sur les traces mesurées (évolution différentielle bornée).
+
+    Args:
+        mesures: Dictionnaire renvoyé par charger_mesures
+        bornes: Nom de champ de Parametres -> (min, max) (BORNES_DEFAUT)
+        base: Valeurs des champs non ajustés
+        frequence: Fréquence de l'intégrateur RK4 en Hz
+        processus: 1 = population évaluée dans ce processus, sinon nombre de
+            processus qui se la partagent (None = nombre de cœurs)
+        population: Multiplicateur de taille de population (popsize de scipy)
+        iterations_max: Nombre maximal de générations
+        tolerance: Tolérance relative d'arrêt sur la dispersion des coûts
+        graine: Graine de l'optimiseur (même graine = même résultat)
+        affichage: Affiche la progression à chaque génération
+    Returns:
+        Dictionnaire: "params" (Parametres ajustés), "valeurs" (nom -> valeur),
+        "cout", "erreurs" (canal -> erreur normalisée), "rmse" (canal ->
+        erreur en unités du canal), "r2" (canal -> coefficient de
+        détermination), "evaluations", "generations", "succes", "message"
+    """
+    bornes = BORNES_DEFAUT if bornes is None else bornes
+    noms = list(bornes)
+    if processus is None:
+        processus = os.cpu_count() or 1
+
+    pool = ProcessPoolExecutor(max_workers=processus) if processus > 1 else None
+    try:
+        objectif = _Objectif(noms, base, mesures, frequence, pool, processus)
+        resultat = differential_evolution(
+            objectif, [bornes[nom] for nom in noms], popsize=population,
+            maxiter=iterations_max, tol=tolerance, seed=graine, polish=False,
+            vectorized=True, updating="deferred", disp=affichage)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    valeurs = dict(zip(noms, (float(v) for v in resultat.x)))
+    params = replace(base, **valeurs)
+    erreurs = erreurs_normalisees(simuler_traces(params, mesures, frequence), mesures)[0]
+    mesure_var = {nom: float(np.var(mesures[nom])) for nom in CANAUX}
+    return {
+        "params": params,
+        "valeurs": valeurs,
+        "cout": float(erreurs.mean()),
+        "erreurs": dict(zip(CANAUX, erreurs.tolist())),
+        "rmse": {nom: float(np.sqrt(e * max(mesure_var[nom], 1e-12)))
+                 for nom, e in zip(CANAUX, erreurs)},
+        "r2": {nom: 1.0 - float(e) for nom, e in zip(CANAUX, erreurs)},
+        "evaluations": objectif.evaluations,
+        "generations": int(resultat.nit),
+        "succes": bool(resultat.success),
+        "message": resultat.message,
+    }
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from telemetrie import EnregistreurTelemetrie
+
+    # Trace "mesurée" synthétique: pneu plus raide et plus adhérent que le
+    # modèle par défaut; accélération, freinage appuyé puis relance
+    vrais = replace(phys.PARAMETRES_DEFAUT, pac_b=9.0, mu_0=1.95, transfert_air=45.0)
+    dossier = os.path.join(tempfile.gettempdir(), "telemetrie_calibration")
+    integrateur = IntegrateurFixe(phys.derivee, phys.ETAT_INITIAL, frequence=1000.0)
+    with EnregistreurTelemetrie(dossier, decimation=10, params=vrais) as enregistreur:
+        for n in range(12000):
+            t = n / 1000.0
+            accel, frein = (1.0, 0.0) if t < 6.0 else (0.0, 0.9) if t < 8.0 else (0.6, 0.0)
+            etat = integrateur.avancer(integrateur.pas, phys.get_couple_moteur(accel, vrais),
+                                       phys.get_couple_frein(frein, vrais), vrais)
+            enregistreur.ajouter(integrateur.t, etat, accel, frein)
+
+    mesures = charger_mesures(dossier)
+    bornes = {nom: BORNES_DEFAUT[nom] for nom in ("pac_b", "mu_0", "transfert_air")}
+    debut = time.perf_counter()
+    resultat = calibrer(mesures, bornes, population=6, iterations_max=12,
+                        processus=os.cpu_count())
+    ecoule = time.perf_counter() - debut
+
+    print(f"{resultat['evaluations']} simulations de 12 s en {ecoule:.1f}s "
+          f"({resultat['generations']} générations)")
+    for nom, valeur in resultat["valeurs"].items():
+        print(f"  {nom:15s} ajusté {valeur:8.3f}   vrai {getattr(vrais, nom):8.3f}")
+    for nom in CANAUX:
+        print(f"  {nom:10s} RMSE {resultat['rmse'][nom]:8.4f}   R² {resultat['r2'][nom]:.5f}")
@@ -0,0 +1,190 @@
+import argparse
+import json
+import sys
+
+
+# ==================== LIGNE DE COMMANDE ====================
+# Point d'entrée unique: python cli.py <commande> [options]
+#
+#   run      roulage sans interface à pas fixe (RK4), pédales constantes
+#   sweep    balayage de paramètres vectorisé (balayage.py)
+#   bench    mesures de performance (benchmark.py)
+#   view     simulation interactive (simulation_visuelle.py)
+#   replay   relecture d'une télémétrie (simulation_visuelle.py)
+#
+# Ce module n'importe que la bibliothèque standard: chaque commande importe
+# ce dont elle a besoin au moment où elle s'exécute. run et sweep ne
+# chargent ni pygame ni SciPy (un processus de calcul ne touche jamais à
+# SDL), et Numba n'est importé que si --backend le demande.
+
+BACKENDS_RUN = ("python", "numba", "auto")
+
+
+def _commande_run(options):
+    import physique_roue as phys
+
+    moment_accel = phys.get_couple_moteur(options.accel)
+    moment_frein = phys.get_couple_frein(options.frein)
+    if options.backend == "python":
+        # Chemin par défaut: pas d'import de physique_jit (ni de Numba)
+        from integrateur import IntegrateurFixe
+        nombre_pas = max(1, int(round(options.duree * options.frequence)))
+        integrateur = IntegrateurFixe(phys.derivee, phys.ETAT_INITIAL,
+                                      frequence=options.frequence, sous_pas_max=nombre_pas)
+        etat = integrateur.avancer(options.duree, moment_accel, moment_frein)
+    else:
+        import physique_jit
+        try:
+            physique_jit.definir_backend(options.backend)
+        except ValueError as erreur:
+            print(f"✗ {erreur}", file=sys.stderr)
+            return 2
+        etat, _ = physique_jit.integrer(phys.ETAT_INITIAL, options.duree, moment_accel,
+                                        moment_frein, frequence=options.frequence)
+
+    vx, w, temp_ext, temp_int, usure = (float(v) for v in etat)
+    if options.json:
+        print(json.dumps({"duree": options.duree, "vx": vx, "w": w, "temp_ext": temp_ext,
+                          "temp_int": temp_int, "usure": usure}))
+    else:
+        print(f"Résultats après {options.duree}s:")
+        print(f"  Vitesse véhicule: {vx*3.6:.1f} km/h")
+        print(f"  Vitesse angulaire: {w:.2f} rad/s")
+        print(f"  Température surface: {temp_ext:.1f}°C")
+        print(f"  Température carcasse: {temp_int:.1f}°C")
+        print(f"  Usure pneu: {abs(usure)*100:.2f}%")
+    return 0
+
+
+def _valeurs_balayees(textes):
+    # ["pac_b=10,12", "mu_0=1.6"] -> {"pac_b": [10.0, 12.0], "mu_0": [1.6]}
+    valeurs = {}
+    for texte in textes:
+        nom, _, liste = texte.partition("=")
+        if not nom or not liste:
+            raise ValueError(f"Paramètre mal formé: {texte} (attendu nom=v1,v2,...)")
+        valeurs[nom] = [float(v) for v in liste.split(",")]
+    return valeurs
+
+
+def _commande_sweep(options):
+    from dataclasses import fields
+    from balayage import executer_balayage, grille_parametres
+    from physique_roue import Parametres
+
+    try:
+        valeurs = _valeurs_balayees(options.param)
+        inconnus = set(valeurs) - {champ.name for champ in fields(Parametres)}
+        if inconnus:
+            raise ValueError(f"Paramètres inconnus: {', '.join(sorted(inconnus))}")
+    except ValueError as erreur:
+        print(f"✗ {erreur}", file=sys.stderr)
+        return 2
+    table = executer_balayage(grille_parametres(**valeurs), processus=options.processus,
+                              taille_lot=options.taille_lot, duree=options.duree, pourcentage_accel=options.accel,
+                              pourcentage_frein=options.frein, frequence=options.frequence)
+
+    if options.sortie:
+        import numpy as np
+        np.savetxt(options.sortie, np.column_stack([table[nom] for nom in table.dtype.names]),
+                   fmt="%.9g", delimiter=",", header=",".join(table.dtype.names), comments="")
+        print(f"{len(table)} configurations écrites dans {options.sortie}")
+    else:
+        print(" ".join(f"{nom:>12.12}" for nom in table.dtype.names))
+        for ligne in table:
+            print(" ".join(f"{valeur:12.3f}" for valeur in ligne))
+    return 0
+
+
+def _commande_bench(options):
+    import benchmark
+
+    arguments = []
+    if options.comparer:
+        arguments += ["--comparer", *options.comparer]
+    if options.sans_rendu:
+        arguments.append("--sans-rendu")
+    if options.sortie:
+        arguments += ["--sortie", options.sortie]
+    benchmark.main(arguments)
+    return 0
+
+
+def _commande_view(options):
+    import simulation_visuelle
+
+    simulation_visuelle.main(["--compteurs", options.compteurs] if options.compteurs else [])
+    return 0
+
+
+def _commande_replay(options):
+    import simulation_visuelle
+
+    simulation_visuelle.relecture(options.dossier)
+    return 0
+
+
+def construire_parseur():
+    """
+    Construit le parseur des sous-commandes.
+
+    Returns:
+        argparse.ArgumentParser (la commande choisie est dans `commande`)
+    """
+    parseur = argparse.ArgumentParser(prog="cli.py", description="Simulation de roue F1")
+    sous_parseurs = parseur.add_subparsers(dest="commande", required=True)
+
+    run = sous_parseurs.add_parser("run", help="roulage sans interface à pas fixe")
+    run.add_argument("--duree", type=float, default=10.0, help="durée simulée en s")
+    run.add_argument("--accel", type=float, default=1.0, help="pédale d'accélérateur (0 à 1)")
+    run.add_argument("--frein", type=float, default=0.0, help="pédale de frein (0 à 1)")
+    run.add_argument("--frequence", type=float, default=1000.0, help="fréquence RK4 en Hz")
+    run.add_argument("--backend", choices=BACKENDS_RUN, default="python",
+                     help="python (sans Numba, démarrage le plus court), numba ou auto")
+    run.add_argument("--json", action="store_true", help="état final en JSON sur une ligne")
+    run.set_defaults(executer=_commande_run)
+
+    sweep = sous_parseurs.add_parser("sweep", help="balayage de paramètres")
+    sweep.add_argument("--param", action="append", required=True, metavar="NOM=V1,V2,...",
+                       help="champ de Parametres et ses valeurs (répétable)")
+    sweep.add_argument("--duree", type=float, default=10.0, help="durée simulée en s")
+    sweep.add_argument("--accel", type=float, default=1.0, help="pédale d'accélérateur (0 à 1)")
+    sweep.add_argument("--frein", type=float, default=0.0, help="pédale de frein (0 à 1)")
+    sweep.add_argument("--frequence", type=float, default=1000.0, help="fréquence RK4 en Hz")
+    sweep.add_argument("--processus", type=int, default=None,
+                       help="processus du pool (défaut: un par cœur)")
+    sweep.add_argument("--taille-lot", type=int, default=256, help="configurations par lot")
+    sweep.add_argument("--sortie", help="fichier CSV des indicateurs")
+    sweep.set_defaults(executer=_commande_sweep)
+
+    bench = sous_parseurs.add_parser("bench", help="mesures de performance")
+    bench.add_argument("--sans-rendu", action="store_true", help="sans les mesures pygame")
+    bench.add_argument("--sortie", help="fichier JSON du rapport")
+    bench.add_argument("--comparer", nargs=2, metavar=("ANCIEN", "NOUVEAU"),
+                       help="compare deux rapports (code 1 si régression)")
+    bench.set_defaults(executer=_commande_bench)
+
+    view = sous_parseurs.add_parser("view", help="simulation interactive")
+    view.add_argument("--compteurs", metavar="FICHIER",
+                      help="relève les compteurs et écrit le rapport à la fermeture")
+    view.set_defaults(executer=_commande_view)
+
+    replay = sous_parseurs.add_parser("replay", help="relecture d'une télémétrie")
+    replay.add_argument("dossier", help="dossier écrit par EnregistreurTelemetrie")
+    replay.set_defaults(executer=_commande_replay)
+    return parseur
+
+
+def main(arguments=None):
+    """
+    Args:
+        arguments: Ligne de commande sans le nom du programme (sys.argv[1:] par défaut)
+    Returns:
+        Code de sortie
+    """
+    options = construire_parseur().parse_args(arguments)
+    return options.executer(options)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+import json
+import threading
+import time
+
+
+# ==================== COMPTEURS D'INSTRUMENTATION ====================
+# Compteurs des chemins chauds (appels de derivee par régime, bornages,
+# pas d'intégration) et durées des phases de la boucle d'affichage.
+# Désactivés par défaut: chaque point de mesure se réduit alors au test
+# `if compteurs.actif:` (toujours lire le drapeau par le module, jamais
+# par `from compteurs import actif`, qui en figerait la valeur).
+#
+# Compteurs relevés:
+#   derivee_basse_vitesse, derivee_dynamique   évaluations de la dérivée
+#       par régime (une par ligne pour derivee_vectorisee)
+#   bornage_force        saturation de la force par la friction (basse vitesse)
+#   bornage_kappa        glissement ramené dans [-1, 1]
+#   limitation_puissance couple moteur réduit par la puissance max
+#   garde_w, garde_vx    dérivées négatives annulées à l'arrêt
+#   projection_vx, projection_usure   corrections de borner_etat
+#   pas_fixes, pas_abandonnes          sous-pas de IntegrateurFixe
+#   pas_solveur, rejets_solveur        pas de solve_ivp (voir solveur_compte)
+#   temps_simule         temps physique intégré en s
+#
+# Le fil physique et le fil d'affichage comptent en même temps: chaque fil
+# a son propre jeu de compteurs (sans verrou sur le chemin chaud), et
+# rapport() fait la somme des jeux. Les jeux des fils terminés sont versés
+# dans _cumul_termines puis oubliés, à chaque rapport() ou nouveau fil.
+
+actif = False
+_local = threading.local()
+_jeux = []                      # (fil, valeurs, phases) de chaque fil vivant qui a compté
+_cumul_termines = ({}, {})      # (valeurs, phases) des fils terminés
+_verrou = threading.Lock()      # Protège _jeux et _cumul_termines
+_top = 0.0
+
+# Ordre d'affichage des phases de la boucle de simulation_visuelle
+PHASES_IMAGE = ("evenements", "physique", "dessin", "particules", "flip")
+
+
+def activer(etat=True):
+    """Active (ou désactive) le relevé des compteurs."""
+    global actif
+    actif = etat
+
+
+def _fusionner(compte, durees, valeurs, phases):
+    # Ajoute un jeu à (compte, durees); la dernière durée est celle du
+    # dernier jeu fusionné
+    for nom, n in valeurs.items():
+        compte[nom] = compte.get(nom, 0) + n
+    for nom, (cumul, nombre, derniere) in phases.items():
+        if nom in durees:
+            durees[nom][0] += cumul
+            durees[nom][1] += nombre
+            durees[nom][2] = derniere
+        else:
+            durees[nom] = [cumul, nombre, derniere]
+
+
+def _verser_termines():
+    # Verse les jeux des fils terminés dans _cumul_termines (sous _verrou).
+    # Un fil terminé n'écrit plus dans son jeu: la lecture est sûre.
+    vivants = []
+    for fil, valeurs, phases in _jeux:
+        if fil.is_alive():
+            vivants.append((fil, valeurs, phases))
+        else:
+            _fusionner(*_cumul_termines, valeurs, phases)
+    _jeux[:] = vivants
+
+
+def _jeu():
+    # Jeu de compteurs du fil courant: valeurs (nom -> nombre, ou durée pour
+    # temps_simule) et phases (nom -> [cumul en s, nombre, dernière durée en s])
+    try:
+        return _local.jeu
+    except AttributeError:
+        _local.jeu = ({}, {})
+        with _verrou:
+            _verser_termines()
+            _jeux.append((threading.current_thread(), *_local.jeu))
+        return _local.jeu
+
+
+def reinitialiser():
+    """Remet tous les compteurs et toutes les phases à zéro (tous les fils)."""
+    with _verrou:
+        _verser_termines()
+        for valeurs, phases in (_cumul_termines, *(jeu[1:] for jeu in _jeux)):
+            valeurs.clear()
+            phases.clear()
+
+
+def compter(nom, n=1):
+    """Ajoute `n` au compteur `nom` (appeler sous `if compteurs.actif:`)."""
+    valeurs = _jeu()[0]
+    valeurs[nom] = valeurs.get(nom, 0) + n
+
+
+def ajouter_duree(nom, duree):
+    """Cumule une durée mesurée pour la phase `nom`."""
+    phases = _jeu()[1]
+    phase = phases.get(nom)
+    if phase is None:
+        phases[nom] = [duree, 1, duree]
+    else:
+        phase[0] += duree
+        phase[1] += 1
+        phase[2] = duree
+
+
+def debut_image():
+    """Point de départ des phases de l'image courante."""
+    global _top
+    if actif:
+        _top = time.perf_counter()
+
+
+def fin_phase(nom):
+    """Attribue à `nom` le temps écoulé depuis la phase précédente de l'image."""
+    global _top
+    if not actif:
+        return
+    maintenant = time.perf_counter()
+    ajouter_duree(nom, maintenant - _top)
+    _top = maintenant
+
+
+def solveur_compte(classe):
+    """
+    Sous-classe d'un solveur de scipy (OdeSolver) qui compte ses pas.
+    S'utilise comme `method` de solve_ivp.
+
+    Les rejets sont déduits des évaluations faites pendant le pas, ce qui
+    n'est exact que pour les Runge-Kutta explicites (RK23, RK45, DOP853):
+    pour les autres méthodes seuls les pas acceptés sont comptés.
+
+    Args:
+        classe: Classe de solveur (par exemple scipy.integrate.RK45)
+    Returns:
+        Classe dérivée instrumentée
+    """
+    etages = getattr(classe, "n_stages", None)
+
+    class SolveurCompte(classe):
+        def _step_impl(self):
+            t, nfev = self.t, self.nfev
+            resultat = super()._step_impl()
+            if actif:
+                compter("pas_solveur")
+                compter("temps_simule", abs(self.t - t))
+                if etages:
+                    compter("rejets_solveur", max(0, (self.nfev - nfev) // etages - 1))
+            return resultat
+
+    SolveurCompte.__name__ = classe.__name__
+    return SolveurCompte
+
+
+def rapport():
+    """
+    Rassemble compteurs, phases et grandeurs dérivées.
+
+    Returns:
+        Dictionnaire sérialisable en JSON: "compteurs", "phases" (nom ->
+        cumul_s, nombre, moyenne_ms, derniere_ms) et "derives"
+        (evaluations_par_seconde_simulee, part_dynamique)
+    """
+    # Copies d'abord (les autres fils continuent de compter), puis somme des
+    # jeux, en partant du cumul des fils terminés
+    with _verrou:
+        _verser_termines()
+        jeux = [(dict(valeurs), {nom: list(phase) for nom, phase in dict(phases).items()})
+                for _, valeurs, phases in _jeux]
+        compte = dict(_cumul_termines[0])
+        durees = {nom: list(phase) for nom, phase in _cumul_termines[1].items()}
+    for valeurs, phases in jeux:
+        _fusionner(compte, durees, valeurs, phases)
+    evaluations = compte.get("derivee_basse_vitesse", 0) + compte.get("derivee_dynamique", 0)
+    temps = compte.get("temps_simule", 0.0)
+    # Solveurs qui appellent les régimes sans passer par derivee (segments)
+    evaluations_totales = evaluations or compte.get("evaluations_solveur", 0)
+    return {
+        "compteurs": compte,
+        "phases": {nom: {"cumul_s": cumul, "nombre": nombre,
+                         "moyenne_ms": 1e3 * cumul / nombre, "derniere_ms": 1e3 * derniere}
+                   for nom, (cumul, nombre, derniere) in durees.items()},
+        "derives": {
+            "evaluations_par_seconde_simulee": evaluations_totales / temps if temps else None,
+            "part_dynamique": (compte.get("derivee_dynamique", 0) / evaluations
+                               if evaluations else None),
+        },
+    }
+
+
+def lignes_resume():
+    """Résumé lisible en quelques lignes (console ou surimpression)."""
+    r = rapport()
+    ordre = {nom: i for i, nom in enumerate(PHASES_IMAGE)}
+    lignes = [f"{nom:11s} {r['phases'][nom]['moyenne_ms']:6.2f} ms"
+              for nom in sorted(r["phases"], key=lambda nom: ordre.get(nom, len(ordre)))]
+    derives = r["derives"]
+    if derives["evaluations_par_seconde_simulee"] is not None:
+        lignes.append(f"dérivées/s sim. {derives['evaluations_par_seconde_simulee']:,.0f}")
+    if derives["part_dynamique"] is not None:
+        lignes.append(f"régime dynamique {100 * derives['part_dynamique']:.1f} %")
+    compte = r["compteurs"]
+    bornages = sum(compte.get(nom, 0) for nom in (
+        "bornage_force", "bornage_kappa", "garde_w", "garde_vx",
+        "projection_vx", "projection_usure"))
+    lignes.append(f"bornages {bornages:,}")
+    if "pas_solveur" in compte:
+        rejets = compte.get("rejets_solveur")
+        lignes.append(f"pas solveur {compte['pas_solveur']:,}"
+                      + (f" (rejets {rejets:,})" if rejets is not None else ""))
+    if "pas_fixes" in compte:
+        lignes.append(f"pas fixes {compte['pas_fixes']:,} "
+                      f"(abandonnés {compte.get('pas_abandonnes', 0):,})")
+    return lignes
+
+
+def ecrire(chemin):
+    """Écrit le rapport des compteurs dans un fichier JSON."""
+    with open(chemin, "w") as fichier:
+        json.dump(rapport(), fichier, indent=2)
+
+
+if __name__ == "__main__":
+    import timeit
+    import compteurs            # Le module importé par la physique, pas __main__
+    import physique_roue as phys
+    from integrateur import IntegrateurFixe
+
+    X = [30.0, 95.0, 100.0, 90.0, 0.0]
+    for etat in (False, True):
+        compteurs.activer(etat)
+        duree = min(timeit.repeat(lambda: phys.derivee(0.0, X, 2000.0, 0.0),
+                                  number=20000, repeat=5)) / 20000
+        print(f"derivee, compteurs {'actifs' if etat else 'inactifs'}: {duree*1e6:.2f} µs")
+
+    compteurs.reinitialiser()
+    integrateur = IntegrateurFixe(phys.derivee, phys.ETAT_INITIAL, sous_pas_max=10**6)
+    integrateur.avancer(5.0, phys.get_couple_moteur(1.0), 0.0)
+    integrateur.avancer(5.0, 0.0, phys.get_couple_frein(1.0))
+    print("\n".join(compteurs.lignes_resume()))
@@ -0,0 +1,312 @@
+import numpy as np
+
+import physique_roue as phys
+
+
+# ==================== RÉGIME PERMANENT ET AVANCE RAPIDE ====================
+# À vitesse et glissement constants, les équations thermiques de derivee()
+# sont linéaires en (temp_ext, temp_int) pour une puissance de glissement
+# donnée:
+#
+#   C dT/dt = -M T + b(P),   M = [[ti + ta, -ti], [-ti, ti + ta]]
+#
+# Le point fixe est la solution de M T = b(P). La puissance dépend de la
+# friction, donc de temp_ext: on résout ce couplage par Newton sur temp_ext,
+# le glissement étant imposé ou, en croisière à vitesse constante, donné à
+# chaque itération par l'équilibre mécanique (la traction équilibre traînée
+# et roulement, Newton imbriqué).
+#
+# L'avance rapide franchit une croisière par grands pas: à chaque pas, le
+# glissement est celui de l'équilibre mécanique (quasi statique) pour la
+# température courante, et la thermique avance de façon exacte par la
+# solution exponentielle du système linéaire à puissance constante.
+
+TOLERANCE = 1e-6                # Tolérance de Newton sur la température (°C)
+TOLERANCE_FORCE = 1e-12         # Tolérance relative du glissement de croisière
+ITERATIONS_MAX = 50
+PAS_BALAYAGE = 5.0              # Pas du balayage qui encadre l'équilibre (°C)
+PAS_AVANCE_RAPIDE = 1.0         # Pas de l'avance rapide en s
+
+
+def _matrices_thermiques(params):
+    # C (diagonale) et M du système C dT/dt = -M T + b
+    ti, ta = params.transfert_interne, params.transfert_air
+    capacites = np.array([params.capacite_surface, params.capacite_carcasse])
+    return capacites, np.array([[ti + ta, -ti], [-ti, ti + ta]])
+
+
+def _second_membre(puissance_friction, params):
+    ta_amb = params.transfert_air * params.temp_ambiante
+    return np.array([puissance_friction + ta_amb, ta_amb])
+
+
+def equilibre_thermique(puissance_friction, params=phys.PARAMETRES_DEFAUT):
+    """
+    Températures d'équilibre pour une puissance de glissement constante.
+
+    Args:
+        puissance_friction: Puissance dissipée dans la surface en W
+        params: Jeu de paramètres
+    Returns:
+        (temp_ext, temp_int) en °C
+    """
+    _, M = _matrices_thermiques(params)
+    temp_ext, temp_int = np.linalg.solve(M, _second_membre(puissance_friction, params))
+    return float(temp_ext), float(temp_int)
+
+
+def _pente_thermique(params):
+    # d(temp_ext d'équilibre) / d(puissance)
+    ti, ta = params.transfert_interne, params.transfert_air
+    return (ti + ta) / ((ti + ta) ** 2 - ti ** 2)
+
+
+def charge_dynamique(vx, params=phys.PARAMETRES_DEFAUT):
+    """Charge par roue en kg avec l'appui aérodynamique, comme derivee()."""
+    return params.charge_roue + params.coeff_appui * vx**2 / (params.nombre_roues * params.gravite)
+
+
+def vitesse_glissement(vx, kappa):
+    """
+    Vitesse de la roue r*w et vitesse de glissement |r*w - vx| pour un
+    glissement donné (inverse de calculer_glissement hors basse vitesse).
+
+    Returns:
+        (vitesse_roue, vitesse_glissement, d(vitesse_glissement)/dkappa)
+    """
+    if kappa >= 0.0:
+        vitesse_roue = vx / (1.0 - kappa)
+        return vitesse_roue, vitesse_roue - vx, vx / (1.0 - kappa) ** 2
+    return vx * (1.0 + kappa), -vx * kappa, -vx
+
+
+def _friction(temp_ext, usure, params):
+    # (mu, dmu/dtemp_ext)
+    mu = phys.calculer_friction(temp_ext, usure, params)
+    return mu, -2.0 * (temp_ext - params.temp_ideale) / params.plage_temp**2 * mu
+
+
+def force_croisiere(vx, params=phys.PARAMETRES_DEFAUT):
+    """Force de traction par roue qui maintient la vitesse vx (traînée + roulement)."""
+    charge = charge_dynamique(vx, params)
+    return (params.coeff_trainee * vx**2
+            + params.coeff_roulement * charge * params.gravite * params.nombre_roues
+            ) / params.nombre_roues
+
+
+def _glissement_croisiere(vx, temp_ext, usure, kappa, params):
+    # Newton 1D sur la traction à température figée (équilibre mécanique).
+    # La force de Pacejka est concave croissante jusqu'au pic: depuis un
+    # glissement plus faible que la solution, Newton converge sans la dépasser.
+    charge = charge_dynamique(vx, params)
+    cible = force_croisiere(vx, params)
+    mu = phys.calculer_friction(temp_ext, usure, params)
+    for _ in range(ITERATIONS_MAX):
+        ecart = phys.calculer_force_traction(kappa, charge, mu, params) - cible
+        if abs(ecart) < TOLERANCE_FORCE * cible:
+            return kappa, cible
+        pente = phys.calculer_derivee_traction(kappa, charge, mu, params)
+        if pente <= 0.0:
+            break
+        kappa = float(kappa - ecart / pente)
+    raise RuntimeError(f"Pas de glissement de croisière (vx={vx:.1f} m/s, "
+                       f"temp_ext={temp_ext:.1f}°C): traction demandée au-delà du pic")
+
+
+def regime_permanent(vx, kappa=None, usure=0.0, params=phys.PARAMETRES_DEFAUT):
+    """
+    Résout directement le point fixe thermique à vitesse constante.
+
+    Le résidu r(T) = T - temp_ext d'équilibre(puissance(T)) peut avoir
+    plusieurs racines; seules celles où r croît sont stables (un pneu un peu
+    trop chaud y refroidit). On garde la plus chaude: balayage descendant
+    jusqu'au premier changement de signe de + à -, puis Newton gardé dans
+    cet encadrement.
+
+    Args:
+        vx: Vitesse du véhicule en m/s (régime dynamique)
+        kappa: Glissement imposé, ou None pour la croisière (glissement
+            qui équilibre traînée et roulement)
+        usure: Usure supposée constante (0 à 1)
+        params: Jeu de paramètres
+    Returns:
+        Dictionnaire: "etat" ([vx, w, temp_ext, temp_int, usure]), "kappa",
+        "force_traction", "puissance_friction", "friction", "moment_accel"
+        (couple moteur total qui tient ce régime), "iterations"
+    Raises:
+        ValueError: Si vx est sous le seuil du régime dynamique
+        RuntimeError: Si aucun équilibre stable n'existe (croisière
+            intenable) ou si Newton ne converge pas
+    """
+    if vx < params.vitesse_min_dynamique:
+        raise ValueError(f"Vitesse sous le régime dynamique: {vx} m/s")
+    charge = charge_dynamique(vx, params)
+    pente_thermique = _pente_thermique(params)
+
+    def evaluer(temp_ext, k):
+        # Résidu thermique et sa dérivée à temp_ext donnée (None: pas de
+        # glissement de croisière à cette température, friction trop faible)
+        if kappa is None:
+            try:
+                k, _ = _glissement_croisiere(vx, temp_ext, usure, k, params)
+            except RuntimeError:
+                return None
+        mu, dmu = _friction(temp_ext, usure, params)
+        force = phys.calculer_force_traction(k, charge, mu, params)
+        _, glissement, dglissement = vitesse_glissement(vx, k)
+        puissance = abs(force) * glissement
+        dF_dT = force * dmu / mu if mu else 0.0
+        if kappa is None:
+            # Force fixée par la croisière: la température agit par le glissement
+            dk_dT = -dF_dT / phys.calculer_derivee_traction(k, charge, mu, params)
+            dP_dT = abs(force) * dglissement * dk_dT
+        else:
+            dP_dT = np.sign(force) * dF_dT * glissement
+        residu = temp_ext - equilibre_thermique(puissance, params)[0]
+        return residu, 1.0 - pente_thermique * dP_dT, k, force, mu, puissance
+
+    # Borne haute où r > 0: au-delà de la friction qui s'effondre, ou de
+    # l'équilibre de la puissance maximale (friction idéale) si kappa est imposé
+    haut = params.temp_ideale + 3.0 * params.plage_temp
+    if kappa is not None:
+        _, glissement, _ = vitesse_glissement(vx, kappa)
+        mu_max = phys.calculer_friction(params.temp_ideale, usure, params)
+        puissance_max = abs(phys.calculer_force_traction(kappa, charge, mu_max, params)) * glissement
+        haut = max(haut, equilibre_thermique(puissance_max, params)[0] + 1.0)
+
+    # Balayage descendant: encadrement [bas, haut] avec r(bas) < 0 < r(haut).
+    # En croisière, le domaine tenable est un intervalle de températures; à
+    # son bord froid le glissement monte vers le pic et r plonge, d'où une
+    # bissection vers ce bord quand le balayage le franchit.
+    k0 = 0.0 if kappa is None else float(kappa)
+    superieur, point = None, None
+    temp = haut
+    while True:
+        essai = evaluer(temp, k0)
+        if essai is None and superieur is not None:
+            tenable, intenable = haut, temp
+            for _ in range(ITERATIONS_MAX):
+                milieu = 0.5 * (tenable + intenable)
+                essai = evaluer(milieu, k0)
+                if essai is None:
+                    intenable = milieu
+                elif essai[0] > 0.0:
+                    tenable = haut = milieu
+                else:
+                    temp, point = milieu, essai
+                    break
+            superieur = None if point is None else superieur
+        elif essai is not None and essai[0] > 0.0:
+            superieur, haut = essai, temp
+        elif essai is not None and superieur is not None:
+            point = essai
+        if point is not None or temp <= params.temp_ambiante:
+            break
+        temp = max(temp - PAS_BALAYAGE, params.temp_ambiante)
+    if point is None:
+        raise RuntimeError(f"Pas d'équilibre thermique stable (vx={vx} m/s, kappa={kappa})")
+
+    # Newton gardé: un pas qui sort de l'encadrement est remplacé par la bissection
+    bas = temp_ext = temp
+    for iteration in range(1, ITERATIONS_MAX + 1):
+        residu, derivee_residu, k, force, mu, puissance = point
+        if abs(residu) < TOLERANCE or haut - bas < TOLERANCE:
+            break
+        if residu < 0.0:
+            bas = temp_ext
+        else:
+            haut = temp_ext
+        suivant = temp_ext - residu / derivee_residu if derivee_residu > 0.0 else np.inf
+        if not bas < suivant < haut:
+            suivant = 0.5 * (bas + haut)
+        temp_ext, point = float(suivant), evaluer(suivant, k0)
+    else:
+        raise RuntimeError(f"Newton n'a pas convergé en {ITERATIONS_MAX} itérations "
+                           f"(vx={vx} m/s, kappa={kappa})")
+
+    vitesse_roue, _, _ = vitesse_glissement(vx, k)
+    temp_ext, temp_int = equilibre_thermique(puissance, params)
+    return {
+        "etat": [vx, vitesse_roue / params.rayon, temp_ext, temp_int, usure],
+        "kappa": k,
+        "force_traction": float(force),
+        "puissance_friction": float(puissance),
+        "friction": float(mu),
+        "moment_accel": params.nombre_roues * float(force) * params.rayon,
+        "iterations": iteration,
+    }
+
+
+def avance_rapide(etat, duree, pas=PAS_AVANCE_RAPIDE, params=phys.PARAMETRES_DEFAUT):
+    """
+    Franchit une croisière à vitesse constante par pas thermiques exacts.
+
+    Args:
+        etat: [vx, w, temp_ext, temp_int, usure] au début de la croisière
+        duree: Durée de la croisière en s
+        pas: Durée d'un pas en s (puissance figée sur le pas)
+        params: Jeu de paramètres
+    Returns:
+        État [vx, w, temp_ext, temp_int, usure] à la fin de la croisière
+    Raises:
+        RuntimeError: Si l'équilibre mécanique n'est pas trouvé
+    """
+    vx, _, temp_ext, temp_int, usure = (float(v) for v in etat)
+    capacites, M = _matrices_thermiques(params)
+
+    # Système dT/dt = A T + C^-1 b avec A = -C^-1 M: A est semblable à une
+    # matrice symétrique (C^-1/2 M C^-1/2), donc diagonalisable en réel
+    racine = np.sqrt(capacites)
+    valeurs, vecteurs = np.linalg.eigh(M / np.outer(racine, racine))
+
+    kappa, t = 0.0, 0.0
+    while t < duree - 1e-12:
+        h = min(pas, duree - t)
+        kappa, force = _glissement_croisiere(vx, temp_ext, usure, kappa, params)
+        _, glissement, _ = vitesse_glissement(vx, kappa)
+        puissance = abs(force) * glissement
+
+        equilibre = np.array(equilibre_thermique(puissance, params))
+        ecart = racine * (np.array([temp_ext, temp_int]) - equilibre)
+        ecart = vecteurs @ (np.exp(-valeurs * h) * (vecteurs.T @ ecart))
+        temp_ext, temp_int = equilibre + ecart / racine
+
+        if abs(kappa) > params.seuil_usure:
+            usure = min(1.0, usure + kappa**2 / params.facteur_usure * h)
+        t += h
+
+    vitesse_roue, _, _ = vitesse_glissement(vx, kappa)
+    return [vx, vitesse_roue / params.rayon, float(temp_ext), float(temp_int), usure]
+
+
+if __name__ == "__main__":
+    import time
+    from integrateur import IntegrateurFixe
+
+    vx = 250.0 / 3.6
+    debut = time.perf_counter()
+    croisiere = regime_permanent(vx)
+    print(f"Croisière à 250 km/h: kappa {croisiere['kappa']:.4f}, "
+          f"surface {croisiere['etat'][2]:.2f}°C, carcasse {croisiere['etat'][3]:.2f}°C "
+          f"({croisiere['iterations']} itérations, "
+          f"{(time.perf_counter() - debut) * 1e3:.2f} ms)")
+    impose = regime_permanent(vx, kappa=0.08)
+    print(f"Glissement imposé 8 %: surface {impose['etat'][2]:.1f}°C, "
+          f"puissance {impose['puissance_friction'] / 1e3:.1f} kW")
+
+    # Avance rapide contre intégration complète: 120 s de croisière depuis
+    # des pneus chauds (sortie de freinage), au couple qui tient la croisière
+    depart = [vx, croisiere["etat"][1], 110.0, 95.0, 0.0]
+    debut = time.perf_counter()
+    rapide = avance_rapide(depart, 120.0)
+    duree_rapide = time.perf_counter() - debut
+
+    integrateur = IntegrateurFixe(phys.derivee, depart, frequence=1000.0, sous_pas_max=10**6)
+    debut = time.perf_counter()
+    complet = integrateur.avancer(120.0, croisiere["moment_accel"], 0.0)
+    duree_complete = time.perf_counter() - debut
+    print(f"120 s de croisière: avance rapide {duree_rapide * 1e3:.1f} ms, "
+          f"intégration 1 kHz {duree_complete:.1f} s")
+    print(f"  surface {rapide[2]:.2f} / {complet[2]:.2f}°C, "
+          f"carcasse {rapide[3]:.2f} / {complet[3]:.2f}°C, "
+          f"vx {rapide[0]*3.6:.2f} / {complet[0]*3.6:.2f} km/h")
@@ -0,0 +1,133 @@
+import queue
+import threading
+import time
+from collections import namedtuple
+
+import compteurs
+import physique_roue as phys
+from integrateur import IntegrateurFixe
+
+
+# ==================== FIL PHYSIQUE ====================
+# La physique tourne dans son propre fil, à pas fixe (1 kHz par défaut),
+# cadencée par l'horloge réelle et non par les images. Le rendu lit le
+# dernier instantané publié sans jamais attendre; les pédales arrivent par
+# une file (queue.SimpleQueue, sans verrou côté Python). Un ralentissement
+# du rendu ne change donc plus le pas d'intégration.
+
+FREQUENCE_DEFAUT = 1000.0       # Sous-pas de l'intégrateur en Hz
+PERIODE_REVEIL = 0.004          # Intervalle entre deux réveils du fil (s)
+RETARD_MAX = 0.1                # Retard rattrapé au maximum après un blocage (s)
+
+# Instantané publié par le fil: remplacé d'un bloc (affectation atomique),
+# jamais modifié sur place
+Instantane = namedtuple("Instantane", "t etat kappa accel frein nombre_pas")
+
+
+class FilPhysique(threading.Thread):
+    """
+    Fil d'intégration à pas fixe piloté par l'horloge réelle.
+    """
+
+    def __init__(self, etat_initial=phys.ETAT_INITIAL, frequence=FREQUENCE_DEFAUT,
+                 params=phys.PARAMETRES_DEFAUT, periode=PERIODE_REVEIL):
+        """
+        Args:
+            etat_initial: État de départ [vx, w, temp_ext, temp_int, usure]
+            frequence: Fréquence des sous-pas en Hz
+            params: Jeu de paramètres
+            periode: Intervalle entre deux réveils du fil en s
+        """
+        super().__init__(name="physique", daemon=True)
+        self.params = params
+        self.periode = periode
+        self.integrateur = IntegrateurFixe(
+            phys.derivee, etat_initial, frequence=frequence,
+            sous_pas_max=max(1, int(RETARD_MAX * frequence)))
+
+        self.commandes = queue.SimpleQueue()
+        self.erreur = None
+        self._accel, self._frein = 0.0, 0.0
+        self._arret = threading.Event()
+        self._publier()
+
+    def envoyer_pedales(self, pourcentage_accel, pourcentage_frein):
+        """Transmet les pédales au fil (appelé depuis le rendu, non bloquant)."""
+        self.commandes.put((pourcentage_accel, pourcentage_frein))
+
+    def _lire_commandes(self):
+        # Seule la dernière commande compte
+        try:
+            while True:
+                self._accel, self._frein = self.commandes.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _publier(self):
+        etat = self.integrateur.etat.tolist()
+        vx, w = etat[0], etat[1]
+        self.instantane = Instantane(
+            t=self.integrateur.t,
+            etat=etat,
+            kappa=float(phys.calculer_glissement(vx, w, self.params)),
+            accel=self._accel,
+            frein=self._frein,
+            nombre_pas=self.integrateur.nombre_pas,
+        )
+
+    def avancer(self, duree):
+        """
+        Lit les commandes en attente, intègre `duree` secondes et publie
+        l'instantané. Utilisable sans démarrer le fil (boucle synchrone).
+
+        Args:
+            duree: Durée réelle écoulée en s
+        """
+        debut = time.perf_counter() if compteurs.actif else None
+        self._lire_commandes()
+        p = self.params
+        self.integrateur.avancer(duree, phys.get_couple_moteur(self._accel, p),
+                                 phys.get_couple_frein(self._frein, p), p)
+        self._publier()
+        if debut is not None:
+            compteurs.ajouter_duree("physique_fil", time.perf_counter() - debut)
+
+    def run(self):
+        precedent = time.perf_counter()
+        while not self._arret.is_set():
+            maintenant = time.perf_counter()
+            try:
+                self.avancer(maintenant - precedent)
+            except FloatingPointError as erreur:
+                self.erreur = erreur
+                break
+            precedent = maintenant
+
+            # Réveil suivant aligné sur la période, sans dérive
+            attente = self.periode - (time.perf_counter() - maintenant)
+            if attente > 0:
+                self._arret.wait(attente)
+
+    def arreter(self, delai=1.0):
+        """Demande l'arrêt du fil et attend sa fin."""
+        self._arret.set()
+        if self.is_alive():
+            self.join(delai)
+
+
+if __name__ == "__main__":
+    fil = FilPhysique()
+    fil.start()
+    fil.envoyer_pedales(1.0, 0.0)
+
+    # Rendu simulé à 30 images/s avec des images lentes de temps en temps
+    debut = time.perf_counter()
+    for image in range(60):
+        time.sleep(0.1 if image % 15 == 0 else 1 / 30)
+        instantane = fil.instantane
+    fil.arreter()
+
+    ecoule = time.perf_counter() - debut
+    print(f"{ecoule:.2f}s réelles, {instantane.t:.3f}s simulées en "
+          f"{instantane.nombre_pas} pas de {fil.integrateur.pas*1e3:.1f} ms")
+    print(f"Vitesse {instantane.etat[0]*3.6:.1f} km/h, kappa {instantane.kappa:.3f}")
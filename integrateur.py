@@ -0,0 +1,349 @@
+import numpy as np
+
+import compteurs
+import physique_roue as phys
+
+
+# ==================== INTÉGRATEUR À PAS FIXE ====================
+# Remplace l'appel à solve_ivp à chaque image : l'état et les tampons de
+# calcul sont conservés d'un appel à l'autre, et le coût par image est
+# borné par le nombre maximal de sous-pas.
+
+METHODES = ("rk4", "euler_semi_implicite")
+
+
+def borner_etat(etat):
+    """
+    Ramène un état de roue dans son domaine physique (sur place).
+    Vitesse véhicule positive, usure entre 0 et 1.
+
+    Args:
+        etat: Tableau [vx, w, temp_ext, temp_int, usure]
+    """
+    if etat[0] < 0.0:
+        etat[0] = 0.0
+        if compteurs.actif:
+            compteurs.compter("projection_vx")
+    if etat[4] < 0.0:
+        etat[4] = 0.0
+        if compteurs.actif:
+            compteurs.compter("projection_usure")
+    elif etat[4] > 1.0:
+        etat[4] = 1.0
+        if compteurs.actif:
+            compteurs.compter("projection_usure")
+
+
+def borner_etats(etats):
+    """
+    Version vectorisée de borner_etat pour un tableau (N, 5) d'états.
+
+    Args:
+        etats: Tableau (N, 5) des états
+    """
+    np.maximum(etats[:, 0], 0.0, out=etats[:, 0])
+    np.clip(etats[:, 4], 0.0, 1.0, out=etats[:, 4])
+
+
+class IntegrateurFixe:
+    """
+    Intégrateur à pas fixe (RK4 ou Euler semi-implicite) qui garde son état
+    entre deux appels. Le temps non consommé d'un appel est reporté au suivant.
+    L'état peut être un vecteur (5,) ou un lot (N, 5) avec une fonction
+    dérivée vectorisée (projection=borner_etats dans ce cas).
+    """
+
+    def __init__(self, fonction, etat_initial, frequence=1000.0, methode="rk4",
+                 t0=0.0, projection=borner_etat, sous_pas_max=200, verifier_fini=True):
+        """
+        Args:
+            fonction: Dérivée f(t, X, *args) -> séquence de dérivées
+            etat_initial: État de départ
+            frequence: Fréquence des sous-pas en Hz
+            methode: "rk4" ou "euler_semi_implicite"
+            t0: Temps initial en s
+            projection: Fonction appliquée sur place à l'état après chaque
+                sous-pas (None pour désactiver)
+            sous_pas_max: Nombre maximal de sous-pas par appel à avancer()
+            verifier_fini: Lève FloatingPointError si l'état devient non fini
+                (False: les valeurs non finies sont laissées à l'appelant,
+                par exemple pour écarter les lignes divergentes d'un lot)
+        """
+        if methode not in METHODES:
+            raise ValueError(f"Méthode inconnue: {methode} (attendu: {', '.join(METHODES)})")
+
+        self.fonction = fonction
+        self.methode = methode
+        self.pas = 1.0 / frequence
+        self.projection = projection
+        self.sous_pas_max = sous_pas_max
+        self.verifier_fini = verifier_fini
+
+        self.etat = np.array(etat_initial, dtype=float)
+        self.t = float(t0)
+        self.nombre_pas = 0
+        self.reste = 0.0
+
+        # Tampons réutilisés à chaque sous-pas
+        self._k1 = np.empty_like(self.etat)
+        self._k2 = np.empty_like(self.etat)
+        self._k3 = np.empty_like(self.etat)
+        self._k4 = np.empty_like(self.etat)
+        self._tmp = np.empty_like(self.etat)
+        self._sauvegarde = np.empty_like(self.etat)
+
+    def _pas_rk4(self, args):
+        h = self.pas
+        t, X, tmp = self.t, self.etat, self._tmp
+        k1, k2, k3, k4 = self._k1, self._k2, self._k3, self._k4
+
+        k1[:] = self.fonction(t, X, *args)
+        np.multiply(k1, 0.5 * h, out=tmp); tmp += X
+        k2[:] = self.fonction(t + 0.5 * h, tmp, *args)
+        np.multiply(k2, 0.5 * h, out=tmp); tmp += X
+        k3[:] = self.fonction(t + 0.5 * h, tmp, *args)
+        np.multiply(k3, h, out=tmp); tmp += X
+        k4[:] = self.fonction(t + h, tmp, *args)
+
+        # X += h/6 * (k1 + 2 k2 + 2 k3 + k4)
+        k2 += k3; k2 *= 2.0; k2 += k1; k2 += k4
+        k2 *= h / 6.0
+        X += k2
+
+    def _pas_euler_semi_implicite(self, args):
+        # Les vitesses [vx, w] avancent d'abord, puis la thermique et l'usure
+        # sont évaluées avec les vitesses mises à jour.
+        h = self.pas
+        X, k = self.etat, self._k1
+
+        k[:] = self.fonction(self.t, X, *args)
+        X[..., :2] += h * k[..., :2]
+        k[:] = self.fonction(self.t + h, X, *args)
+        X[..., 2:] += h * k[..., 2:]
+
+    def avancer(self, duree, *args):
+        """
+        Avance la simulation de `duree` secondes par sous-pas fixes.
+
+        Args:
+            duree: Durée à simuler en s (typiquement le dt de l'image)
+            *args: Arguments supplémentaires passés à la fonction dérivée
+        Returns:
+            L'état courant (tableau partagé, modifié au prochain appel)
+        Raises:
+            FloatingPointError: Si l'état devient non fini (avec
+                verifier_fini). L'état d'avant l'appel est restauré.
+        """
+        self.reste += duree
+        n = int(self.reste / self.pas + 1e-9)
+        if n > self.sous_pas_max:
+            # Retard trop important: on abandonne le temps en excès plutôt
+            # que de laisser le coût d'une image exploser.
+            if compteurs.actif:
+                compteurs.compter("pas_abandonnes", n - self.sous_pas_max)
+            n = self.sous_pas_max
+            self.reste = 0.0
+        else:
+            self.reste -= n * self.pas
+        if compteurs.actif:
+            compteurs.compter("pas_fixes", n)
+            compteurs.compter("temps_simule", n * self.pas)
+
+        self._sauvegarde[:] = self.etat
+        t_depart, pas_depart = self.t, self.nombre_pas
+        pas = self._pas_rk4 if self.methode == "rk4" else self._pas_euler_semi_implicite
+
+        for _ in range(n):
+            pas(args)
+            if self.projection is not None:
+                self.projection(self.etat)
+            self.nombre_pas += 1
+            self.t += self.pas
+
+        if self.verifier_fini and not np.all(np.isfinite(self.etat)):
+            self.etat[:] = self._sauvegarde
+            self.t, self.nombre_pas = t_depart, pas_depart
+            raise FloatingPointError(f"État non fini après intégration à t={self.t:.3f}s")
+
+        return self.etat
+
+
+# ==================== INTÉGRATION MULTI-CADENCE ====================
+# Les vitesses [vx, w] demandent des pas de l'ordre de la milliseconde,
+# alors que les températures et l'usure bougent à peine à cette échelle.
+# Les sous-pas rapides intègrent la mécanique seule (thermique et usure
+# figées) en cumulant la puissance de glissement et l'usure; le pas lent
+# met ensuite à jour températures et usure avec ces cumuls.
+
+class IntegrateurMultiCadence:
+    """
+    Intégrateur à deux cadences: RK4 mécanique à `frequence_rapide`,
+    mise à jour thermique et usure à `frequence_lente`.
+    """
+
+    def __init__(self, etat_initial, frequence_rapide=1000.0, frequence_lente=10.0,
+                 params=phys.PARAMETRES_DEFAUT, t0=0.0):
+        """
+        Args:
+            etat_initial: [vx, w, temp_ext, temp_int, usure]
+            frequence_rapide: Fréquence des sous-pas mécaniques en Hz
+            frequence_lente: Fréquence des mises à jour thermiques en Hz
+            params: Jeu de paramètres
+            t0: Temps initial en s
+        """
+        self.sous_pas = max(1, int(round(frequence_rapide / frequence_lente)))
+        self.pas_lent = 1.0 / frequence_lente
+        self.pas_rapide = self.pas_lent / self.sous_pas
+        self.params = params
+
+        self.etat = np.array(etat_initial, dtype=float)
+        self.t = float(t0)
+        self.nombre_pas = 0
+        self.reste = 0.0
+
+        # Cumuls du dernier pas lent (diagnostic)
+        self.puissance_moyenne = 0.0
+        self.usure_cumulee = 0.0
+
+    def _pas_mecanique(self, etat, moment_accel, moment_frein):
+        # RK4 sur [vx, w] seulement; les intégrales de la puissance et de
+        # l'usure utilisent les mêmes poids que RK4 (Simpson par sous-pas)
+        f, p, h = phys.derivee_mecanique, self.params, self.pas_rapide
+        vx, w = etat[0], etat[1]
+
+        a1, b1, p1, u1 = f(0.0, etat, moment_accel, moment_frein, p)
+        etat[0], etat[1] = vx + 0.5 * h * a1, w + 0.5 * h * b1
+        a2, b2, p2, u2 = f(0.0, etat, moment_accel, moment_frein, p)
+        etat[0], etat[1] = vx + 0.5 * h * a2, w + 0.5 * h * b2
+        a3, b3, p3, u3 = f(0.0, etat, moment_accel, moment_frein, p)
+        etat[0], etat[1] = vx + h * a3, w + h * b3
+        a4, b4, p4, u4 = f(0.0, etat, moment_accel, moment_frein, p)
+
+        etat[0] = max(0.0, vx + h / 6.0 * (a1 + 2.0 * a2 + 2.0 * a3 + a4))
+        etat[1] = w + h / 6.0 * (b1 + 2.0 * b2 + 2.0 * b3 + b4)
+        return (h / 6.0 * (p1 + 2.0 * p2 + 2.0 * p3 + p4),
+                h / 6.0 * (u1 + 2.0 * u2 + 2.0 * u3 + u4))
+
+    def _pas_thermique(self, etat, puissance):
+        # RK4 sur [temp_ext, temp_int] à puissance de glissement constante
+        flux, p, h = phys.calculer_flux_thermiques, self.params, self.pas_lent
+        te, ti = etat[2], etat[3]
+
+        a1, b1 = flux(te, ti, puissance, p)
+        a2, b2 = flux(te + 0.5 * h * a1, ti + 0.5 * h * b1, puissance, p)
+        a3, b3 = flux(te + 0.5 * h * a2, ti + 0.5 * h * b2, puissance, p)
+        a4, b4 = flux(te + h * a3, ti + h * b3, puissance, p)
+
+        etat[2] = te + h / 6.0 * (a1 + 2.0 * a2 + 2.0 * a3 + a4)
+        etat[3] = ti + h / 6.0 * (b1 + 2.0 * b2 + 2.0 * b3 + b4)
+
+    def avancer_pas_lent(self, moment_accel, moment_frein):
+        """
+        Effectue un pas lent: `sous_pas` pas mécaniques puis la mise à jour
+        thermique et usure.
+
+        Args:
+            moment_accel: Couple moteur en N.m
+            moment_frein: Couple de frein en N.m
+        """
+        # Travail sur une liste Python: plus rapide que NumPy pour 5 valeurs
+        etat = self.etat.tolist()
+        energie, usure = 0.0, 0.0
+        for _ in range(self.sous_pas):
+            de, du = self._pas_mecanique(etat, moment_accel, moment_frein)
+            energie += de
+            usure += du
+
+        self.puissance_moyenne = energie / self.pas_lent
+        self.usure_cumulee = usure
+        self._pas_thermique(etat, self.puissance_moyenne)
+        etat[4] = min(1.0, max(0.0, etat[4] + usure))
+
+        self.etat[:] = etat
+        self.nombre_pas += 1
+        self.t += self.pas_lent
+
+    def avancer(self, duree, moment_accel, moment_frein):
+        """
+        Avance la simulation de `duree` secondes par pas lents entiers.
+        Le temps non consommé est reporté à l'appel suivant.
+
+        Args:
+            duree: Durée à simuler en s
+            moment_accel: Couple moteur en N.m
+            moment_frein: Couple de frein en N.m
+        Returns:
+            L'état courant (tableau partagé, modifié au prochain appel)
+        Raises:
+            FloatingPointError: Si l'état devient non fini
+        """
+        self.reste += duree
+        n = int(self.reste / self.pas_lent + 1e-9)
+        self.reste -= n * self.pas_lent
+
+        for _ in range(n):
+            self.avancer_pas_lent(moment_accel, moment_frein)
+        if compteurs.actif:
+            compteurs.compter("pas_fixes", n * self.sous_pas)
+            compteurs.compter("temps_simule", n * self.pas_lent)
+
+        if not np.all(np.isfinite(self.etat)):
+            raise FloatingPointError(f"État non fini après intégration à t={self.t:.3f}s")
+
+        return self.etat
+
+
+def comparer_multicadence(duree=120.0, pourcentage_accel=0.3, pourcentage_frein=0.0,
+                          frequence_rapide=1000.0, frequence_lente=10.0,
+                          params=phys.PARAMETRES_DEFAUT):
+    """
+    Compare l'intégrateur multi-cadence à solve_ivp RK45 monolithique
+    (max_step=0.01, comme test_simulation.py).
+
+    Args:
+        duree: Durée simulée en s
+        pourcentage_accel: Pédale d'accélérateur entre 0 et 1
+        pourcentage_frein: Pédale de frein entre 0 et 1
+        frequence_rapide: Fréquence des sous-pas mécaniques en Hz
+        frequence_lente: Fréquence des mises à jour thermiques en Hz
+        params: Jeu de paramètres
+    Returns:
+        Dictionnaire des états finaux, écarts et temps de calcul
+    """
+    import time
+    from scipy.integrate import solve_ivp
+
+    moment_accel = phys.get_couple_moteur(pourcentage_accel, params)
+    moment_frein = phys.get_couple_frein(pourcentage_frein, params)
+
+    debut = time.perf_counter()
+    reference = solve_ivp(phys.derivee, (0.0, duree), phys.ETAT_INITIAL, method='RK45',
+                          args=(moment_accel, moment_frein, params), max_step=0.01,
+                          rtol=1e-8, atol=1e-8)
+    duree_reference = time.perf_counter() - debut
+
+    debut = time.perf_counter()
+    integrateur = IntegrateurMultiCadence(phys.ETAT_INITIAL, frequence_rapide,
+                                          frequence_lente, params)
+    integrateur.avancer(duree, moment_accel, moment_frein)
+    duree_multicadence = time.perf_counter() - debut
+
+    final_reference = reference.y[:, -1]
+    return {
+        "reference": final_reference.tolist(),
+        "multicadence": integrateur.etat.tolist(),
+        "ecart": np.abs(integrateur.etat - final_reference).tolist(),
+        "duree_reference": duree_reference,
+        "duree_multicadence": duree_multicadence,
+    }
+
+
+if __name__ == "__main__":
+    for frequence_rapide, frequence_lente in ((1000.0, 10.0), (500.0, 1.0)):
+        r = comparer_multicadence(frequence_rapide=frequence_rapide,
+                                  frequence_lente=frequence_lente)
+        print(f"Multi-cadence {frequence_rapide:.0f} Hz / {frequence_lente:.0f} Hz "
+              f"sur 120 s à 30 % de gaz:")
+        print(f"  RK45 monolithique: {r['duree_reference']:.2f}s  état {np.round(r['reference'], 4)}")
+        print(f"  Multi-cadence    : {r['duree_multicadence']:.2f}s  état {np.round(r['multicadence'], 4)}")
+        print(f"  Écart final par variable: {np.array2string(np.array(r['ecart']), precision=2)}")
@@ -0,0 +1,269 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+from scipy.integrate import solve_ivp
+
+import compteurs
+import jacobien as jac
+import physique_roue as phys
+
+
+# ==================== INTÉGRATION PAR SEGMENTS ====================
+# derivee() change de régime à VITESSE_MIN_DYNAMIQUE et ses sécurités
+# annulent dvx/dw sous les seuils de rotation: ce sont des discontinuités,
+# sur lesquelles RK45 rejette pas après pas. Ici, chaque franchissement est
+# un événement du solveur: on arrête l'intégration pile dessus, on fixe le
+# régime du segment suivant, et chaque segment est intégré sur une
+# dérivée régulière.
+#
+# Si l'état glisse le long de la frontière (chaque régime renvoie vers
+# l'autre), on passe en régime de transition: derivee() choisit elle-même
+# jusqu'à ce que l'état s'éloigne de la frontière de MARGE_TRANSITION.
+
+BASSE_VITESSE = "basse_vitesse"
+DYNAMIQUE = "dynamique"
+TRANSITION = "transition"
+
+MARGE_TRANSITION = 0.02         # Fraction de VITESSE_MIN_DYNAMIQUE
+DUREE_SEGMENT_MIN = 1e-9        # En dessous, le segment est considéré vide (s)
+
+
+# Le régime est fixé par segment, sans passer par derivee(): les
+# compteurs de régime sont relevés ici
+def _derivee_basse_vitesse(t, X, moment_accel, moment_frein, params):
+    if compteurs.actif:
+        compteurs.compter("derivee_basse_vitesse")
+    return phys.regime_basse_vitesse(X, moment_accel, moment_frein, params)
+
+
+def _derivee_dynamique(t, X, moment_accel, moment_frein, params):
+    if compteurs.actif:
+        compteurs.compter("derivee_dynamique")
+    return phys.regime_dynamique(X, moment_accel, moment_frein, params)
+
+
+def _jacobien_basse_vitesse(t, X, moment_accel, moment_frein, params):
+    return jac.jacobien_basse_vitesse(X, moment_accel, moment_frein, params)
+
+
+def _jacobien_dynamique(t, X, moment_accel, moment_frein, params):
+    return jac.jacobien_regime_dynamique(X, moment_accel, moment_frein, params)
+
+
+# Dérivée et jacobienne de chaque segment: le régime est fixé, pas choisi
+# à chaque appel (sauf en transition, intégrée en RK45)
+REGIMES = {
+    BASSE_VITESSE: _derivee_basse_vitesse,
+    DYNAMIQUE: _derivee_dynamique,
+    TRANSITION: phys.derivee,
+}
+JACOBIENNES = {
+    BASSE_VITESSE: _jacobien_basse_vitesse,
+    DYNAMIQUE: _jacobien_dynamique,
+}
+
+
+@dataclass
+class ResultatSegments:
+    """Trajectoire et coût d'une intégration par segments."""
+    t: np.ndarray
+    y: np.ndarray                   # (5, n) comme solve_ivp
+    nfev: int = 0                   # Évaluations de la dérivée
+    pas: int = 0                    # Pas acceptés
+    evenements: list = field(default_factory=list)  # (t, nom) de chaque coupure
+
+
+def regime_initial(X, params=phys.PARAMETRES_DEFAUT):
+    """Régime choisi par derivee() pour l'état X."""
+    vx, w = X[0], X[1]
+    if vx < params.vitesse_min_dynamique and params.rayon * w < params.vitesse_min_dynamique:
+        return BASSE_VITESSE
+    return DYNAMIQUE
+
+
+def _evenement(nom, fonction, direction, regime_suivant=None, seuil=None):
+    fonction.terminal = True
+    fonction.direction = direction
+    fonction.nom = nom
+    # Après la coupure: régime du segment suivant, et (indice, valeur) à
+    # imposer pour que l'état soit exactement sur le seuil
+    fonction.regime_suivant = regime_suivant
+    fonction.seuil = seuil
+    return fonction
+
+
+def _arme(evenement, X):
+    # solve_ivp déclenche aussi un événement qui part de g = 0: un seuil n'est
+    # surveillé que si l'état est strictement du côté d'où il peut le franchir.
+    g = evenement(0.0, X)
+    return g > 0 if evenement.direction < 0 else g < 0
+
+
+def evenements_segment(regime, X, params=phys.PARAMETRES_DEFAUT):
+    """
+    Construit les fonctions d'événement d'un segment pour solve_ivp.
+
+    Args:
+        regime: BASSE_VITESSE, DYNAMIQUE ou TRANSITION
+        X: État au début du segment
+        params: Jeu de paramètres
+    Returns:
+        Liste de fonctions g(t, X, ...) terminales, armées pour ce segment
+    """
+    p = params
+
+    def frontiere_regime(t, X, *args):
+        return max(X[0], p.rayon * X[1]) - p.vitesse_min_dynamique
+
+    # Le régime est imposé au segment: sa frontière est toujours surveillée,
+    # dans le sens qui en fait sortir.
+    if regime == TRANSITION:
+        marge = MARGE_TRANSITION * p.vitesse_min_dynamique
+        return [
+            _evenement("sortie_transition_haut",
+                       lambda t, X, *args: frontiere_regime(t, X) - marge, +1,
+                       regime_suivant=DYNAMIQUE),
+            _evenement("sortie_transition_bas",
+                       lambda t, X, *args: frontiere_regime(t, X) + marge, -1,
+                       regime_suivant=BASSE_VITESSE),
+        ]
+
+    if regime == BASSE_VITESSE:
+        evenements = [_evenement("passage_dynamique", frontiere_regime, +1,
+                                 regime_suivant=DYNAMIQUE)]
+        seuils = [
+            _evenement("arret_vehicule", lambda t, X, *args: X[0] - p.vitesse_min_mouvement,
+                       -1, seuil=(0, p.vitesse_min_mouvement)),
+        ]
+    else:
+        evenements = [_evenement("passage_basse_vitesse", frontiere_regime, -1,
+                                 regime_suivant=BASSE_VITESSE)]
+        seuils = [
+            _evenement("blocage_roue", lambda t, X, *args: X[1] - p.vitesse_min_rotation,
+                       -1, seuil=(1, p.vitesse_min_rotation)),
+            _evenement("arret_vehicule", lambda t, X, *args: X[0] - p.vitesse_min_rotation,
+                       -1, seuil=(0, p.vitesse_min_rotation)),
+        ]
+
+    return evenements + [e for e in seuils if _arme(e, X)]
+
+
+def integrer_par_segments(etat_initial, duree, moment_accel, moment_frein,
+                          params=phys.PARAMETRES_DEFAUT, jacobienne=False,
+                          segments_max=1000, **options):
+    """
+    Intègre derivee() segment par segment, en coupant à chaque changement
+    de régime et à chaque arrêt (roue ou véhicule).
+
+    Args:
+        etat_initial: [vx, w, temp_ext, temp_int, usure]
+        duree: Durée simulée en s
+        moment_accel: Couple moteur en N.m
+        moment_frein: Couple de frein en N.m
+        params: Jeu de paramètres
+        jacobienne: Fournit la jacobienne analytique du régime au solveur
+            (pour method='Radau' ou 'BDF')
+        segments_max: Garde-fou contre un enchaînement infini d'événements
+        **options: Options de solve_ivp (method, rtol, atol, max_step...)
+    Returns:
+        ResultatSegments
+    Raises:
+        RuntimeError: Si le solveur échoue sur un segment
+    """
+    t = 0.0
+    X = np.array(etat_initial, dtype=float)
+    regime = regime_initial(X, params)
+    resultat = ResultatSegments(t=None, y=None)
+    morceaux_t, morceaux_y = [np.array([t])], [X[:, None]]
+
+    for _ in range(segments_max):
+        evenements = evenements_segment(regime, X, params)
+        options_segment = dict(options)
+        if regime == TRANSITION:
+            # derivee() y reste discontinue: un solveur implicite s'y bloque
+            options_segment["method"] = "RK45"
+        elif jacobienne:
+            options_segment["jac"] = JACOBIENNES[regime]
+        sol = solve_ivp(REGIMES[regime], (t, duree), X,
+                        args=(moment_accel, moment_frein, params),
+                        events=evenements, **options_segment)
+        if sol.status == -1:
+            raise RuntimeError(f"Échec du segment à t={t:.4f}s: {sol.message}")
+
+        resultat.nfev += sol.nfev
+        resultat.pas += len(sol.t) - 1
+        morceaux_t.append(sol.t[1:])
+        morceaux_y.append(sol.y[:, 1:])
+
+        if sol.status == 0:
+            break
+
+        # Événement terminal: on repart exactement du point de coupure
+        i = next(i for i, te in enumerate(sol.t_events) if len(te))
+        evenement = evenements[i]
+        segment_vide = sol.t_events[i][0] - t < DUREE_SEGMENT_MIN
+        t = sol.t_events[i][0]
+        X = sol.y_events[i][0].copy()
+        if evenement.seuil is not None:
+            indice, valeur = evenement.seuil
+            X[indice] = valeur
+        if evenement.regime_suivant is not None:
+            # Frontière franchie aussitôt entrée: glissement le long de celle-ci
+            regime = TRANSITION if segment_vide else evenement.regime_suivant
+        resultat.evenements.append((t, evenement.nom))
+        morceaux_t[-1][-1] = t
+        morceaux_y[-1][:, -1] = X
+    else:
+        raise RuntimeError(f"Plus de {segments_max} segments avant t={duree}s")
+
+    resultat.t = np.concatenate(morceaux_t)
+    resultat.y = np.hstack(morceaux_y)
+    return resultat
+
+
+# ==================== COMPARAISON ====================
+SCENARIOS = {
+    # nom: (état initial, pédale accélérateur, pédale frein, durée)
+    "depart_arrete": (phys.ETAT_INITIAL, 1.0, 0.0, 10.0),
+    "freinage_arret": ([60.0, 60.0 / phys.RAYON, 95.0, 85.0, 0.0], 0.0, 1.0, 10.0),
+}
+
+
+def comparer(nom, params=phys.PARAMETRES_DEFAUT, **options):
+    """
+    Compare solve_ivp direct et intégration par segments sur un scénario.
+
+    Args:
+        nom: Clé de SCENARIOS
+        params: Jeu de paramètres
+        **options: Options de solve_ivp communes aux deux intégrations
+    Returns:
+        Dictionnaire des pas, évaluations et écart sur l'état final
+    """
+    etat, accel, frein, duree = SCENARIOS[nom]
+    moment_accel = phys.get_couple_moteur(accel, params)
+    moment_frein = phys.get_couple_frein(frein, params)
+
+    direct = solve_ivp(phys.derivee, (0.0, duree), etat,
+                       args=(moment_accel, moment_frein, params), **options)
+    segments = integrer_par_segments(etat, duree, moment_accel, moment_frein, params, **options)
+
+    return {
+        "pas_direct": len(direct.t) - 1,
+        "nfev_direct": direct.nfev,
+        "pas_segments": segments.pas,
+        "nfev_segments": segments.nfev,
+        "evenements": len(segments.evenements),
+        "ecart_final": np.abs(direct.y[:, -1] - segments.y[:, -1]).tolist(),
+    }
+
+
+if __name__ == "__main__":
+    for options in ({}, {"rtol": 1e-6, "atol": 1e-8}, {"max_step": 0.01}):
+        print(f"Options solve_ivp: {options or 'par défaut'}")
+        for nom in SCENARIOS:
+            r = comparer(nom, **options)
+            print(f"  {nom:15s} direct: {r['pas_direct']:5d} pas {r['nfev_direct']:6d} éval. | "
+                  f"segments: {r['pas_segments']:5d} pas {r['nfev_segments']:6d} éval. "
+                  f"({r['evenements']} coupures, "
+                  f"économie {1 - r['nfev_segments'] / r['nfev_direct']:+.0%})")
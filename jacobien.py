@@ -0,0 +1,193 @@
+import numpy as np
+
+import physique_roue as phys
+
+
+# ==================== JACOBIENNE ANALYTIQUE ====================
+# Matrice J[i, j] = d(dérivée i) / d(état j) pour X = [vx, w, temp_ext,
+# temp_int, usure]. Le système est raide (inertie de roue minuscule devant
+# la masse du véhicule, pente de Pacejka forte, thermique très lente):
+# fournie à Radau/BDF/LSODA, elle évite l'estimation par différences finies.
+
+
+def _derivees_friction(temp_ext, usure, params):
+    """Renvoie (mu, dmu/dtemp_ext, dmu/dusure)."""
+    ecart = temp_ext - params.temp_ideale
+    degradation_temp = np.exp(-ecart**2 / params.plage_temp**2)
+    mu = params.mu_0 * (1.0 - usure) * degradation_temp
+    return mu, -2.0 * ecart / params.plage_temp**2 * mu, -params.mu_0 * degradation_temp
+
+
+def _derivees_glissement(vx, w, params):
+    """Renvoie (kappa, dkappa/dvx, dkappa/dw), comme calculer_glissement."""
+    r = params.rayon
+    vitesse_roue = r * w
+    ecart = vitesse_roue - vx
+    reference = max(abs(vx), abs(vitesse_roue), params.vitesse_min_reference)
+    kappa = ecart / reference
+
+    if abs(kappa) > 1.0:
+        # Glissement saturé par la borne [-1, 1]
+        return max(-1.0, min(1.0, kappa)), 0.0, 0.0
+
+    # La référence est la plus grande des trois vitesses: sa dérivée aussi
+    if reference == abs(vx) and abs(vx) >= params.vitesse_min_reference:
+        dref_dvx, dref_dw = np.sign(vx), 0.0
+    elif reference == abs(vitesse_roue) and abs(vitesse_roue) >= params.vitesse_min_reference:
+        dref_dvx, dref_dw = 0.0, r * np.sign(w)
+    else:
+        dref_dvx, dref_dw = 0.0, 0.0
+
+    dk_dvx = (-reference - ecart * dref_dvx) / reference**2
+    dk_dw = (r * reference - ecart * dref_dw) / reference**2
+    return kappa, dk_dvx, dk_dw
+
+
+def _lignes_thermiques(J, params):
+    """Termes de conduction/convection, communs aux deux régimes."""
+    J[2, 2] -= (params.transfert_interne + params.transfert_air) / params.capacite_surface
+    J[2, 3] += params.transfert_interne / params.capacite_surface
+    J[3, 2] = params.transfert_interne / params.capacite_carcasse
+    J[3, 3] = -(params.transfert_interne + params.transfert_air) / params.capacite_carcasse
+
+
+def jacobien_basse_vitesse(etat, moment_accel, moment_frein, params=phys.PARAMETRES_DEFAUT):
+    """
+    Jacobienne de regime_basse_vitesse.
+
+    Args:
+        etat: [vx, w, temp_ext, temp_int, usure]
+        moment_accel: Couple moteur en N.m
+        moment_frein: Couple de frein en N.m
+        params: Jeu de paramètres
+    Returns:
+        Tableau (5, 5)
+    """
+    vx, w, temp_ext, temp_int, usure = etat
+    p = params
+    J = np.zeros((5, 5))
+
+    mu, dmu_dtemp, dmu_dusure = _derivees_friction(temp_ext, usure, p)
+    force_max = mu * p.charge_roue * p.gravite * p.nombre_roues
+
+    force_nette = (moment_accel / p.rayon
+                   - (moment_frein / p.rayon) * p.nombre_roues
+                   - p.coeff_roulement * p.charge_roue * p.gravite * p.nombre_roues)
+
+    # Seule la saturation par l'adhérence dépend de l'état
+    signe = 0.0
+    if force_nette > force_max:
+        signe, force_nette = 1.0, force_max
+    elif force_nette < -force_max:
+        signe, force_nette = -1.0, -force_max
+
+    if vx > p.vitesse_min_mouvement or force_nette > 0:
+        facteur = signe * p.charge_roue * p.gravite * p.nombre_roues / p.masse_vehicule
+        J[0, 2] = facteur * dmu_dtemp
+        J[0, 4] = facteur * dmu_dusure
+        if vx > p.vitesse_min_rotation:
+            J[1] = J[0] / p.rayon
+
+    _lignes_thermiques(J, p)
+    return J
+
+
+def jacobien_regime_dynamique(etat, moment_accel, moment_frein, params=phys.PARAMETRES_DEFAUT):
+    """
+    Jacobienne de regime_dynamique.
+
+    Args:
+        etat: [vx, w, temp_ext, temp_int, usure]
+        moment_accel: Couple moteur en N.m
+        moment_frein: Couple de frein en N.m
+        params: Jeu de paramètres
+    Returns:
+        Tableau (5, 5)
+    """
+    vx, w, temp_ext, temp_int, usure = etat
+    p = params
+    J = np.zeros((5, 5))
+
+    # Charge dynamique
+    charge = p.charge_roue + p.coeff_appui * vx**2 / (p.nombre_roues * p.gravite)
+    dcharge_dvx = 2.0 * p.coeff_appui * vx / (p.nombre_roues * p.gravite)
+
+    # Force de traction et ses dérivées
+    kappa, dk_dvx, dk_dw = _derivees_glissement(vx, w, p)
+    mu, dmu_dtemp, dmu_dusure = _derivees_friction(temp_ext, usure, p)
+    force = phys.calculer_force_traction(kappa, charge, mu, p)
+    dforce_dk = phys.calculer_derivee_traction(kappa, charge, mu, p)
+    # F est proportionnelle à mu et à la charge: F / mu et F / charge
+    forme = phys.calculer_force_traction(kappa, 1.0, 1.0, p)
+
+    dF_dvx = forme * mu * dcharge_dvx + dforce_dk * dk_dvx
+    dF_dw = dforce_dk * dk_dw
+    dF_dtemp = forme * charge * dmu_dtemp
+    dF_dusure = forme * charge * dmu_dusure
+
+    # Limitation de puissance
+    dmoment_dw = 0.0
+    moment_effectif = moment_accel
+    if w > p.vitesse_min_rotation and p.puissance_max / w < moment_accel:
+        moment_effectif = p.puissance_max / w
+        dmoment_dw = -p.puissance_max / w**2
+
+    # Accélération du véhicule
+    n, m = p.nombre_roues, p.masse_vehicule
+    J[0, 0] = (n * dF_dvx - 2.0 * p.coeff_trainee * vx
+               - p.coeff_roulement * dcharge_dvx * p.gravite * n) / m
+    J[0, 1] = n * dF_dw / m
+    J[0, 2] = n * dF_dtemp / m
+    J[0, 4] = n * dF_dusure / m
+
+    # Accélération de la roue
+    J[1, 0] = -p.rayon * dF_dvx / p.inertie
+    J[1, 1] = (dmoment_dw / n - p.rayon * dF_dw) / p.inertie
+    J[1, 2] = -p.rayon * dF_dtemp / p.inertie
+    J[1, 4] = -p.rayon * dF_dusure / p.inertie
+
+    # Sécurités anti-vitesses négatives: dérivée figée à 0
+    dvx = (n * force - p.coeff_trainee * vx**2
+           - p.coeff_roulement * charge * p.gravite * n) / m
+    dw = (moment_effectif / n - moment_frein - force * p.rayon) / p.inertie
+    if w <= p.vitesse_min_rotation and dw < 0:
+        J[1] = 0.0
+    if vx <= p.vitesse_min_rotation and dvx < 0:
+        J[0] = 0.0
+
+    # Puissance de friction |F * (R w - vx)|
+    vitesse_glissement = p.rayon * w - vx
+    signe = np.sign(force * vitesse_glissement)
+    J[2, 0] = signe * (dF_dvx * vitesse_glissement - force) / p.capacite_surface
+    J[2, 1] = signe * (dF_dw * vitesse_glissement + force * p.rayon) / p.capacite_surface
+    J[2, 2] = signe * dF_dtemp * vitesse_glissement / p.capacite_surface
+    J[2, 4] = signe * dF_dusure * vitesse_glissement / p.capacite_surface
+    _lignes_thermiques(J, p)
+
+    # Usure: kappa² / FACTEUR_USURE au-delà du seuil
+    if abs(kappa) > p.seuil_usure:
+        J[4, 0] = 2.0 * kappa * dk_dvx / p.facteur_usure
+        J[4, 1] = 2.0 * kappa * dk_dw / p.facteur_usure
+
+    return J
+
+
+def jacobien(t, X, moment_accel, moment_frein, params=phys.PARAMETRES_DEFAUT):
+    """
+    Jacobienne de derivee(), même signature (argument `jac` de solve_ivp).
+
+    Args:
+        t: Temps (non utilisé)
+        X: État [vx, w, temp_ext, temp_int, usure]
+        moment_accel: Couple moteur
+        moment_frein: Couple de frein
+        params: Jeu de paramètres
+    Returns:
+        Tableau (5, 5)
+    """
+    vx, w = X[0], X[1]
+
+    if vx < params.vitesse_min_dynamique and params.rayon * w < params.vitesse_min_dynamique:
+        return jacobien_basse_vitesse(X, moment_accel, moment_frein, params)
+    else:
+        return jacobien_regime_dynamique(X, moment_accel, moment_frein, params)
@@ -0,0 +1,294 @@
+import functools
+import multiprocessing
+import os
+import warnings
+from dataclasses import replace
+
+import numpy as np
+
+import physique_roue as phys
+from integrateur import IntegrateurFixe, borner_etats
+
+
+# ==================== MONTE CARLO ====================
+# Les paramètres incertains sont tirés selon des lois déclarées, avec un
+# générateur reproductible: chaque lot de TAILLE_LOT trajectoires a son
+# propre flux (SeedSequence.spawn), donc le résultat ne dépend ni du nombre
+# de processus ni de l'ordre d'exécution.
+#
+# Toutes les trajectoires avancent ensemble, intervalle par intervalle; à
+# chaque intervalle on ne garde que les percentiles de vitesse, température
+# de surface et usure. La mémoire reste en O(nombre de trajectoires).
+#
+# Une trajectoire qui diverge (tirage hors du domaine stable) passe à NaN
+# sans arrêter les autres: elle est exclue des percentiles et comptée.
+
+TAILLE_LOT = 512
+PERCENTILES = (5.0, 25.0, 50.0, 75.0, 95.0)
+
+# Grandeur suivie -> colonne de l'état
+GRANDEURS = {
+    "vitesse": 0,               # m/s
+    "temp_surface": 2,          # °C
+    "usure": 4,                 # 0 à 1
+}
+
+
+# ---------- Lois de tirage ----------
+# Une loi est un appelable (rng, n) -> tableau (n,). Les lois sont des
+# functools.partial de fonctions du module: elles passent aux processus du
+# pool quelle que soit la méthode de démarrage.
+
+def _tirer_normale(moyenne, ecart_type, minimum, maximum, rng, n):
+    return np.clip(rng.normal(moyenne, ecart_type, n), minimum, maximum)
+
+
+def _tirer_uniforme(minimum, maximum, rng, n):
+    return rng.uniform(minimum, maximum, n)
+
+
+def _tirer_triangulaire(minimum, mode, maximum, rng, n):
+    return rng.triangular(minimum, mode, maximum, n)
+
+
+def _tirer_lognormale(mediane, sigma, rng, n):
+    return mediane * rng.lognormal(0.0, sigma, n)
+
+
+def normale(moyenne, ecart_type, minimum=-np.inf, maximum=np.inf):
+    """Loi normale, tronquée par écrêtage à [minimum, maximum]."""
+    return functools.partial(_tirer_normale, moyenne, ecart_type, minimum, maximum)
+
+
+def uniforme(minimum, maximum):
+    """Loi uniforme sur [minimum, maximum]."""
+    return functools.partial(_tirer_uniforme, minimum, maximum)
+
+
+def triangulaire(minimum, mode, maximum):
+    """Loi triangulaire."""
+    return functools.partial(_tirer_triangulaire, minimum, mode, maximum)
+
+
+def lognormale(mediane, sigma):
+    """Loi log-normale de médiane donnée (sigma: écart-type du logarithme)."""
+    return functools.partial(_tirer_lognormale, mediane, sigma)
+
+
+# Incertitudes par défaut, centrées sur les constantes du module physique
+DISTRIBUTIONS_DEFAUT = {
+    "mu_0": normale(phys.MU_0, 0.05, minimum=0.5),
+    "pac_b": normale(phys.PAC_B, 0.6, minimum=1.0),
+    "pac_c": normale(phys.PAC_C, 0.05, minimum=1.0, maximum=2.0),
+    "pac_e": uniforme(0.92, 1.0),
+    "transfert_air": normale(phys.TRANSFERT_AIR, 6.0, minimum=1.0),
+    "temp_ambiante": uniforme(20.0, 40.0),
+    "facteur_usure": lognormale(phys.FACTEUR_USURE, 0.1),
+}
+
+
+def echantillonner(distributions, nombre, rng, base=phys.PARAMETRES_DEFAUT):
+    """
+    Tire `nombre` jeux de paramètres, empilés en un seul (champs (N,)).
+
+    Args:
+        distributions: Nom de champ de Parametres -> loi
+        nombre: Nombre de tirages
+        rng: np.random.Generator
+        base: Valeurs des champs non tirés
+    Returns:
+        Parametres utilisable par derivee_vectorisee
+    """
+    # Ordre des tirages fixé par le tri des noms: reproductible quel que
+    # soit l'ordre de déclaration
+    return replace(base, **{nom: distributions[nom](rng, nombre)
+                            for nom in sorted(distributions)})
+
+
+def _flux_lots(graine, nombre_trajectoires, taille_lot):
+    tailles = [min(taille_lot, nombre_trajectoires - debut)
+               for debut in range(0, nombre_trajectoires, taille_lot)]
+    graines = np.random.SeedSequence(graine).spawn(len(tailles))
+    return list(zip(tailles, graines))
+
+
+class _Lot:
+    """Trajectoires d'un lot, avancées ensemble par RK4 vectorisé."""
+
+    def __init__(self, taille, graine, distributions, options):
+        self.params = echantillonner(distributions, taille, np.random.default_rng(graine),
+                                     options["base"])
+        self.moment_accel = phys.get_couple_moteur(options["pourcentage_accel"], self.params)
+        self.moment_frein = phys.get_couple_frein(options["pourcentage_frein"], self.params)
+        self.integrateur = IntegrateurFixe(
+            _derivee_lot, np.tile(options["etat_initial"], (taille, 1)),
+            frequence=options["frequence"], projection=borner_etats, sous_pas_max=10**9,
+            verifier_fini=False)
+
+    def avancer(self, duree):
+        with np.errstate(all="ignore"):
+            etats = self.integrateur.avancer(duree, self.moment_accel, self.moment_frein,
+                                             self.params)
+        etats[~np.all(np.isfinite(etats), axis=1)] = np.nan
+        return etats
+
+
+def _derivee_lot(t, X, moment_accel, moment_frein, params):
+    return phys.derivee_vectorisee(X, moment_accel, moment_frein, params)
+
+
+def _extraire(etats):
+    return etats[:, list(GRANDEURS.values())]
+
+
+def _travailleur(connexion, lots, distributions, options):
+    # Processus du pool: garde ses lots en mémoire et les avance à la demande.
+    # Une exception est renvoyée au parent par le tube au lieu de tuer le processus.
+    try:
+        lots = [_Lot(taille, graine, distributions, options) for taille, graine in lots]
+        while True:
+            duree = connexion.recv()
+            if duree is None:
+                break
+            connexion.send(np.vstack([_extraire(lot.avancer(duree)) for lot in lots]))
+    except Exception as erreur:
+        connexion.send(erreur)
+    finally:
+        connexion.close()
+
+
+def _recevoir(connexion):
+    try:
+        valeurs = connexion.recv()
+    except EOFError:
+        raise RuntimeError("Un processus Monte Carlo s'est arrêté sans réponse") from None
+    if isinstance(valeurs, Exception):
+        raise RuntimeError(f"Échec d'un processus Monte Carlo: {valeurs!r}") from valeurs
+    return valeurs
+
+
+def iterer_bandes(nombre_trajectoires, duree, intervalle=0.5, graine=0,
+                  distributions=None, percentiles=PERCENTILES, processus=1,
+                  taille_lot=TAILLE_LOT, pourcentage_accel=1.0, pourcentage_frein=0.0,
+                  frequence=1000.0, etat_initial=phys.ETAT_INITIAL,
+                  base=phys.PARAMETRES_DEFAUT):
+    """
+    Générateur des bandes de percentiles, intervalle après intervalle.
+
+    Args:
+        nombre_trajectoires: Nombre de tirages simulés
+        duree: Durée simulée en s
+        intervalle: Période de sortie des bandes en s
+        graine: Graine du générateur (même graine = mêmes résultats)
+        distributions: Lois des paramètres incertains (DISTRIBUTIONS_DEFAUT)
+        percentiles: Percentiles calculés à chaque sortie
+        processus: 1 = lots vectorisés dans ce processus, sinon nombre de
+            processus qui se partagent les lots
+        taille_lot: Trajectoires par lot (et par flux aléatoire)
+        pourcentage_accel, pourcentage_frein: Pédales constantes (0 à 1)
+        frequence: Fréquence de l'intégrateur RK4 en Hz
+        etat_initial: État de départ commun
+        base: Valeurs des paramètres non tirés
+    Yields:
+        (t, bandes) avec bandes: nom de grandeur -> tableau (len(percentiles),)
+        calculé sur les trajectoires finies, et "divergees" -> nombre de
+        trajectoires devenues non finies (exclues des percentiles)
+    Raises:
+        RuntimeError: Si un processus du pool échoue
+    """
+    distributions = DISTRIBUTIONS_DEFAUT if distributions is None else distributions
+    options = dict(pourcentage_accel=pourcentage_accel, pourcentage_frein=pourcentage_frein,
+                   frequence=frequence, etat_initial=etat_initial, base=base)
+    lots = _flux_lots(graine, nombre_trajectoires, taille_lot)
+    if processus is None:
+        processus = os.cpu_count() or 1
+    processus = max(1, min(processus, len(lots)))
+
+    def bandes(valeurs):
+        # Toutes les trajectoires divergées: percentiles NaN (sans avertissement)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            table = np.nanpercentile(valeurs, percentiles, axis=0)
+        resultat = {nom: table[:, i] for i, nom in enumerate(GRANDEURS)}
+        resultat["divergees"] = int(np.count_nonzero(np.isnan(valeurs[:, 0])))
+        return resultat
+
+    nombre_sorties = int(round(duree / intervalle))
+
+    if processus == 1:
+        simulations = [_Lot(taille, g, distributions, options) for taille, g in lots]
+        etats = np.tile(etat_initial, (nombre_trajectoires, 1))
+        yield 0.0, bandes(_extraire(etats))
+        for k in range(1, nombre_sorties + 1):
+            valeurs = np.vstack([_extraire(lot.avancer(intervalle)) for lot in simulations])
+            yield k * intervalle, bandes(valeurs)
+        return
+
+    # Lots répartis en parts contiguës: l'ordre des trajectoires est conservé
+    parts = np.array_split(np.arange(len(lots)), processus)
+    connexions, travailleurs = [], []
+    try:
+        for indices in parts:
+            parent, enfant = multiprocessing.Pipe()
+            travailleur = multiprocessing.Process(
+                target=_travailleur, daemon=True,
+                args=(enfant, [lots[i] for i in indices], distributions, options))
+            travailleur.start()
+            connexions.append(parent)
+            travailleurs.append(travailleur)
+
+        yield 0.0, bandes(_extraire(np.tile(etat_initial, (nombre_trajectoires, 1))))
+        for k in range(1, nombre_sorties + 1):
+            for connexion in connexions:
+                try:
+                    connexion.send(intervalle)
+                except OSError:
+                    pass        # Processus déjà arrêté: _recevoir lit son erreur
+            valeurs = np.vstack([_recevoir(connexion) for connexion in connexions])
+            yield k * intervalle, bandes(valeurs)
+    finally:
+        for connexion in connexions:
+            try:
+                connexion.send(None)
+            except OSError:
+                pass
+        for travailleur in travailleurs:
+            travailleur.join(timeout=5.0)
+            if travailleur.is_alive():
+                travailleur.terminate()
+
+
+def executer_monte_carlo(nombre_trajectoires, duree, **options):
+    """
+    Rassemble les bandes de iterer_bandes dans des tableaux.
+
+    Args:
+        nombre_trajectoires: Nombre de tirages simulés
+        duree: Durée simulée en s
+        **options: Voir iterer_bandes
+    Returns:
+        Dictionnaire: "t" -> (K,), "percentiles" -> (P,), pour chaque
+        grandeur de GRANDEURS un tableau (K, P), et "divergees" -> (K,)
+    """
+    temps, series = [], {nom: [] for nom in (*GRANDEURS, "divergees")}
+    for t, bandes in iterer_bandes(nombre_trajectoires, duree, **options):
+        temps.append(t)
+        for nom in series:
+            series[nom].append(bandes[nom])
+    resultat = {"t": np.array(temps),
+                "percentiles": np.array(options.get("percentiles", PERCENTILES))}
+    resultat.update({nom: np.array(valeurs) for nom, valeurs in series.items()})
+    return resultat
+
+
+if __name__ == "__main__":
+    import time
+
+    debut = time.perf_counter()
+    print("   t     vitesse (km/h) P5/P50/P95     surface (°C) P5/P50/P95   usure (%) P95")
+    for t, bandes in iterer_bandes(1000, 10.0, intervalle=1.0, graine=42,
+                                   processus=os.cpu_count()):
+        v, T, u = bandes["vitesse"] * 3.6, bandes["temp_surface"], bandes["usure"] * 100
+        print(f"{t:5.1f}   {v[0]:6.1f} {v[2]:6.1f} {v[4]:6.1f}"
+              f"        {T[0]:6.1f} {T[2]:6.1f} {T[4]:6.1f}      {u[4]:.3f}")
+    print(f"1000 trajectoires en {time.perf_counter() - debut:.1f}s")
@@ -0,0 +1,258 @@
+import numpy as np
+
+import physique_roue as phys
+from integrateur import IntegrateurFixe, borner_etats
+
+
+# ==================== OPTIMISATION DES PROFILS DE PÉDALES ====================
+# Un profil est une courbe linéaire par morceaux entre NOEUDS valeurs de
+# pédale (0 à 1) régulièrement espacées sur l'horizon du scénario. La
+# recherche se fait par entropie croisée: on tire une population de profils
+# autour d'une moyenne, on la déroule en une seule passe vectorisée
+# (derivee_vectorisee), puis on resserre la loi de tirage sur l'élite.
+#
+# Scénarios:
+#   départ:    pédale d'accélérateur, coût = temps pour atteindre la vitesse cible
+#   freinage:  pédale de frein, coût = distance d'arrêt
+# Les dépassements de température de surface et d'usure pénalisent le coût.
+
+NOEUDS = 8
+PERIODE_COMMANDE = 0.01         # Pédales mises à jour toutes les 10 ms
+PENALITE = 10.0                 # Coût multiplié par (1 + PENALITE * dépassement relatif)
+VITESSE_ARRET = 0.5             # Vitesse considérée comme arrêtée en m/s
+
+ETAT_LANCE = [300.0 / 3.6, 300.0 / 3.6 / phys.RAYON, 100.0, 90.0, 0.0]
+
+SCENARIOS = {
+    "depart_100": dict(pedale="accel", cible=100.0 / 3.6, horizon=4.0,
+                       etat_initial=phys.ETAT_INITIAL),
+    "depart_200": dict(pedale="accel", cible=200.0 / 3.6, horizon=8.0,
+                       etat_initial=phys.ETAT_INITIAL),
+    "freinage_300": dict(pedale="frein", cible=VITESSE_ARRET, horizon=8.0,
+                         etat_initial=ETAT_LANCE),
+}
+
+LIMITES_DEFAUT = {
+    "temp_surface": 120.0,      # °C, maximum sur le roulage
+    "usure": 0.01,              # Usure ajoutée sur le roulage
+}
+
+
+def _deroulement(noeuds, scenario, params, frequence, periode_commande):
+    """
+    Déroule N profils ensemble, une période de commande à la fois.
+
+    Yields:
+        (t, pédales (N,), états (N, 5)) après chaque période de commande
+    """
+    noeuds = np.atleast_2d(noeuds)
+    temps_noeuds = np.linspace(0.0, scenario["horizon"], noeuds.shape[1])
+    integrateur = IntegrateurFixe(
+        lambda t, X, *args: phys.derivee_vectorisee(X, *args),
+        np.tile(scenario["etat_initial"], (len(noeuds), 1)),
+        frequence=frequence, projection=borner_etats, sous_pas_max=10**6)
+
+    for k in range(int(round(scenario["horizon"] / periode_commande))):
+        # Pédale tenue sur la période, lue au début de celle-ci
+        j = min(np.searchsorted(temps_noeuds, k * periode_commande, side="right") - 1,
+                len(temps_noeuds) - 2)
+        fraction = (k * periode_commande - temps_noeuds[j]) / (temps_noeuds[j + 1] - temps_noeuds[j])
+        pedales = noeuds[:, j] + fraction * (noeuds[:, j + 1] - noeuds[:, j])
+
+        if scenario["pedale"] == "accel":
+            etats = integrateur.avancer(periode_commande, phys.get_couple_moteur(pedales, params),
+                                        0.0, params)
+        else:
+            etats = integrateur.avancer(periode_commande, 0.0,
+                                        phys.get_couple_frein(pedales, params), params)
+        yield integrateur.t, pedales, etats
+
+
+def evaluer_profils(noeuds, scenario, limites=None, params=phys.PARAMETRES_DEFAUT,
+                    frequence=1000.0, periode_commande=PERIODE_COMMANDE):
+    """
+    Déroule une population de profils et calcule leur coût.
+
+    Args:
+        noeuds: Tableau (N, K) des valeurs de pédale aux noeuds
+        scenario: Entrée de SCENARIOS (ou dictionnaire de même forme)
+        limites: Limites de température et d'usure (LIMITES_DEFAUT)
+        params: Jeu de paramètres
+        frequence: Fréquence de l'intégrateur RK4 en Hz
+        periode_commande: Intervalle entre deux mises à jour des pédales en s
+    Returns:
+        Dictionnaire de tableaux (N,): "cout", "temps" (atteinte de la cible,
+        inf sinon), "distance", "temp_max", "usure", "atteint"
+    """
+    limites = LIMITES_DEFAUT if limites is None else limites
+    depart = np.asarray(scenario["etat_initial"], dtype=float)
+    accel = scenario["pedale"] == "accel"
+    cible = scenario["cible"]
+    n = len(np.atleast_2d(noeuds))
+
+    temps = np.full(n, np.inf)
+    distance = np.zeros(n)
+    temp_max = np.full(n, depart[2])
+    usure = np.zeros(n)
+    vitesse = np.full(n, depart[0])
+    t_prec = 0.0
+
+    for t, _, etats in _deroulement(noeuds, scenario, params, frequence, periode_commande):
+        vx = etats[:, 0]
+        actifs = ~np.isfinite(temps)
+        # Distance parcourue (trapèzes) et maxima tant que la cible n'est pas atteinte
+        distance += np.where(actifs, 0.5 * (vitesse + vx) * (t - t_prec), 0.0)
+        np.maximum(temp_max, np.where(actifs, etats[:, 2], -np.inf), out=temp_max)
+        usure = np.where(actifs, etats[:, 4] - depart[4], usure)
+
+        atteint = actifs & ((vx >= cible) if accel else (vx <= cible))
+        if np.any(atteint):
+            # Instant de franchissement interpolé dans la période
+            fraction = np.clip((cible - vitesse) / np.where(vx != vitesse, vx - vitesse, 1.0),
+                               0.0, 1.0)
+            temps = np.where(atteint, t_prec + fraction * (t - t_prec), temps)
+        vitesse = vx.copy()
+        t_prec = t
+        if np.all(np.isfinite(temps)):
+            break
+
+    # Cible manquée: horizon plus l'écart restant, ramené à la cible
+    manque = ~np.isfinite(temps)
+    if accel:
+        cout = np.where(manque, scenario["horizon"] * (2.0 - vitesse / cible), temps)
+    else:
+        cout = np.where(manque, distance + vitesse * scenario["horizon"], distance)
+
+    depassement = (np.maximum(temp_max - limites["temp_surface"], 0.0) / limites["temp_surface"]
+                   + np.maximum(usure - limites["usure"], 0.0) / limites["usure"])
+    cout = cout * (1.0 + PENALITE * depassement)
+    cout = np.where(np.isfinite(cout), cout, np.inf)
+    return {"cout": cout, "temps": temps, "distance": distance, "temp_max": temp_max,
+            "usure": usure, "atteint": ~manque}
+
+
+def telemetrie_profil(noeuds, scenario, params=phys.PARAMETRES_DEFAUT, frequence=1000.0,
+                      periode_commande=PERIODE_COMMANDE, dossier=None):
+    """
+    Déroule un seul profil et relève sa télémétrie à chaque période de commande.
+
+    Args:
+        noeuds: Tableau (K,) des valeurs de pédale aux noeuds
+        scenario: Entrée de SCENARIOS
+        params: Jeu de paramètres
+        frequence: Fréquence de l'intégrateur RK4 en Hz
+        periode_commande: Intervalle entre deux mises à jour des pédales en s
+        dossier: Si donné, la télémétrie y est aussi écrite (EnregistreurTelemetrie)
+    Returns:
+        Dictionnaire de tableaux (n,): t, vx, w, temp_ext, temp_int, usure,
+        accel, frein
+    """
+    lignes = [(0.0, 0.0, *scenario["etat_initial"])]
+    for t, pedales, etats in _deroulement(noeuds, scenario, params, frequence,
+                                           periode_commande):
+        lignes.append((t, pedales[0], *etats[0]))
+    table = np.array(lignes)
+    # La pédale d'une ligne est celle appliquée pour y arriver; celle de la
+    # première ligne est celle de la première période
+    pedale = np.append(table[1:, 1], table[-1, 1])
+
+    telemetrie = {"t": table[:, 0], "vx": table[:, 2], "w": table[:, 3],
+                  "temp_ext": table[:, 4], "temp_int": table[:, 5], "usure": table[:, 6],
+                  "accel": pedale if scenario["pedale"] == "accel" else np.zeros(len(table)),
+                  "frein": pedale if scenario["pedale"] == "frein" else np.zeros(len(table))}
+
+    if dossier is not None:
+        from telemetrie import EnregistreurTelemetrie
+        with EnregistreurTelemetrie(dossier, params=params) as enregistreur:
+            for i in range(len(table)):
+                enregistreur.ajouter(telemetrie["t"][i], table[i, 2:],
+                                     telemetrie["accel"][i], telemetrie["frein"][i])
+    return telemetrie
+
+
+def optimiser(scenario, population=64, noeuds=NOEUDS, iterations=20, part_elite=0.125,
+              lissage=0.7, ecart_min=0.02, graine=0, limites=None,
+              params=phys.PARAMETRES_DEFAUT, frequence=1000.0,
+              periode_commande=PERIODE_COMMANDE, dossier=None, affichage=False):
+    """
+    Cherche le profil de pédale de coût minimal par entropie croisée.
+
+    Args:
+        scenario: Nom dans SCENARIOS, ou dictionnaire de même forme
+        population: Profils déroulés ensemble à chaque itération
+        noeuds: Nombre de noeuds du profil
+        iterations: Nombre d'itérations
+        part_elite: Fraction de la population qui met à jour la loi de tirage
+        lissage: Poids de la nouvelle estimation (1 = pas de mémoire)
+        ecart_min: Écart-type minimal par noeud (garde de l'exploration)
+        graine: Graine du générateur (même graine = même résultat)
+        limites: Limites de température et d'usure (LIMITES_DEFAUT)
+        params: Jeu de paramètres
+        frequence: Fréquence de l'intégrateur RK4 en Hz
+        periode_commande: Intervalle entre deux mises à jour des pédales en s
+        dossier: Si donné, la télémétrie du meilleur profil y est écrite
+        affichage: Affiche le meilleur coût à chaque itération
+    Returns:
+        Dictionnaire: "temps_noeuds", "noeuds" (meilleur profil), "cout",
+        "evaluation" (indicateurs du meilleur profil, voir evaluer_profils),
+        "historique" (meilleur coût par itération), "telemetrie"
+    """
+    if isinstance(scenario, str):
+        scenario = SCENARIOS[scenario]
+    rng = np.random.default_rng(graine)
+    nombre_elite = max(2, int(round(part_elite * population)))
+
+    moyenne = np.full(noeuds, 0.5)
+    ecart = np.full(noeuds, 0.3)
+    meilleur, meilleur_cout, historique = None, np.inf, []
+
+    for iteration in range(iterations):
+        candidats = np.clip(rng.normal(moyenne, ecart, (population, noeuds)), 0.0, 1.0)
+        if meilleur is not None:
+            candidats[0] = meilleur            # Le meilleur profil reste en lice
+        couts = evaluer_profils(candidats, scenario, limites, params, frequence,
+                                periode_commande)["cout"]
+
+        ordre = np.argsort(couts, kind="stable")
+        if couts[ordre[0]] < meilleur_cout:
+            meilleur, meilleur_cout = candidats[ordre[0]].copy(), float(couts[ordre[0]])
+        historique.append(meilleur_cout)
+
+        elite = candidats[ordre[:nombre_elite]]
+        moyenne = lissage * elite.mean(axis=0) + (1.0 - lissage) * moyenne
+        ecart = np.maximum(lissage * elite.std(axis=0) + (1.0 - lissage) * ecart, ecart_min)
+        if affichage:
+            print(f"  itération {iteration + 1:3d}: meilleur coût {meilleur_cout:.4f}")
+
+    evaluation = evaluer_profils(meilleur[None], scenario, limites, params, frequence,
+                                 periode_commande)
+    return {
+        "temps_noeuds": np.linspace(0.0, scenario["horizon"], noeuds),
+        "noeuds": meilleur,
+        "cout": meilleur_cout,
+        "evaluation": {nom: valeurs[0] for nom, valeurs in evaluation.items()},
+        "historique": np.array(historique),
+        "telemetrie": telemetrie_profil(meilleur, scenario, params, frequence,
+                                        periode_commande, dossier),
+    }
+
+
+if __name__ == "__main__":
+    import time
+
+    for nom in ("depart_100", "freinage_300"):
+        scenario = SCENARIOS[nom]
+        plein = evaluer_profils(np.ones((1, NOEUDS)), scenario)
+        debut = time.perf_counter()
+        resultat = optimiser(nom, population=48, iterations=15)
+        ecoule = time.perf_counter() - debut
+
+        critere = "temps" if scenario["pedale"] == "accel" else "distance"
+        unite = "s" if critere == "temps" else "m"
+        e = resultat["evaluation"]
+        print(f"{nom}: {15 * 48} déroulements en {ecoule:.1f}s")
+        print(f"  pédale à fond: {critere} {plein[critere][0]:.3f} {unite}, "
+              f"surface max {plein['temp_max'][0]:.1f}°C, usure {plein['usure'][0]:.4f}")
+        print(f"  profil optimal: {critere} {e[critere]:.3f} {unite}, "
+              f"surface max {e['temp_max']:.1f}°C, usure {e['usure']:.4f}")
+        print("  noeuds: " + " ".join(f"{v:.2f}" for v in resultat["noeuds"]))
@@ -0,0 +1,329 @@
+import functools
+import math
+import os
+
+import numpy as np
+
+import physique_roue as phys
+from integrateur import IntegrateurFixe
+
+try:
+    from numba import njit
+    NUMBA_DISPONIBLE = True
+except ImportError:
+    NUMBA_DISPONIBLE = False
+
+    def njit(*args, **kwargs):
+        # Sans Numba, les noyaux restent du Python pur (mêmes résultats)
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fonction: fonction
+
+
+# ==================== BACKEND COMPILÉ ====================
+# Les fonctions de physique_roue sont réécrites en noyaux scalaires
+# (module math, pas de NumPy sur des flottants) compilés par Numba quand il
+# est installé, ainsi que la boucle RK4 à pas fixe qui les appelle: un long
+# roulage hors ligne ne repasse plus par l'interpréteur à chaque sous-pas.
+#
+# Les paramètres sont passés aux noyaux sous forme d'un vecteur float64
+# (voir vecteur_parametres). Backends disponibles:
+#   "numba"   noyaux compilés (Numba requis)
+#   "python"  code existant: IntegrateurFixe + physique_roue.derivee
+#   "auto"    "numba" si disponible, sinon "python"
+# Le backend se choisit avec definir_backend() ou la variable
+# d'environnement PHYSIQUE_BACKEND.
+
+BACKENDS = ("auto", "numba", "python")
+
+# Champs de Parametres transmis aux noyaux, dans l'ordre du vecteur
+CHAMPS = (
+    "rayon", "masse_vehicule", "nombre_roues", "charge_roue", "inertie",
+    "pac_b", "pac_c", "pac_e",
+    "mu_0", "temp_ideale", "plage_temp",
+    "capacite_surface", "capacite_carcasse", "transfert_interne", "transfert_air",
+    "temp_ambiante",
+    "coeff_appui", "coeff_trainee", "coeff_roulement",
+    "puissance_max",
+    "vitesse_min_dynamique", "vitesse_min_mouvement", "vitesse_min_rotation",
+    "vitesse_min_reference", "seuil_usure", "facteur_usure",
+    "gravite",
+)
+(I_RAYON, I_MASSE, I_ROUES, I_CHARGE, I_INERTIE,
+ I_PAC_B, I_PAC_C, I_PAC_E,
+ I_MU_0, I_TEMP_IDEALE, I_PLAGE_TEMP,
+ I_CAP_SURFACE, I_CAP_CARCASSE, I_TRANSFERT_INTERNE, I_TRANSFERT_AIR,
+ I_TEMP_AMBIANTE,
+ I_APPUI, I_TRAINEE, I_ROULEMENT,
+ I_PUISSANCE_MAX,
+ I_V_DYNAMIQUE, I_V_MOUVEMENT, I_V_ROTATION, I_V_REFERENCE, I_SEUIL_USURE, I_FACTEUR_USURE,
+ I_GRAVITE) = range(len(CHAMPS))
+
+_backend = "auto"               # Fixé par definir_backend (PHYSIQUE_BACKEND à l'import)
+
+
+@functools.lru_cache(maxsize=128)
+def vecteur_parametres(params=phys.PARAMETRES_DEFAUT):
+    """
+    Convertit un jeu de paramètres (scalaires) en vecteur pour les noyaux.
+
+    Args:
+        params: Instance de Parametres
+    Returns:
+        Tableau float64 (len(CHAMPS),), en lecture seule
+    """
+    vecteur = np.array([float(getattr(params, nom)) for nom in CHAMPS])
+    vecteur.flags.writeable = False
+    return vecteur
+
+
+# ---------- Noyaux scalaires ----------
+
+@njit(cache=True)
+def friction(temp_surface, usure, P):
+    ecart = temp_surface - P[I_TEMP_IDEALE]
+    return P[I_MU_0] * (1.0 - usure) * math.exp(-ecart * ecart / (P[I_PLAGE_TEMP] ** 2))
+
+
+@njit(cache=True)
+def glissement(vx, w, P):
+    vitesse_roue = P[I_RAYON] * w
+    reference = max(abs(vx), abs(vitesse_roue), P[I_V_REFERENCE])
+    kappa = (vitesse_roue - vx) / reference
+    return max(-1.0, min(1.0, kappa))
+
+
+@njit(cache=True)
+def force_traction(kappa, charge, mu, P):
+    argument = P[I_PAC_B] * kappa
+    correction = P[I_PAC_E] * (argument - math.atan(argument))
+    return mu * charge * P[I_GRAVITE] * math.sin(P[I_PAC_C] * math.atan(argument - correction))
+
+
+@njit(cache=True)
+def _thermique(temp_ext, temp_int, puissance_friction, P, D):
+    D[2] = (puissance_friction
+            - P[I_TRANSFERT_INTERNE] * (temp_ext - temp_int)
+            - P[I_TRANSFERT_AIR] * (temp_ext - P[I_TEMP_AMBIANTE])) / P[I_CAP_SURFACE]
+    D[3] = (P[I_TRANSFERT_INTERNE] * (temp_ext - temp_int)
+            - P[I_TRANSFERT_AIR] * (temp_int - P[I_TEMP_AMBIANTE])) / P[I_CAP_CARCASSE]
+
+
+@njit(cache=True)
+def regime_basse_vitesse(X, moment_accel, moment_frein, P, D):
+    vx, temp_ext, usure = X[0], X[2], X[4]
+    roues = P[I_ROUES]
+    force_max = friction(temp_ext, usure, P) * P[I_CHARGE] * P[I_GRAVITE] * roues
+
+    force_nette = (moment_accel / P[I_RAYON]
+                   - (moment_frein / P[I_RAYON]) * roues
+                   - P[I_ROULEMENT] * P[I_CHARGE] * P[I_GRAVITE] * roues)
+    force_nette = max(-force_max, min(force_max, force_nette))
+
+    dvx = force_nette / P[I_MASSE] if (vx > P[I_V_MOUVEMENT] or force_nette > 0) else 0.0
+    D[0] = dvx
+    D[1] = dvx / P[I_RAYON] if vx > P[I_V_ROTATION] else 0.0
+    _thermique(temp_ext, X[3], 0.0, P, D)
+    D[4] = 0.0
+
+
+@njit(cache=True)
+def regime_dynamique(X, moment_accel, moment_frein, P, D):
+    vx, w, temp_ext, usure = X[0], X[1], X[2], X[4]
+    roues = P[I_ROUES]
+
+    charge = P[I_CHARGE] + P[I_APPUI] * vx * vx / (roues * P[I_GRAVITE])
+    kappa = glissement(vx, w, P)
+    force = force_traction(kappa, charge, friction(temp_ext, usure, P), P)
+
+    moment_effectif = moment_accel
+    if w > P[I_V_ROTATION]:
+        moment_effectif = min(moment_accel, P[I_PUISSANCE_MAX] / w)
+
+    force_trainee = P[I_TRAINEE] * vx * vx
+    force_roulement = P[I_ROULEMENT] * charge * P[I_GRAVITE] * roues
+
+    dvx = (roues * force - force_trainee - force_roulement) / P[I_MASSE]
+    dw = (moment_effectif / roues - moment_frein - force * P[I_RAYON]) / P[I_INERTIE]
+    if w <= P[I_V_ROTATION] and dw < 0:
+        dw = 0.0
+    if vx <= P[I_V_ROTATION] and dvx < 0:
+        dvx = 0.0
+
+    D[0] = dvx
+    D[1] = dw
+    _thermique(temp_ext, X[3], abs(force * (P[I_RAYON] * w - vx)), P, D)
+    D[4] = kappa * kappa / P[I_FACTEUR_USURE] if abs(kappa) > P[I_SEUIL_USURE] else 0.0
+
+
+@njit(cache=True)
+def derivee_noyau(X, moment_accel, moment_frein, P, D):
+    """Équivalent de physique_roue.derivee, écrit dans D (5,)."""
+    if X[0] < P[I_V_DYNAMIQUE] and P[I_RAYON] * X[1] < P[I_V_DYNAMIQUE]:
+        regime_basse_vitesse(X, moment_accel, moment_frein, P, D)
+    else:
+        regime_dynamique(X, moment_accel, moment_frein, P, D)
+
+
+@njit(cache=True)
+def integrer_noyau(X, moment_accel, moment_frein, P, pas, nombre_pas, decimation, sortie):
+    """
+    RK4 à pas fixe avec la projection de borner_etat, sur place dans X.
+    Une ligne de `sortie` est écrite tous les `decimation` pas (si > 0).
+    Renvoie le nombre de lignes écrites, ou -1 si l'état devient non fini.
+    """
+    k1 = np.empty(5)
+    k2 = np.empty(5)
+    k3 = np.empty(5)
+    k4 = np.empty(5)
+    tmp = np.empty(5)
+    lignes = 0
+    for n in range(nombre_pas):
+        derivee_noyau(X, moment_accel, moment_frein, P, k1)
+        for i in range(5):
+            tmp[i] = X[i] + 0.5 * pas * k1[i]
+        derivee_noyau(tmp, moment_accel, moment_frein, P, k2)
+        for i in range(5):
+            tmp[i] = X[i] + 0.5 * pas * k2[i]
+        derivee_noyau(tmp, moment_accel, moment_frein, P, k3)
+        for i in range(5):
+            tmp[i] = X[i] + pas * k3[i]
+        derivee_noyau(tmp, moment_accel, moment_frein, P, k4)
+        for i in range(5):
+            X[i] += pas / 6.0 * (k1[i] + 2.0 * (k2[i] + k3[i]) + k4[i])
+
+        # Projection (borner_etat)
+        if X[0] < 0.0:
+            X[0] = 0.0
+        if X[4] < 0.0:
+            X[4] = 0.0
+        elif X[4] > 1.0:
+            X[4] = 1.0
+
+        if decimation > 0 and (n + 1) % decimation == 0 and lignes < sortie.shape[0]:
+            for i in range(5):
+                sortie[lignes, i] = X[i]
+            lignes += 1
+
+    for i in range(5):
+        if not math.isfinite(X[i]):
+            return -1
+    return lignes
+
+
+# ---------- Sélection du backend ----------
+
+def definir_backend(nom):
+    """
+    Choisit le backend utilisé par integrer() et derivee().
+
+    Args:
+        nom: "auto", "numba" ou "python"
+    Raises:
+        ValueError: Nom inconnu, ou "numba" demandé sans Numba installé
+    """
+    global _backend
+    if nom not in BACKENDS:
+        raise ValueError(f"Backend inconnu: {nom} (attendu: {', '.join(BACKENDS)})")
+    if nom == "numba" and not NUMBA_DISPONIBLE:
+        raise ValueError("Backend numba demandé mais Numba n'est pas installé")
+    _backend = nom
+
+
+# Même contrôle que l'argument explicite: un nom inconnu ou "numba" sans
+# Numba échoue à l'import au lieu de retomber en Python pur
+definir_backend(os.environ.get("PHYSIQUE_BACKEND", "auto"))
+
+
+def backend_actif():
+    """Nom du backend effectivement utilisé ("numba" ou "python")."""
+    if _backend == "auto":
+        return "numba" if NUMBA_DISPONIBLE else "python"
+    return _backend
+
+
+def _backend_pour(params, backend):
+    if backend is None:
+        backend = backend_actif()
+    elif backend not in BACKENDS:
+        raise ValueError(f"Backend inconnu: {backend} (attendu: {', '.join(BACKENDS)})")
+    elif backend == "numba" and not NUMBA_DISPONIBLE:
+        raise ValueError("Backend numba demandé mais Numba n'est pas installé")
+    if backend == "auto":
+        backend = "numba" if NUMBA_DISPONIBLE else "python"
+    # Les noyaux n'implémentent que la Magic Formula analytique
+    if params.pacejka_tabulee:
+        backend = "python"
+    return backend
+
+
+def derivee(t, X, moment_accel, moment_frein, params=phys.PARAMETRES_DEFAUT):
+    """
+    Même signature que physique_roue.derivee, via le backend actif.
+    """
+    if _backend_pour(params, None) == "python":
+        return phys.derivee(t, X, moment_accel, moment_frein, params)
+    D = np.empty(5)
+    derivee_noyau(np.asarray(X, dtype=float), float(moment_accel), float(moment_frein),
+                  vecteur_parametres(params), D)
+    return D
+
+
+def integrer(etat_initial, duree, moment_accel, moment_frein, params=phys.PARAMETRES_DEFAUT,
+             frequence=1000.0, decimation=0, backend=None):
+    """
+    Intègre à pas fixe (RK4) avec des couples constants.
+
+    Args:
+        etat_initial: [vx, w, temp_ext, temp_int, usure]
+        duree: Durée simulée en s
+        moment_accel: Couple moteur en N.m
+        moment_frein: Couple de frein en N.m
+        params: Jeu de paramètres (champs scalaires)
+        frequence: Fréquence des pas en Hz
+        decimation: Garde un état tous les `decimation` pas (0 = aucun)
+        backend: "auto", "numba", "python" ou None pour le backend actif
+    Returns:
+        (état final (5,), trajectoire (K, 5) ou None)
+    Raises:
+        ValueError: Backend inconnu, ou "numba" demandé sans Numba installé
+        FloatingPointError: Si l'état devient non fini
+    """
+    pas = 1.0 / frequence
+    nombre_pas = int(round(duree * frequence))
+    sortie = np.empty((nombre_pas // decimation if decimation > 0 else 0, 5))
+
+    if _backend_pour(params, backend) == "python":
+        integrateur = IntegrateurFixe(phys.derivee, etat_initial, frequence=frequence,
+                                      sous_pas_max=max(1, nombre_pas))
+        if decimation > 0:
+            for i in range(len(sortie)):
+                sortie[i] = integrateur.avancer(decimation * pas, moment_accel,
+                                                moment_frein, params)
+            integrateur.avancer((nombre_pas - len(sortie) * decimation) * pas,
+                                moment_accel, moment_frein, params)
+        else:
+            integrateur.avancer(nombre_pas * pas, moment_accel, moment_frein, params)
+        return integrateur.etat.copy(), (sortie if decimation > 0 else None)
+
+    X = np.array(etat_initial, dtype=float)
+    lignes = integrer_noyau(X, float(moment_accel), float(moment_frein),
+                            vecteur_parametres(params), pas, nombre_pas, decimation, sortie)
+    if lignes < 0:
+        raise FloatingPointError("État non fini après intégration")
+    return X, (sortie if decimation > 0 else None)
+
+
+if __name__ == "__main__":
+    import time
+
+    moment_accel = phys.get_couple_moteur(1.0)
+    print(f"Numba disponible: {NUMBA_DISPONIBLE}")
+    integrer(phys.ETAT_INITIAL, 0.01, moment_accel, 0.0)    # Compilation
+
+    for backend in ("python", "numba") if NUMBA_DISPONIBLE else ("python",):
+        debut = time.perf_counter()
+        X, _ = integrer(phys.ETAT_INITIAL, 60.0, moment_accel, 0.0, backend=backend)
+        ecoule = time.perf_counter() - debut
+        print(f"{backend:7s} 60 s à 1 kHz en {ecoule:.3f}s "
+              f"({60000 / ecoule:,.0f} pas/s), vitesse finale {X[0]*3.6:.2f} km/h")
@@ -1,5 +1,10 @@
+from dataclasses import dataclass, fields
+
 import numpy as np
 
+import compteurs
+from table_pacejka import obtenir_table
+
 # ==================== DIMENSIONS ET MASSE ====================
 RAYON = 0.33                    # Rayon du pneu en mètres (18 pouces)
 MASSE_VEHICULE = 798.0          # Masse totale F1 + pilote en kg
@@ -46,6 +51,15 @@ VITESSE_MIN_REFERENCE = 0.5     # Vitesse de référence min pour kappa
 SEUIL_USURE = 0.05              # Glissement min pour causer de l'usure
 FACTEUR_USURE = 100.0           # Diviseur pour le calcul d'usure
 
+# ==================== VÉHICULE À QUATRE ROUES ====================
+# Utilisés par le modèle quatre roues (vehicule.py) uniquement
+EMPATTEMENT = 3.6               # Distance entre essieux en m
+HAUTEUR_CG = 0.28               # Hauteur du centre de gravité en m
+REPARTITION_MASSE = 0.45        # Part de la masse sur l'essieu avant
+REPARTITION_APPUI = 0.45        # Part de l'appui aérodynamique à l'avant
+REPARTITION_COUPLE = 0.0        # Part du couple moteur à l'avant (0 = propulsion)
+REPARTITION_FREIN = 0.6         # Part du freinage à l'avant
+
 # ==================== GRAVITÉ ====================
 GRAVITE = 9.81                  # Accélération gravitationnelle en m/s²
 
@@ -53,31 +67,134 @@ GRAVITE = 9.81                  # Accélération gravitationnelle en m/s²
 ETAT_INITIAL = [0.0, 0.0, 95.0, 85.0, 0.0]
 
 
-def get_couple_moteur(pourcentage):
+
+# ==================== JEU DE PARAMÈTRES ====================
+@dataclass(frozen=True)
+class Parametres:
+    """
+    Jeu de paramètres pneu/véhicule immuable.
+    Les valeurs par défaut sont les constantes du module. Une instance est
+    passée à derivee() et à ses fonctions auxiliaires, ce qui permet de faire
+    tourner plusieurs configurations dans un même processus (ou un pool).
+    Créer une variante: dataclasses.replace(PARAMETRES_DEFAUT, pac_b=10.0)
+    """
+    rayon: float = RAYON
+    masse_vehicule: float = MASSE_VEHICULE
+    masse_roue: float = MASSE_ROUE
+    nombre_roues: int = NOMBRE_ROUES
+
+    pac_b: float = PAC_B
+    pac_c: float = PAC_C
+    pac_e: float = PAC_E
+    pacejka_tabulee: bool = False   # Interpolation dans une table (voir table_pacejka)
+
+    mu_0: float = MU_0
+    temp_ideale: float = TEMP_IDEALE
+    plage_temp: float = PLAGE_TEMP
+    capacite_surface: float = CAPACITE_SURFACE
+    capacite_carcasse: float = CAPACITE_CARCASSE
+    transfert_interne: float = TRANSFERT_INTERNE
+    transfert_air: float = TRANSFERT_AIR
+    temp_ambiante: float = TEMP_AMBIANTE
+
+    coeff_appui: float = COEFF_APPUI
+    coeff_trainee: float = COEFF_TRAINEE
+    coeff_roulement: float = COEFF_ROULEMENT
+
+    couple_moteur_max: float = COUPLE_MOTEUR_MAX
+    couple_frein_max: float = COUPLE_FREIN_MAX
+    puissance_max: float = PUISSANCE_MAX
+
+    vitesse_min_dynamique: float = VITESSE_MIN_DYNAMIQUE
+    vitesse_min_mouvement: float = VITESSE_MIN_MOUVEMENT
+    vitesse_min_rotation: float = VITESSE_MIN_ROTATION
+    vitesse_min_reference: float = VITESSE_MIN_REFERENCE
+    seuil_usure: float = SEUIL_USURE
+    facteur_usure: float = FACTEUR_USURE
+
+    empattement: float = EMPATTEMENT
+    hauteur_cg: float = HAUTEUR_CG
+    repartition_masse: float = REPARTITION_MASSE
+    repartition_appui: float = REPARTITION_APPUI
+    repartition_couple: float = REPARTITION_COUPLE
+    repartition_frein: float = REPARTITION_FREIN
+
+    gravite: float = GRAVITE
+
+    def __post_init__(self):
+        # Table de Pacejka résolue une fois par jeu, pas à chaque appel de
+        # calculer_force_traction. None: formule analytique (table non
+        # demandée, ou coefficients empilés en tableaux).
+        table = None
+        if (self.pacejka_tabulee and np.ndim(self.pac_b) == 0 and np.ndim(self.pac_c) == 0
+                and np.ndim(self.pac_e) == 0):
+            table = obtenir_table(float(self.pac_b), float(self.pac_c), float(self.pac_e))
+        object.__setattr__(self, "_table_pacejka", table)
+
+    @property
+    def charge_roue(self):
+        """Charge statique par roue en kg."""
+        return self.masse_vehicule / self.nombre_roues
+
+    @property
+    def inertie(self):
+        """Inertie de la roue en kg.m²."""
+        return 1.5 * self.masse_roue * self.rayon**2
+
+
+PARAMETRES_DEFAUT = Parametres()
+
+
+def empiler_parametres(liste_params):
+    """
+    Regroupe plusieurs jeux de paramètres en un seul, dont chaque champ qui
+    varie devient un tableau (N,). Le résultat s'utilise avec
+    derivee_vectorisee pour simuler N configurations en une passe.
+    
+    Args:
+        liste_params: Séquence de N instances de Parametres
+    Returns:
+        Instance de Parametres à champs scalaires ou tableaux (N,)
+    Raises:
+        ValueError: Si pacejka_tabulee n'est pas le même pour tous les jeux
+    """
+    if len({bool(p.pacejka_tabulee) for p in liste_params}) > 1:
+        raise ValueError("pacejka_tabulee doit être identique pour tous les jeux empilés")
+    valeurs = {}
+    for champ in fields(Parametres):
+        colonne = np.array([getattr(p, champ.name) for p in liste_params], dtype=float)
+        valeurs[champ.name] = (colonne if np.any(colonne != colonne[0])
+                               else getattr(liste_params[0], champ.name))
+    return Parametres(**valeurs)
+
+
+def get_couple_moteur(pourcentage, params=PARAMETRES_DEFAUT):
     """
     Convertit un pourcentage d'accélération en couple moteur.
     
     Args:
         pourcentage: Valeur entre 0 et 1 (0% à 100%)
+        params: Jeu de paramètres
     Returns:
         Couple en N.m
     """
-    return pourcentage * COUPLE_MOTEUR_MAX
+    return pourcentage * params.couple_moteur_max
 
 
-def get_couple_frein(pourcentage):
+def get_couple_frein(pourcentage, params=PARAMETRES_DEFAUT):
     """
     Convertit un pourcentage de freinage en couple de frein.
     
     Args:
         pourcentage: Valeur entre 0 et 1 (0% à 100%)
+        params: Jeu de paramètres
     Returns:
         Couple en N.m
     """
-    return pourcentage * COUPLE_FREIN_MAX
+    return pourcentage * params.couple_frein_max
 
 
-def calculer_friction(temp_surface, usure):
+def calculer_friction(temp_surface, usure, params=PARAMETRES_DEFAUT):
     """
     Calcule le coefficient de friction selon la température et l'usure.
     La friction est maximale à la température idéale et diminue avec l'usure.
@@ -85,17 +202,18 @@ def calculer_friction(temp_surface, usure):
     Args:
         temp_surface: Température de la surface du pneu en °C
         usure: Niveau d'usure entre 0 (neuf) et 1 (mort)
+        params: Jeu de paramètres
     Returns:
         Coefficient de friction
     """
     degradation_usure = 1.0 - usure
-    ecart_temp = (temp_surface - TEMP_IDEALE) ** 2
-    degradation_temp = np.exp(-ecart_temp / (PLAGE_TEMP ** 2))
+    ecart_temp = (temp_surface - params.temp_ideale) ** 2
+    degradation_temp = np.exp(-ecart_temp / (params.plage_temp ** 2))
     
-    return MU_0 * degradation_usure * degradation_temp
+    return params.mu_0 * degradation_usure * degradation_temp
 
 
-def calculer_glissement(vitesse_vehicule, vitesse_angulaire):
+def calculer_glissement(vitesse_vehicule, vitesse_angulaire, params=PARAMETRES_DEFAUT):
     """
     Calcule le taux de glissement (kappa) entre la roue et le sol.
     - kappa > 0 : La roue tourne plus vite que le sol (accélération)
@@ -105,17 +223,22 @@ def calculer_glissement(vitesse_vehicule, vitesse_angulaire):
     Args:
         vitesse_vehicule: Vitesse du véhicule en m/s
         vitesse_angulaire: Vitesse de rotation de la roue en rad/s
+        params: Jeu de paramètres
     Returns:
         Taux de glissement (kappa) entre -1 et 1
     """
-    vitesse_roue = RAYON * vitesse_angulaire
-    vitesse_reference = max(abs(vitesse_vehicule), abs(vitesse_roue), VITESSE_MIN_REFERENCE)
+    vitesse_roue = params.rayon * vitesse_angulaire
+    vitesse_reference = max(abs(vitesse_vehicule), abs(vitesse_roue), params.vitesse_min_reference)
     
     kappa = (vitesse_roue - vitesse_vehicule) / vitesse_reference
+    if -1.0 <= kappa <= 1.0:
+        return kappa
+    if compteurs.actif:
+        compteurs.compter("bornage_kappa")
     return max(-1.0, min(1.0, kappa))
 
 
-def calculer_force_traction(kappa, charge_dynamique, friction):
+def calculer_force_traction(kappa, charge_dynamique, friction, params=PARAMETRES_DEFAUT):
     """
     Calcule la force de traction selon le modèle de Pacejka (Magic Formula).
     C'est une formule empirique qui reproduit bien le comportement des pneus.
@@ -124,128 +247,227 @@ def calculer_force_traction(kappa, charge_dynamique, friction):
         kappa: Taux de glissement
         charge_dynamique: Charge sur la roue en kg
         friction: Coefficient de friction
+        params: Jeu de paramètres
     Returns:
         Force de traction en N
     """
     # D est le pic de force possible
-    D = friction * charge_dynamique * GRAVITE
+    D = friction * charge_dynamique * params.gravite
+    
+    # Courbe tabulée, résolue à la construction du jeu (Parametres.__post_init__)
+    table = params._table_pacejka
+    if table is not None:
+        if isinstance(kappa, float):
+            return D * table.evaluer(kappa)
+        return D * table.evaluer_vectorise(kappa)
     
     # Magic Formula de Pacejka
-    argument = PAC_B * kappa
+    argument = params.pac_b * kappa
     terme_atan = np.atan(argument)
-    correction = PAC_E * (argument - terme_atan)
+    correction = params.pac_e * (argument - terme_atan)
     
-    force = D * np.sin(PAC_C * np.atan(argument - correction))
+    force = D * np.sin(params.pac_c * np.atan(argument - correction))
     
     return force
 
 
-def regime_basse_vitesse(etat, moment_accel, moment_frein):
+def calculer_derivee_traction(kappa, charge_dynamique, friction, params=PARAMETRES_DEFAUT):
     """
-    Modèle simplifié pour les très basses vitesses.
-    Évite les divisions par zéro et gère l'arrêt complet.
+    Dérivée de la force de Pacejka par rapport au glissement (dF/dkappa).
+    Utilisée par la jacobienne analytique (voir jacobien.py).
+    
+    Args:
+        kappa: Taux de glissement
+        charge_dynamique: Charge sur la roue en kg
+        friction: Coefficient de friction
+        params: Jeu de paramètres
+    Returns:
+        dF/dkappa en N
+    """
+    D = friction * charge_dynamique * params.gravite
+    
+    argument = params.pac_b * kappa
+    phi = argument - params.pac_e * (argument - np.atan(argument))
+    dphi = params.pac_b * (1.0 - params.pac_e + params.pac_e / (1.0 + argument**2))
+    
+    return D * np.cos(params.pac_c * np.atan(phi)) * params.pac_c / (1.0 + phi**2) * dphi
+
+
+def calculer_flux_thermiques(temp_ext, temp_int, puissance_friction, params=PARAMETRES_DEFAUT):
+    """
+    Bilan thermique du modèle à deux masses (surface et carcasse).
+    La puissance dissipée par friction chauffe la surface, qui échange avec
+    la carcasse et l'air; la carcasse échange avec l'air.
+    
+    Args:
+        temp_ext: Température de surface en °C
+        temp_int: Température de carcasse en °C
+        puissance_friction: Puissance de glissement reçue par la surface en W
+        params: Jeu de paramètres
+    Returns:
+        (dt_ext, dt_int) en °C/s
+    """
+    dt_ext = (puissance_friction - 
+              params.transfert_interne * (temp_ext - temp_int) - 
+              params.transfert_air * (temp_ext - params.temp_ambiante)) / params.capacite_surface
+    dt_int = (params.transfert_interne * (temp_ext - temp_int) - 
+              params.transfert_air * (temp_int - params.temp_ambiante)) / params.capacite_carcasse
+    return dt_ext, dt_int
+
+
+def mecanique_basse_vitesse(etat, moment_accel, moment_frein, params=PARAMETRES_DEFAUT):
+    """
+    Partie mécanique de regime_basse_vitesse.
     
     Args:
         etat: [vx, w, temp_ext, temp_int, usure]
         moment_accel: Couple moteur en N.m
         moment_frein: Couple de frein en N.m
+        params: Jeu de paramètres
     Returns:
-        Liste des dérivées
+        (dvx, dw, puissance_friction, dusure)
     """
     vx, w, temp_ext, temp_int, usure = etat
     
     # Calcul de la friction disponible
-    mu = calculer_friction(temp_ext, usure)
-    force_friction_max = mu * CHARGE_ROUE * GRAVITE
+    mu = calculer_friction(temp_ext, usure, params)
+    force_friction_max = mu * params.charge_roue * params.gravite
     
     # Forces appliquées
-    force_moteur = moment_accel / RAYON
-    force_frein_total = (moment_frein / RAYON) * NOMBRE_ROUES
-    force_resistance = COEFF_ROULEMENT * CHARGE_ROUE * GRAVITE * NOMBRE_ROUES
+    force_moteur = moment_accel / params.rayon
+    force_frein_total = (moment_frein / params.rayon) * params.nombre_roues
+    force_resistance = (params.coeff_roulement * params.charge_roue *
+                        params.gravite * params.nombre_roues)
     
     # Bilan des forces (saturé par la friction max)
     force_nette = force_moteur - force_frein_total - force_resistance
-    force_nette = max(-force_friction_max * NOMBRE_ROUES, 
-                     min(force_friction_max * NOMBRE_ROUES, force_nette))
+    force_nette_max = force_friction_max * params.nombre_roues
+    if not -force_nette_max <= force_nette <= force_nette_max:
+        force_nette = max(-force_nette_max, min(force_nette_max, force_nette))
+        if compteurs.actif:
+            compteurs.compter("bornage_force")
     
     # Accélérations (avec sécurités pour éviter les vitesses négatives)
-    dvx = force_nette / MASSE_VEHICULE if (vx > VITESSE_MIN_MOUVEMENT or force_nette > 0) else 0
-    dw = dvx / RAYON if vx > VITESSE_MIN_ROTATION else 0
+    en_mouvement = vx > params.vitesse_min_mouvement or force_nette > 0
+    dvx = force_nette / params.masse_vehicule if en_mouvement else 0
+    dw = dvx / params.rayon if vx > params.vitesse_min_rotation else 0
     
-    # Refroidissement simple (pas de friction = pas de chaleur générée)
-    dt_ext = (-TRANSFERT_INTERNE * (temp_ext - temp_int) - 
-              TRANSFERT_AIR * (temp_ext - TEMP_AMBIANTE)) / CAPACITE_SURFACE
-    dt_int = (TRANSFERT_INTERNE * (temp_ext - temp_int) - 
-              TRANSFERT_AIR * (temp_int - TEMP_AMBIANTE)) / CAPACITE_CARCASSE
+    # Pas de friction = pas de chaleur générée ni d'usure
+    return dvx, dw, 0.0, 0.0
+
+
+def regime_basse_vitesse(etat, moment_accel, moment_frein, params=PARAMETRES_DEFAUT):
+    """
+    Modèle simplifié pour les très basses vitesses.
+    Évite les divisions par zéro et gère l'arrêt complet.
+    
+    Args:
+        etat: [vx, w, temp_ext, temp_int, usure]
+        moment_accel: Couple moteur en N.m
+        moment_frein: Couple de frein en N.m
+        params: Jeu de paramètres
+    Returns:
+        Liste des dérivées
+    """
+    dvx, dw, _, _ = mecanique_basse_vitesse(etat, moment_accel, moment_frein, params)
+    
+    # Refroidissement simple
+    dt_ext, dt_int = calculer_flux_thermiques(etat[2], etat[3], 0.0, params)
     
     return [dvx, dw, dt_ext, dt_int, 0.0]
 
 
-def regime_dynamique(etat, moment_accel, moment_frein):
+def mecanique_dynamique(etat, moment_accel, moment_frein, params=PARAMETRES_DEFAUT):
     """
-    Modèle complet avec Pacejka pour les vitesses normales.
-    Prend en compte l'aérodynamique, la thermique et l'usure.
+    Partie mécanique de regime_dynamique: accélérations, puissance de
+    glissement et vitesse d'usure.
     
     Args:
         etat: [vx, w, temp_ext, temp_int, usure]
         moment_accel: Couple moteur en N.m
         moment_frein: Couple de frein en N.m
+        params: Jeu de paramètres
     Returns:
-        Liste des dérivées
+        (dvx, dw, puissance_friction, dusure)
     """
     vx, w, temp_ext, temp_int, usure = etat
     
     # Charge dynamique avec downforce aérodynamique
-    force_appui = COEFF_APPUI * vx**2
-    charge_dynamique = CHARGE_ROUE + force_appui / (NOMBRE_ROUES * GRAVITE)
+    force_appui = params.coeff_appui * vx**2
+    charge_dynamique = params.charge_roue + force_appui / (params.nombre_roues * params.gravite)
     
     # Calcul du glissement
-    kappa = calculer_glissement(vx, w)
+    kappa = calculer_glissement(vx, w, params)
     
     # Force de traction via Pacejka
-    mu = calculer_friction(temp_ext, usure)
-    force_traction = calculer_force_traction(kappa, charge_dynamique, mu)
+    mu = calculer_friction(temp_ext, usure, params)
+    force_traction = calculer_force_traction(kappa, charge_dynamique, mu, params)
     
     # Limitation de puissance à haute vitesse (P = C * omega)
     moment_effectif = moment_accel
-    if w > VITESSE_MIN_ROTATION:
-        moment_effectif = min(moment_accel, PUISSANCE_MAX / w)
+    if w > params.vitesse_min_rotation:
+        moment_limite = params.puissance_max / w
+        if moment_accel > moment_limite:
+            moment_effectif = moment_limite
+            if compteurs.actif:
+                compteurs.compter("limitation_puissance")
     
-    moment_par_roue = moment_effectif / NOMBRE_ROUES
+    moment_par_roue = moment_effectif / params.nombre_roues
     
     # Forces résistantes
-    force_trainee = COEFF_TRAINEE * vx**2
-    force_roulement = COEFF_ROULEMENT * charge_dynamique * GRAVITE * NOMBRE_ROUES
+    force_trainee = params.coeff_trainee * vx**2
+    force_roulement = (params.coeff_roulement * charge_dynamique *
+                       params.gravite * params.nombre_roues)
     
     # Accélérations
     # Véhicule: somme des 4 roues - traînée - roulement
-    dvx = (NOMBRE_ROUES * force_traction - force_trainee - force_roulement) / MASSE_VEHICULE
+    dvx = ((params.nombre_roues * force_traction - force_trainee - force_roulement) /
+           params.masse_vehicule)
     # Roue: couple moteur - frein - réaction du sol
-    dw = (moment_par_roue - moment_frein - force_traction * RAYON) / INERTIE
+    dw = (moment_par_roue - moment_frein - force_traction * params.rayon) / params.inertie
     
     # Sécurités anti-vitesses négatives
-    if w <= VITESSE_MIN_ROTATION and dw < 0:
+    if w <= params.vitesse_min_rotation and dw < 0:
         dw = 0.0
-    if vx <= VITESSE_MIN_ROTATION and dvx < 0:
+        if compteurs.actif:
+            compteurs.compter("garde_w")
+    if vx <= params.vitesse_min_rotation and dvx < 0:
         dvx = 0.0
+        if compteurs.actif:
+            compteurs.compter("garde_vx")
     
-    # Équations thermiques
     # La puissance dissipée par friction chauffe le pneu
-    puissance_friction = abs(force_traction * (RAYON * w - vx))
-    
-    dt_ext = (puissance_friction - 
-              TRANSFERT_INTERNE * (temp_ext - temp_int) - 
-              TRANSFERT_AIR * (temp_ext - TEMP_AMBIANTE)) / CAPACITE_SURFACE
-    dt_int = (TRANSFERT_INTERNE * (temp_ext - temp_int) - 
-              TRANSFERT_AIR * (temp_int - TEMP_AMBIANTE)) / CAPACITE_CARCASSE
+    puissance_friction = abs(force_traction * (params.rayon * w - vx))
     
     # Usure (proportionnelle au glissement au carré)
-    dusure = (abs(kappa) ** 2) / FACTEUR_USURE if abs(kappa) > SEUIL_USURE else 0.0
+    dusure = (abs(kappa) ** 2) / params.facteur_usure if abs(kappa) > params.seuil_usure else 0.0
+    
+    return dvx, dw, puissance_friction, abs(dusure)
+
+
+def regime_dynamique(etat, moment_accel, moment_frein, params=PARAMETRES_DEFAUT):
+    """
+    Modèle complet avec Pacejka pour les vitesses normales.
+    Prend en compte l'aérodynamique, la thermique et l'usure.
+    
+    Args:
+        etat: [vx, w, temp_ext, temp_int, usure]
+        moment_accel: Couple moteur en N.m
+        moment_frein: Couple de frein en N.m
+        params: Jeu de paramètres
+    Returns:
+        Liste des dérivées
+    """
+    dvx, dw, puissance_friction, dusure = mecanique_dynamique(etat, moment_accel,
+                                                              moment_frein, params)
     
-    return [dvx, dw, dt_ext, dt_int, abs(dusure)]
+    # Équations thermiques
+    dt_ext, dt_int = calculer_flux_thermiques(etat[2], etat[3], puissance_friction, params)
+    
+    return [dvx, dw, dt_ext, dt_int, dusure]
 
 
-def derivee(t, X, moment_accel, moment_frein):
+def derivee(t, X, moment_accel, moment_frein, params=PARAMETRES_DEFAUT):
     """
     Fonction principale appelée par le solveur différentiel.
     Choisit le régime approprié selon la vitesse.
@@ -255,14 +477,230 @@ def derivee(t, X, moment_accel, moment_frein):
         X: État [vx, w, temp_ext, temp_int, usure]
         moment_accel: Couple moteur
         moment_frein: Couple de frein
+        params: Jeu de paramètres
     Returns:
         Liste des dérivées temporelles
     """
     vx, w = X[0], X[1]
     
     # Choix du régime selon la vitesse
-    if vx < VITESSE_MIN_DYNAMIQUE and RAYON * w < VITESSE_MIN_DYNAMIQUE:
-        return regime_basse_vitesse(X, moment_accel, moment_frein)
+    if vx < params.vitesse_min_dynamique and params.rayon * w < params.vitesse_min_dynamique:
+        if compteurs.actif:
+            compteurs.compter("derivee_basse_vitesse")
+        return regime_basse_vitesse(X, moment_accel, moment_frein, params)
     else:
-        return regime_dynamique(X, moment_accel, moment_frein)
+        if compteurs.actif:
+            compteurs.compter("derivee_dynamique")
+        return regime_dynamique(X, moment_accel, moment_frein, params)
+
 
+def derivee_mecanique(t, X, moment_accel, moment_frein, params=PARAMETRES_DEFAUT):
+    """
+    Partie mécanique de derivee(), sans les équations thermiques.
+    Utilisée par l'intégrateur multi-cadence, qui garde la thermique et
+    l'usure figées pendant les sous-pas mécaniques.
+    
+    Args:
+        t: Temps (non utilisé)
+        X: État [vx, w, temp_ext, temp_int, usure]
+        moment_accel: Couple moteur
+        moment_frein: Couple de frein
+        params: Jeu de paramètres
+    Returns:
+        (dvx, dw, puissance_friction, dusure)
+    """
+    vx, w = X[0], X[1]
+    
+    if vx < params.vitesse_min_dynamique and params.rayon * w < params.vitesse_min_dynamique:
+        if compteurs.actif:
+            compteurs.compter("derivee_basse_vitesse")
+        return mecanique_basse_vitesse(X, moment_accel, moment_frein, params)
+    else:
+        if compteurs.actif:
+            compteurs.compter("derivee_dynamique")
+        return mecanique_dynamique(X, moment_accel, moment_frein, params)
+
+
+def calculer_grandeurs(X, moment_accel, moment_frein, params=PARAMETRES_DEFAUT):
+    """
+    Grandeurs intermédiaires de derivee() utiles en télémétrie.
+    En basse vitesse, la force par roue est déduite de l'accélération.
+    
+    Args:
+        X: État [vx, w, temp_ext, temp_int, usure]
+        moment_accel: Couple moteur
+        moment_frein: Couple de frein
+        params: Jeu de paramètres
+    Returns:
+        (kappa, force_traction, puissance_friction, friction)
+    """
+    vx, w, temp_ext, temp_int, usure = X
+    kappa = calculer_glissement(vx, w, params)
+    mu = calculer_friction(temp_ext, usure, params)
+    
+    if vx < params.vitesse_min_dynamique and params.rayon * w < params.vitesse_min_dynamique:
+        dvx = mecanique_basse_vitesse(X, moment_accel, moment_frein, params)[0]
+        return kappa, dvx * params.masse_vehicule / params.nombre_roues, 0.0, mu
+    
+    charge_dynamique = params.charge_roue + params.coeff_appui * vx**2 / (params.nombre_roues *
+                                                                         params.gravite)
+    force_traction = calculer_force_traction(kappa, charge_dynamique, mu, params)
+    puissance_friction = abs(force_traction * (params.rayon * w - vx))
+    return kappa, force_traction, puissance_friction, mu
+
+# ==================== VERSION VECTORISÉE ====================
+# Mêmes équations que ci-dessus, appliquées à N états à la fois.
+# Les branches `if` et les `max`/`min` deviennent des masques NumPy.
+
+def calculer_glissement_vectorise(vitesse_vehicule, vitesse_angulaire, params=PARAMETRES_DEFAUT):
+    """
+    Version vectorisée de calculer_glissement.
+    
+    Args:
+        vitesse_vehicule: Tableau des vitesses véhicule en m/s
+        vitesse_angulaire: Tableau des vitesses de rotation en rad/s
+        params: Jeu de paramètres
+    Returns:
+        Tableau des taux de glissement (kappa) entre -1 et 1
+    """
+    vitesse_roue = params.rayon * vitesse_angulaire
+    vitesse_reference = np.maximum(np.maximum(np.abs(vitesse_vehicule), np.abs(vitesse_roue)),
+                                   params.vitesse_min_reference)
+    
+    kappa = (vitesse_roue - vitesse_vehicule) / vitesse_reference
+    if compteurs.actif:
+        bornes = int(np.count_nonzero(np.abs(kappa) > 1.0))
+        if bornes:
+            compteurs.compter("bornage_kappa", bornes)
+    return np.minimum(np.maximum(kappa, -1.0), 1.0)
+
+
+def derivee_vectorisee(X, moment_accel, moment_frein, params=PARAMETRES_DEFAUT):
+    """
+    Évalue les dérivées de N états en une seule passe NumPy.
+    Équivalent ligne par ligne à derivee().
+    
+    Args:
+        X: Tableau (N, 5) des états [vx, w, temp_ext, temp_int, usure]
+        moment_accel: Couple moteur, scalaire ou tableau (N,)
+        moment_frein: Couple de frein, scalaire ou tableau (N,)
+        params: Jeu de paramètres
+    Returns:
+        Tableau (N, 5) des dérivées temporelles
+    """
+    # Le coût d'un appel est dominé par le nombre d'opérations NumPy, pas
+    # par N: pas de broadcast_to ni de clip, les couples scalaires sont
+    # diffusés par les opérations elles-mêmes.
+    X = np.asarray(X, dtype=float)
+    vx, w, temp_ext, temp_int, usure = X.T
+    moment_accel = np.asarray(moment_accel, dtype=float)
+    moment_frein = np.asarray(moment_frein, dtype=float)
+    charge_roue = params.charge_roue
+    
+    # Choix du régime selon la vitesse (masque au lieu du if)
+    basse_vitesse = ((vx < params.vitesse_min_dynamique) &
+                     (params.rayon * w < params.vitesse_min_dynamique))
+    if compteurs.actif:
+        lignes_basse_vitesse = int(np.count_nonzero(basse_vitesse))
+        compteurs.compter("derivee_basse_vitesse", lignes_basse_vitesse)
+        compteurs.compter("derivee_dynamique", basse_vitesse.size - lignes_basse_vitesse)
+    
+    mu = calculer_friction(temp_ext, usure, params)
+    
+    # ---------- Régime basse vitesse ----------
+    force_friction_max = mu * charge_roue * params.gravite * params.nombre_roues
+    force_nette = (moment_accel / params.rayon
+                   - (moment_frein / params.rayon) * params.nombre_roues
+                   - params.coeff_roulement * charge_roue *
+                     params.gravite * params.nombre_roues)
+    force_nette = np.minimum(np.maximum(force_nette, -force_friction_max), force_friction_max)
+    
+    dvx_bv = np.where((vx > params.vitesse_min_mouvement) | (force_nette > 0),
+                      force_nette / params.masse_vehicule, 0.0)
+    dw_bv = np.where(vx > params.vitesse_min_rotation, dvx_bv / params.rayon, 0.0)
+    
+    # ---------- Régime dynamique ----------
+    vx_carre = vx * vx
+    force_appui = params.coeff_appui * vx_carre
+    charge_dynamique = charge_roue + force_appui / (params.nombre_roues * params.gravite)
+    
+    kappa = calculer_glissement_vectorise(vx, w, params)
+    force_traction = calculer_force_traction(kappa, charge_dynamique, mu, params)
+    
+    # Limitation de puissance (division protégée là où w est trop faible)
+    en_rotation = w > params.vitesse_min_rotation
+    w_sur = np.where(en_rotation, w, 1.0)
+    moment_effectif = np.where(en_rotation,
+                               np.minimum(moment_accel, params.puissance_max / w_sur),
+                               moment_accel)
+    moment_par_roue = moment_effectif / params.nombre_roues
+    
+    force_trainee = params.coeff_trainee * vx_carre
+    force_roulement = (params.coeff_roulement * charge_dynamique *
+                       params.gravite * params.nombre_roues)
+    
+    dvx_dyn = ((params.nombre_roues * force_traction - force_trainee - force_roulement) /
+               params.masse_vehicule)
+    dw_dyn = (moment_par_roue - moment_frein - force_traction * params.rayon) / params.inertie
+    
+    # Sécurités anti-vitesses négatives
+    dw_dyn = np.where((w <= params.vitesse_min_rotation) & (dw_dyn < 0), 0.0, dw_dyn)
+    dvx_dyn = np.where((vx <= params.vitesse_min_rotation) & (dvx_dyn < 0), 0.0, dvx_dyn)
+    
+    puissance_friction = np.where(basse_vitesse, 0.0,
+                                  np.abs(force_traction * (params.rayon * w - vx)))
+    abs_kappa = np.abs(kappa)
+    dusure = np.where(~basse_vitesse & (abs_kappa > params.seuil_usure),
+                      abs_kappa**2 / params.facteur_usure, 0.0)
+    
+    # ---------- Assemblage ----------
+    D = np.empty_like(X)
+    D[:, 0] = np.where(basse_vitesse, dvx_bv, dvx_dyn)
+    D[:, 1] = np.where(basse_vitesse, dw_bv, dw_dyn)
+    D[:, 2], D[:, 3] = calculer_flux_thermiques(temp_ext, temp_int, puissance_friction, params)
+    D[:, 4] = dusure
+    
+    return D
+
+
+
+def calculer_grandeurs_vectorise(X, moment_accel, moment_frein, params=PARAMETRES_DEFAUT):
+    """
+    Version vectorisée de calculer_grandeurs, pour N états à la fois.
+    
+    Args:
+        X: Tableau (N, 5) des états [vx, w, temp_ext, temp_int, usure]
+        moment_accel: Couple moteur, scalaire ou tableau (N,)
+        moment_frein: Couple de frein, scalaire ou tableau (N,)
+        params: Jeu de paramètres
+    Returns:
+        (kappa, force_traction, puissance_friction, friction), tableaux (N,)
+    """
+    X = np.asarray(X, dtype=float)
+    vx, w, temp_ext, temp_int, usure = X.T
+    basse_vitesse = ((vx < params.vitesse_min_dynamique) &
+                     (params.rayon * w < params.vitesse_min_dynamique))
+    
+    kappa = calculer_glissement_vectorise(vx, w, params)
+    mu = calculer_friction(temp_ext, usure, params)
+    
+    # Basse vitesse: force par roue déduite de l'accélération (comme
+    # derivee_vectorisee, sans passer par ses compteurs de régime)
+    force_friction_max = mu * params.charge_roue * params.gravite * params.nombre_roues
+    force_nette = (np.asarray(moment_accel, dtype=float) / params.rayon
+                   - (np.asarray(moment_frein, dtype=float) / params.rayon) * params.nombre_roues
+                   - params.coeff_roulement * params.charge_roue *
+                     params.gravite * params.nombre_roues)
+    force_nette = np.minimum(np.maximum(force_nette, -force_friction_max), force_friction_max)
+    force_bv = np.where((vx > params.vitesse_min_mouvement) | (force_nette > 0),
+                        force_nette / params.nombre_roues, 0.0)
+    
+    charge_dynamique = params.charge_roue + params.coeff_appui * vx**2 / (params.nombre_roues *
+                                                                         params.gravite)
+    force_traction = calculer_force_traction(kappa, charge_dynamique, mu, params)
+    puissance_friction = np.abs(force_traction * (params.rayon * w - vx))
+    
+    return (kappa,
+            np.where(basse_vitesse, force_bv, force_traction),
+            np.where(basse_vitesse, 0.0, puissance_friction),
+            mu)
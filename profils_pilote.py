@@ -0,0 +1,255 @@
+import os
+
+import numpy as np
+
+import physique_roue as phys
+
+
+# ==================== PROFILS DE PÉDALES ====================
+# Rejoue des traces accélérateur/frein enregistrées (t, accel, frein) à
+# partir d'un fichier lu par blocs: une trace de 90 minutes à 1 kHz n'est
+# jamais entièrement en mémoire. L'interpolation utilise un curseur qui
+# avance avec le temps (pas de recherche dans toute la trace).
+#
+# Formats acceptés:
+#   .csv          colonnes t, accel, frein (ligne d'en-tête facultative)
+#   .npy          tableau (N, 3) float64, ouvert en mémoire projetée
+#   autre (.bin)  float64 brut, lignes (t, accel, frein) consécutives
+
+TAILLE_BLOC = 65536             # Lignes lues par bloc
+MARGE_RETOUR = 4096             # Lignes gardées pour les retours en arrière du solveur
+
+
+class _SourceCSV:
+    def __init__(self, chemin):
+        self.fichier = open(chemin, "rb")
+        self.ligne = 0
+        premiere = self.fichier.readline()
+        try:
+            [float(v) for v in premiere.split(b",")]
+            self.fichier.seek(0)
+        except ValueError:
+            pass                # Ligne d'en-tête ignorée
+
+    def lire(self, n):
+        lignes = []
+        for _ in range(n):
+            ligne = self.fichier.readline()
+            if not ligne:
+                break
+            if ligne.strip():
+                lignes.append(ligne.decode())
+        self.ligne += len(lignes)
+        if not lignes:
+            return np.empty((0, 3))
+        return np.loadtxt(lignes, delimiter=",", ndmin=2, usecols=(0, 1, 2))
+
+    def sauter(self, n):
+        """Passe les n prochaines lignes de données."""
+        while n > 0:
+            ligne = self.fichier.readline()
+            if not ligne:
+                break
+            if ligne.strip():
+                n -= 1
+                self.ligne += 1
+
+    def fermer(self):
+        self.fichier.close()
+
+
+class _SourceBinaire:
+    def __init__(self, chemin):
+        if chemin.endswith(".npy"):
+            self.donnees = np.load(chemin, mmap_mode="r")
+        else:
+            self.donnees = np.memmap(chemin, dtype=np.float64, mode="r").reshape(-1, 3)
+        self.ligne = 0
+
+    def lire(self, n):
+        bloc = np.array(self.donnees[self.ligne:self.ligne + n], dtype=float)
+        self.ligne += len(bloc)
+        return bloc
+
+    def sauter(self, n):
+        self.ligne = min(self.ligne + n, len(self.donnees))
+
+    def fermer(self):
+        self.donnees = None
+
+
+def ouvrir_source(chemin):
+    """Choisit le lecteur selon l'extension du fichier."""
+    if chemin.endswith(".csv"):
+        return _SourceCSV(chemin)
+    return _SourceBinaire(chemin)
+
+
+class ProfilPedales:
+    """
+    Trace de pédales lue par blocs et interpolée linéairement.
+    Le temps doit globalement avancer; de petits retours en arrière (pas
+    rejetés du solveur) sont permis dans la limite de MARGE_RETOUR lignes.
+    """
+
+    def __init__(self, chemin, taille_bloc=TAILLE_BLOC, marge_retour=MARGE_RETOUR,
+                 ligne_depart=0):
+        """
+        Args:
+            chemin: Fichier .csv, .npy ou binaire float64 brut
+            taille_bloc: Nombre de lignes lues à chaque rechargement
+            marge_retour: Lignes du bloc précédent conservées
+            ligne_depart: Première ligne lue (reprise depuis curseur())
+        """
+        self.chemin = chemin
+        self.source = ouvrir_source(chemin)
+        if ligne_depart:
+            self.source.sauter(ligne_depart)
+        self.taille_bloc = taille_bloc
+        self.marge_retour = marge_retour
+
+        # Fenêtre courante en listes Python (accès scalaire rapide)
+        self._t, self._accel, self._frein = [], [], []
+        self._debut_fichier = not ligne_depart     # La fenêtre commence à la 1re ligne
+        self._fin_fichier = False
+        self._i = 0
+        self._ligne_fenetre = ligne_depart          # Indice dans le fichier de _t[0]
+
+        self._charger_bloc()
+        if not self._t:
+            raise ValueError(f"Profil vide: {chemin}")
+
+    def _charger_bloc(self):
+        bloc = self.source.lire(self.taille_bloc)
+        if len(bloc) < self.taille_bloc:
+            self._fin_fichier = True
+        if not len(bloc):
+            return False
+
+        # On garde la fin de la fenêtre précédente pour les retours en arrière
+        abandonnees = max(0, len(self._t) - self.marge_retour)
+        if abandonnees:
+            self._debut_fichier = False
+        self._ligne_fenetre += abandonnees
+        self._t = self._t[abandonnees:] + bloc[:, 0].tolist()
+        self._accel = self._accel[abandonnees:] + bloc[:, 1].tolist()
+        self._frein = self._frein[abandonnees:] + bloc[:, 2].tolist()
+        self._i = max(0, self._i - abandonnees)
+        return True
+
+    def valeurs(self, t):
+        """
+        Pédales interpolées à l'instant t.
+
+        Args:
+            t: Temps en s
+        Returns:
+            (pourcentage_accel, pourcentage_frein)
+        Raises:
+            ValueError: Si t remonte avant la fenêtre conservée
+        """
+        temps, i = self._t, self._i
+
+        # Avance du curseur (rechargement en fin de fenêtre)
+        while i + 1 < len(temps) or not self._fin_fichier:
+            if i + 1 >= len(temps):
+                # _charger_bloc recale self._i sur la nouvelle fenêtre
+                self._i = i
+                if not self._charger_bloc():
+                    break
+                temps, i = self._t, self._i
+                continue
+            if t < temps[i + 1]:
+                break
+            i += 1
+
+        # Recul du curseur
+        while t < temps[i] and i > 0:
+            i -= 1
+        if t < temps[i] and not self._debut_fichier:
+            raise ValueError(f"t={t:.4f}s est avant la fenêtre du profil ({temps[0]:.4f}s)")
+
+        self._i = i
+        if i + 1 >= len(temps) or t <= temps[i]:
+            # Avant le début ou après la fin: valeur tenue
+            return self._accel[i], self._frein[i]
+
+        fraction = (t - temps[i]) / (temps[i + 1] - temps[i])
+        accel = self._accel[i] + fraction * (self._accel[i + 1] - self._accel[i])
+        frein = self._frein[i] + fraction * (self._frein[i + 1] - self._frein[i])
+        return accel, frein
+
+    def curseur(self):
+        """
+        Position de lecture, pour reprendre avec ProfilPedales(..., ligne_depart=).
+        L'interpolation ne dépend que des lignes voisines de t: la reprise
+        redonne exactement les mêmes valeurs pour les instants suivants.
+
+        Returns:
+            Indice dans le fichier de la ligne sous le curseur
+        """
+        return self._ligne_fenetre + self._i
+
+    def couples(self, t, params=phys.PARAMETRES_DEFAUT):
+        """
+        Couples moteur et frein à l'instant t.
+
+        Args:
+            t: Temps en s
+            params: Jeu de paramètres
+        Returns:
+            (moment_accel, moment_frein) en N.m
+        """
+        accel, frein = self.valeurs(t)
+        return phys.get_couple_moteur(accel, params), phys.get_couple_frein(frein, params)
+
+    def derivee(self, t, X, params=phys.PARAMETRES_DEFAUT):
+        """
+        Dérivée pilotée par le profil, au format attendu par solve_ivp
+        (utiliser args=(params,) pour un autre jeu de paramètres).
+        """
+        moment_accel, moment_frein = self.couples(t, params)
+        return phys.derivee(t, X, moment_accel, moment_frein, params)
+
+    def fermer(self):
+        self.source.fermer()
+
+
+def ecrire_profil(chemin, t, accel, frein):
+    """
+    Écrit un profil au format déduit de l'extension (.csv, .npy ou brut).
+
+    Args:
+        chemin: Fichier de sortie
+        t, accel, frein: Tableaux de même longueur
+    """
+    donnees = np.column_stack([t, accel, frein]).astype(np.float64)
+    if chemin.endswith(".csv"):
+        np.savetxt(chemin, donnees, delimiter=",", header="t,accel,frein", comments="")
+    elif chemin.endswith(".npy"):
+        np.save(chemin, donnees)
+    else:
+        donnees.tofile(chemin)
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from scipy.integrate import solve_ivp
+
+    # Trace de démonstration à 1 kHz: départ, freinage, relance
+    t = np.arange(0.0, 30.0, 0.001)
+    accel = np.where(t < 12.0, 1.0, np.where(t < 16.0, 0.0, 0.6))
+    frein = np.where((t >= 12.0) & (t < 16.0), 0.8, 0.0)
+
+    for extension in (".csv", ".npy", ".bin"):
+        chemin = os.path.join(tempfile.gettempdir(), "profil_demo" + extension)
+        ecrire_profil(chemin, t, accel, frein)
+        profil = ProfilPedales(chemin, taille_bloc=8192)
+        debut = time.perf_counter()
+        solution = solve_ivp(profil.derivee, (0.0, 30.0), phys.ETAT_INITIAL,
+                             method='RK45', max_step=0.01)
+        profil.fermer()
+        print(f"{extension:5s} {time.perf_counter() - debut:.2f}s  "
+              f"vitesse finale {solution.y[0][-1]*3.6:.1f} km/h  "
+              f"surface {solution.y[2][-1]:.1f}°C")
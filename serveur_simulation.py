@@ -0,0 +1,575 @@
+import asyncio
+import json
+import time
+from collections import deque
+
+import numpy as np
+
+import physique_roue as phys
+from integrateur import IntegrateurFixe, borner_etats
+
+
+# ==================== SERVEUR DE SIMULATION MULTI-SESSIONS ====================
+# Un seul processus héberge les simulations de plusieurs clients. À chaque
+# tick (horloge réelle, FREQUENCE_TICK), toutes les sessions qui ont un pas
+# en attente sont empilées en un lot (N, 5) et avancées ensemble par RK4 sur
+# derivee_vectorisee, chacune avec ses propres pédales: une évaluation de
+# dérivée par sous-pas pour tout le monde, au lieu d'un solve_ivp par client.
+#
+# Protocole: une requête JSON par ligne, une réponse JSON par ligne (le
+# champ "id" éventuel est renvoyé tel quel pour apparier les réponses).
+#   {"op": "creer", "etat": [...]?}                     -> {"session": n}
+#   {"op": "pas", "session": n, "accel": a, "frein": f, "duree": d}
+#                                 -> {"t", "etat", "kappa"} après d secondes simulées
+#   {"op": "etat", "session": n}  -> {"t", "etat", "kappa", "accel", "frein"}
+#   {"op": "fermer", "session": n}                      -> {"ferme": n}
+#   {"op": "stats"}               -> statistiques du serveur et des sessions
+# Une erreur donne {"erreur": message}. Une session appartient à la
+# connexion qui l'a créée et se ferme avec elle.
+#
+# Contre-pression: une connexion a au plus EN_VOL_MAX requêtes en cours;
+# au-delà le serveur cesse de la lire (les tampons du socket se remplissent
+# et le client est ralenti), et chaque réponse attend que le client la lise
+# (drain). Le nombre de sessions est borné par SESSIONS_MAX.
+#
+# Coût: un tick fait sous_pas x 4 évaluations de derivee_vectorisee, dont
+# le coût est dominé par le surcoût fixe de NumPy (environ 5 ms par tick à
+# 100 Hz / 1 kHz, presque indépendant du nombre de sessions). Voir le README
+# pour la charge mesurée.
+
+FREQUENCE_TICK = 100.0          # Ticks par seconde (horloge réelle)
+FREQUENCE_PHYSIQUE = 1000.0     # Sous-pas RK4 par seconde simulée
+SESSIONS_MAX = 256
+EN_VOL_MAX = 8                  # Requêtes en cours par connexion
+LATENCES_GARDEES = 1000         # Dernières latences gardées par session (percentiles)
+TAILLE_LIGNE_MAX = 64 * 1024    # Longueur maximale d'une requête en octets
+DUREE_PAS_MAX = 3600.0          # Temps simulé maximal d'une requête "pas" en s
+
+
+def _derivee_lot(t, X, moment_accel, moment_frein, params):
+    return phys.derivee_vectorisee(X, moment_accel, moment_frein, params)
+
+
+class Session:
+    """
+    Une simulation de roue hébergée par le serveur.
+    """
+
+    def __init__(self, numero, etat_initial):
+        self.numero = numero
+        self.etat = np.array(etat_initial, dtype=float)
+        self.t = 0.0
+        self.accel, self.frein = 0.0, 0.0
+        self.nombre_pas = 0
+        # Pas demandés, dans l'ordre: [ticks restants, accel, frein, future, instant de réception]
+        self.file = deque()
+        self.latences = deque(maxlen=LATENCES_GARDEES)
+
+    def statistiques(self):
+        """Pas traités, temps simulé et latences (ms) des derniers pas."""
+        latences = None
+        if self.latences:
+            valeurs = 1e3 * np.array(self.latences)
+            latences = {"moyenne": float(valeurs.mean()),
+                        "p50": float(np.percentile(valeurs, 50)),
+                        "p95": float(np.percentile(valeurs, 95)),
+                        "max": float(valeurs.max())}
+        return {"pas": self.nombre_pas, "t": self.t, "en_attente": len(self.file),
+                "latence_ms": latences}
+
+
+class ServeurSimulation:
+    """
+    Serveur asyncio de sessions de simulation avancées par lots à cadence fixe.
+    """
+
+    def __init__(self, frequence_tick=FREQUENCE_TICK, frequence_physique=FREQUENCE_PHYSIQUE,
+                 params=phys.PARAMETRES_DEFAUT, sessions_max=SESSIONS_MAX,
+                 en_vol_max=EN_VOL_MAX):
+        """
+        Args:
+            frequence_tick: Ticks par seconde réelle
+            frequence_physique: Sous-pas RK4 par seconde simulée
+            params: Jeu de paramètres commun aux sessions
+            sessions_max: Nombre maximal de sessions ouvertes
+            en_vol_max: Requêtes en cours par connexion avant de cesser de la lire
+        """
+        self.frequence_tick = frequence_tick
+        self.frequence_physique = frequence_physique
+        self.params = params
+        self.sessions_max = sessions_max
+        self.en_vol_max = en_vol_max
+
+        # Temps simulé par tick: un nombre entier de sous-pas physiques
+        self.sous_pas = max(1, int(round(frequence_physique / frequence_tick)))
+        self.pas_tick = self.sous_pas / frequence_physique
+
+        self.sessions = {}
+        self._numero = 0
+        self.ticks = 0
+        self.ticks_actifs = 0
+        self.retards = 0
+        self.lignes_calculees = 0
+        self.duree_calcul = 0.0
+        self._tache_ticks = None
+        self._connexions = {}           # writer -> tâche de la connexion
+
+    # ── Sessions ───────────────────────────────
+    def creer_session(self, etat_initial=None):
+        """
+        Ouvre une session.
+
+        Args:
+            etat_initial: [vx, w, temp_ext, temp_int, usure] (défaut: ETAT_INITIAL)
+        Returns:
+            Numéro de la session
+        Raises:
+            ValueError: Si le serveur est plein ou si l'état est invalide
+        """
+        if len(self.sessions) >= self.sessions_max:
+            raise ValueError(f"Serveur plein ({self.sessions_max} sessions)")
+        etat = phys.ETAT_INITIAL if etat_initial is None else etat_initial
+        if np.shape(etat) != (5,) or not np.all(np.isfinite(etat)):
+            raise ValueError(f"État initial invalide: {etat}")
+        self._numero += 1
+        self.sessions[self._numero] = Session(self._numero, etat)
+        return self._numero
+
+    def session(self, numero):
+        """Session ouverte `numero` (KeyError si elle n'existe pas)."""
+        try:
+            return self.sessions[numero]
+        except KeyError:
+            raise KeyError(f"Session inconnue: {numero}") from None
+
+    def fermer_session(self, numero):
+        """Ferme une session; ses pas en attente échouent."""
+        session = self.sessions.pop(numero, None)
+        if session is None:
+            return
+        for _, _, _, future, _ in session.file:
+            if not future.done():
+                future.set_exception(KeyError(f"Session fermée: {numero}"))
+        session.file.clear()
+
+    def demander_pas(self, numero, accel, frein, duree):
+        """
+        Met un pas en file pour la session.
+
+        Args:
+            numero: Numéro de session
+            accel, frein: Pédales entre 0 et 1, tenues pendant tout le pas
+            duree: Temps simulé en s, arrondi à un nombre entier de ticks (au
+                moins un), au plus DUREE_PAS_MAX
+        Returns:
+            Future résolue par le tick qui termine le pas
+        Raises:
+            KeyError: Session inconnue
+            ValueError: Pédales ou durée invalides (non finies comprises)
+        """
+        session = self.session(numero)
+        if not (0.0 <= accel <= 1.0 and 0.0 <= frein <= 1.0):
+            raise ValueError(f"Pédales hors de [0, 1]: accel={accel}, frein={frein}")
+        if not 0.0 < duree <= DUREE_PAS_MAX:
+            raise ValueError(f"Durée invalide: {duree} (attendu: ]0, {DUREE_PAS_MAX}] s)")
+        future = asyncio.get_running_loop().create_future()
+        ticks = max(1, int(round(duree / self.pas_tick)))
+        session.file.append([ticks, float(accel), float(frein), future, time.perf_counter()])
+        return future
+
+    def _reponse_etat(self, session, kappa):
+        return {"t": session.t, "etat": session.etat.tolist(), "kappa": float(kappa)}
+
+    # ── Ticks ──────────────────────────────────
+    def _integrer(self, etats, accel, frein):
+        # Lot entier; en cas d'état non fini, chaque ligne seule pour isoler
+        # les sessions fautives (renvoie le masque des lignes valides)
+        p = self.params
+        moment_accel = phys.get_couple_moteur(accel, p)
+        moment_frein = phys.get_couple_frein(frein, p)
+        with np.errstate(all="ignore"):
+            return self._integrer_lot(etats, moment_accel, moment_frein)
+
+    def _integrer_lot(self, etats, moment_accel, moment_frein):
+        p = self.params
+        try:
+            etats = IntegrateurFixe(_derivee_lot, etats, frequence=self.frequence_physique,
+                                    projection=borner_etats, sous_pas_max=self.sous_pas
+                                    ).avancer(self.pas_tick, moment_accel, moment_frein, p)
+            return etats, np.ones(len(etats), dtype=bool)
+        except FloatingPointError:
+            valides = np.ones(len(etats), dtype=bool)
+            resultat = etats.copy()
+            for i in range(len(etats)):
+                integrateur = IntegrateurFixe(_derivee_lot, etats[i:i + 1],
+                                              frequence=self.frequence_physique,
+                                              projection=borner_etats, sous_pas_max=self.sous_pas)
+                try:
+                    resultat[i] = integrateur.avancer(self.pas_tick, moment_accel[i:i + 1],
+                                                      moment_frein[i:i + 1], p)[0]
+                except FloatingPointError:
+                    valides[i] = False
+            return resultat, valides
+
+    def tick(self):
+        """Avance d'un tick toutes les sessions qui ont un pas en attente."""
+        self.ticks += 1
+        actives = [s for s in self.sessions.values() if s.file]
+        if not actives:
+            return
+        debut = time.perf_counter()
+        etats = np.array([s.etat for s in actives])
+        accel = np.array([s.file[0][1] for s in actives])
+        frein = np.array([s.file[0][2] for s in actives])
+
+        etats, valides = self._integrer(etats, accel, frein)
+        kappas = phys.calculer_glissement_vectorise(etats[:, 0], etats[:, 1], self.params)
+
+        maintenant = time.perf_counter()
+        for i, session in enumerate(actives):
+            if not valides[i]:
+                for _, _, _, future, _ in session.file:
+                    if not future.done():
+                        future.set_exception(FloatingPointError(
+                            f"État non fini à t={session.t:.3f}s, session {session.numero} fermée"))
+                session.file.clear()
+                self.sessions.pop(session.numero, None)
+                continue
+            session.etat = etats[i]
+            session.t += self.pas_tick
+            session.accel, session.frein = accel[i], frein[i]
+            demande = session.file[0]
+            demande[0] -= 1
+            if demande[0] == 0:
+                session.file.popleft()
+                session.nombre_pas += 1
+                session.latences.append(maintenant - demande[4])
+                if not demande[3].done():
+                    demande[3].set_result(self._reponse_etat(session, kappas[i]))
+
+        self.ticks_actifs += 1
+        self.lignes_calculees += len(actives)
+        self.duree_calcul += time.perf_counter() - debut
+
+    async def boucle_ticks(self):
+        """Appelle tick() à cadence fixe; un tick en retard n'est pas rattrapé."""
+        boucle = asyncio.get_running_loop()
+        periode = 1.0 / self.frequence_tick
+        prochain = boucle.time()
+        while True:
+            self.tick()
+            prochain += periode
+            attente = prochain - boucle.time()
+            if attente < 0.0:
+                self.retards += 1
+                prochain = boucle.time()
+            await asyncio.sleep(max(attente, 0.0))
+
+    def statistiques(self):
+        """
+        Returns:
+            Dictionnaire sérialisable en JSON: ticks, retards (ticks qui ont
+            dépassé leur période), lot_moyen (sessions par tick actif),
+            calcul_moyen_ms (durée d'un tick actif), et par session les
+            statistiques de Session.statistiques
+        """
+        return {
+            "sessions": len(self.sessions),
+            "frequence_tick": self.frequence_tick,
+            "ticks": self.ticks,
+            "retards": self.retards,
+            "lot_moyen": self.lignes_calculees / self.ticks_actifs if self.ticks_actifs else 0.0,
+            "calcul_moyen_ms": (1e3 * self.duree_calcul / self.ticks_actifs
+                                if self.ticks_actifs else 0.0),
+            "par_session": {numero: s.statistiques() for numero, s in self.sessions.items()},
+        }
+
+    # ── Protocole ──────────────────────────────
+    async def _traiter(self, requete, sessions):
+        op = requete.get("op")
+        if op == "creer":
+            numero = self.creer_session(requete.get("etat"))
+            sessions.add(numero)
+            return {"session": numero}
+        if op == "stats":
+            return self.statistiques()
+
+        numero = requete.get("session")
+        if numero not in sessions:
+            raise KeyError(f"Session inconnue sur cette connexion: {numero}")
+        if op == "pas":
+            return await self.demander_pas(numero, float(requete.get("accel", 0.0)),
+                                           float(requete.get("frein", 0.0)),
+                                           float(requete.get("duree", self.pas_tick)))
+        if op == "etat":
+            session = self.session(numero)
+            kappa = phys.calculer_glissement(session.etat[0], session.etat[1], self.params)
+            return {**self._reponse_etat(session, kappa),
+                    "accel": session.accel, "frein": session.frein}
+        if op == "fermer":
+            sessions.discard(numero)
+            self.fermer_session(numero)
+            return {"ferme": numero}
+        raise ValueError(f"Opération inconnue: {op}")
+
+    async def _repondre(self, ligne, sessions, writer, verrou, en_vol):
+        # La place en vol n'est rendue qu'une fois la réponse lue par le
+        # client (drain): un client qui ne lit pas cesse d'être lu
+        try:
+            requete = None
+            try:
+                requete = json.loads(ligne)
+                if not isinstance(requete, dict):
+                    raise ValueError("La requête doit être un objet JSON")
+                reponse = await self._traiter(requete, sessions)
+            except (ValueError, TypeError, KeyError, FloatingPointError) as erreur:
+                message = (erreur.args[0] if isinstance(erreur, KeyError) and erreur.args
+                           else str(erreur))
+                reponse = {"erreur": message}
+            except Exception as erreur:
+                # Filet de sécurité: toute requête reçoit une réponse
+                reponse = {"erreur": f"Erreur interne: {erreur!r}"}
+            if isinstance(requete, dict) and "id" in requete:
+                reponse["id"] = requete["id"]
+            async with verrou:
+                writer.write(json.dumps(reponse).encode() + b"\n")
+                await writer.drain()
+        finally:
+            en_vol.release()
+
+    async def _connexion(self, reader, writer):
+        sessions = set()
+        en_vol = asyncio.Semaphore(self.en_vol_max)
+        verrou = asyncio.Lock()
+        taches = set()
+        self._connexions[writer] = asyncio.current_task()
+        try:
+            while True:
+                # Plus de EN_VOL_MAX requêtes en cours: on cesse de lire
+                await en_vol.acquire()
+                try:
+                    ligne = await reader.readline()
+                except ValueError:
+                    writer.write(b'{"erreur": "Requete trop longue"}\n')
+                    break
+                if not ligne:
+                    break
+                tache = asyncio.create_task(
+                    self._repondre(ligne, sessions, writer, verrou, en_vol))
+                taches.add(tache)
+                tache.add_done_callback(taches.discard)
+        except ConnectionError:
+            pass
+        except asyncio.CancelledError:
+            # Annulée par arreter(): fin normale de la connexion (asyncio
+            # signalerait sinon une erreur du rappel de start_server)
+            pass
+        finally:
+            for tache in taches:
+                tache.cancel()
+            for numero in sessions:
+                self.fermer_session(numero)
+            self._connexions.pop(writer, None)
+            writer.close()
+
+    async def demarrer(self, chemin=None, hote="127.0.0.1", port=None):
+        """
+        Ouvre le socket et lance la boucle des ticks.
+
+        Args:
+            chemin: Chemin d'un socket Unix (prioritaire)
+            hote, port: Adresse TCP sinon
+        Returns:
+            asyncio.Server (à fermer par l'appelant)
+        """
+        if chemin is not None:
+            serveur = await asyncio.start_unix_server(self._connexion, chemin,
+                                                      limit=TAILLE_LIGNE_MAX)
+        else:
+            serveur = await asyncio.start_server(self._connexion, hote, port,
+                                                 limit=TAILLE_LIGNE_MAX)
+        self._tache_ticks = asyncio.create_task(self.boucle_ticks())
+        return serveur
+
+    async def arreter(self, serveur):
+        """Ferme le socket et les connexions, arrête les ticks et les sessions."""
+        serveur.close()
+        connexions = list(self._connexions.items())
+        for writer, _ in connexions:
+            writer.close()
+        # Les connexions voient la fin de flux et ferment leurs sessions
+        if connexions:
+            _, restantes = await asyncio.wait([tache for _, tache in connexions], timeout=1.0)
+            # Un client qui ne lit plus ses réponses bloque sa connexion
+            for tache in restantes:
+                tache.cancel()
+            if restantes:
+                await asyncio.wait(restantes)
+        await serveur.wait_closed()
+        if self._tache_ticks is not None:
+            self._tache_ticks.cancel()
+        for numero in list(self.sessions):
+            self.fermer_session(numero)
+
+
+class ClientSimulation:
+    """
+    Client asyncio du serveur. Les requêtes peuvent être lancées en
+    parallèle: les réponses sont appariées par leur "id".
+    """
+
+    def __init__(self, reader, writer):
+        self._reader, self._writer = reader, writer
+        self._attentes = {}
+        self._id = 0
+        self._lecture = asyncio.create_task(self._lire())
+
+    @classmethod
+    async def connecter(cls, chemin=None, hote="127.0.0.1", port=None):
+        """Connexion par socket Unix (chemin) ou TCP (hote, port)."""
+        if chemin is not None:
+            reader, writer = await asyncio.open_unix_connection(chemin, limit=TAILLE_LIGNE_MAX)
+        else:
+            reader, writer = await asyncio.open_connection(hote, port, limit=TAILLE_LIGNE_MAX)
+        return cls(reader, writer)
+
+    async def _lire(self):
+        try:
+            while ligne := await self._reader.readline():
+                reponse = json.loads(ligne)
+                future = self._attentes.pop(reponse.pop("id", None), None)
+                if future is not None and not future.done():
+                    future.set_result(reponse)
+        finally:
+            for future in self._attentes.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Connexion au serveur fermée"))
+
+    async def requete(self, op, **champs):
+        """
+        Envoie une requête et attend sa réponse.
+
+        Raises:
+            RuntimeError: Si le serveur répond par une erreur
+            ConnectionError: Si la connexion est fermée
+        """
+        self._id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._attentes[self._id] = future
+        self._writer.write(json.dumps({"id": self._id, "op": op, **champs}).encode() + b"\n")
+        await self._writer.drain()
+        reponse = await future
+        if "erreur" in reponse:
+            raise RuntimeError(reponse["erreur"])
+        return reponse
+
+    async def fermer(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._lecture.cancel()
+
+
+# ── Démonstration ──────────────────────────
+# Clients lancés dans un processus à part, pour ne pas partager la boucle
+# d'événements (ni le temps de calcul Python) du serveur mesuré.
+
+async def _client_demonstration(chemin, graine, pas, duree_pas):
+    rng = np.random.default_rng(graine)
+    connexion = await ClientSimulation.connecter(chemin)
+    numero = (await connexion.requete("creer"))["session"]
+    accel = rng.uniform(0.3, 1.0)
+    for _ in range(pas):
+        reponse = await connexion.requete("pas", session=numero, accel=accel, frein=0.0,
+                                          duree=duree_pas)
+    latences = (await connexion.requete("stats"))["par_session"][str(numero)]["latence_ms"]
+    await connexion.fermer()
+    return accel, reponse, latences
+
+
+def _processus_clients(chemin, clients, pas, duree_pas, connexion):
+    async def tous():
+        debut = time.perf_counter()
+        resultats = await asyncio.gather(*(_client_demonstration(chemin, graine, pas, duree_pas)
+                                           for graine in range(clients)))
+        return resultats, time.perf_counter() - debut
+    connexion.send(asyncio.run(tous()))
+    connexion.close()
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    import tempfile
+
+    # Service: python serveur_simulation.py --unix /tmp/roue.sock
+    #          python serveur_simulation.py --tcp 127.0.0.1:8765
+    if "--unix" in sys.argv[1:] or "--tcp" in sys.argv[1:]:
+        async def servir():
+            serveur_sim = ServeurSimulation()
+            if "--unix" in sys.argv[1:]:
+                adresse = sys.argv[sys.argv.index("--unix") + 1]
+                serveur = await serveur_sim.demarrer(chemin=adresse)
+            else:
+                adresse = sys.argv[sys.argv.index("--tcp") + 1]
+                hote, port = adresse.rsplit(":", 1)
+                serveur = await serveur_sim.demarrer(hote=hote, port=int(port))
+            print(f"Serveur de simulation sur {adresse} ({FREQUENCE_TICK:.0f} ticks/s)")
+            async with serveur:
+                await serveur.serve_forever()
+        try:
+            asyncio.run(servir())
+        except KeyboardInterrupt:
+            pass
+        sys.exit()
+
+    # Démonstration: 32 clients, chacun sa session et ses pédales, 3 s
+    # simulées en pas de 10 ms (un aller-retour par pas)
+    import multiprocessing
+    CLIENTS, PAS, DUREE_PAS = 32, 300, 0.01
+
+    async def demonstration():
+        chemin = os.path.join(tempfile.mkdtemp(), "roue.sock")
+        serveur_sim = ServeurSimulation()
+        serveur = await serveur_sim.demarrer(chemin=chemin)
+
+        # Un client reste ouvert pour relever les statistiques à la fin
+        observateur = await ClientSimulation.connecter(chemin)
+        parent, enfant = multiprocessing.Pipe()
+        processus = multiprocessing.Process(target=_processus_clients,
+                                            args=(chemin, CLIENTS, PAS, DUREE_PAS, enfant))
+        processus.start()
+        resultats, ecoule = await asyncio.to_thread(parent.recv)
+        await asyncio.to_thread(processus.join)
+        stats = await observateur.requete("stats")
+        await observateur.fermer()
+        await serveur_sim.arreter(serveur)
+        return resultats, ecoule, stats
+
+    resultats, ecoule, stats = asyncio.run(demonstration())
+    print(f"{CLIENTS} clients x {PAS} pas de {DUREE_PAS * 1e3:.0f} ms en {ecoule:.2f}s "
+          f"({CLIENTS * PAS / ecoule:.0f} pas/s servis)")
+    print(f"Ticks {stats['ticks']}, en retard {stats['retards']}, "
+          f"lot moyen {stats['lot_moyen']:.1f} sessions, calcul {stats['calcul_moyen_ms']:.2f} ms/tick")
+
+    p50 = np.median([latences["p50"] for _, _, latences in resultats])
+    p95 = max(latences["p95"] for _, _, latences in resultats)
+    print(f"Latence d'un pas (réception -> fin du tick): médiane {p50:.1f} ms, "
+          f"p95 le plus haut {p95:.1f} ms (période de tick {1e3 / FREQUENCE_TICK:.0f} ms)")
+
+    # Chaque session du lot suit l'intégration seule de ses pédales
+    accel, reponse, _ = resultats[0]
+    seule = IntegrateurFixe(phys.derivee, phys.ETAT_INITIAL, frequence=FREQUENCE_PHYSIQUE,
+                            sous_pas_max=10**6)
+    seule.avancer(PAS * DUREE_PAS, phys.get_couple_moteur(accel), 0.0)
+    print(f"Session 1 contre intégration seule: écart max "
+          f"{np.abs(np.array(reponse['etat']) - seule.etat).max():.2e}")
+
+    # Coût d'un tick selon la taille du lot: quasi constant, c'est l'intérêt du lot
+    import timeit
+    serveur_sim = ServeurSimulation()
+    for taille in (1, CLIENTS, 4 * CLIENTS):
+        etats = np.tile(phys.ETAT_INITIAL, (taille, 1))
+        duree = min(timeit.repeat(lambda: serveur_sim._integrer(etats.copy(), np.full(taille, 0.5),
+                                                                np.zeros(taille)),
+                                  number=20, repeat=3)) / 20
+        print(f"Tick de {taille:4d} sessions: {duree * 1e3:.2f} ms")
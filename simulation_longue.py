@@ -0,0 +1,284 @@
+import io
+import json
+import os
+from dataclasses import asdict, replace
+
+import numpy as np
+
+import physique_roue as phys
+from integrateur import IntegrateurFixe
+from profils_pilote import ProfilPedales
+
+
+# ==================== ROULAGES LONGS ET INSTANTANÉS ====================
+# Une SimulationLongue regroupe tout ce qui détermine la suite d'un roulage:
+# état, temps et reliquat de l'intégrateur, position dans le profil de
+# pédales, état du générateur aléatoire (bruit de pédales) et paramètres.
+# Un instantané fige ces éléments dans un fichier .npz compact; reprendre
+# depuis un instantané redonne la même trajectoire au bit près.
+#
+# bifurquer() part d'un instantané avec d'autres réglages: les variantes
+# ("arrêt au tour 20 ou 25") partagent le préfixe sans le recalculer.
+
+PERIODE_COMMANDE = 0.01         # Pédales relues toutes les 10 ms
+VERSION_INSTANTANE = 1
+
+
+class SimulationLongue:
+    """
+    Roulage à pas fixe, piloté par des pédales constantes ou un profil,
+    avec bruit de pédales optionnel, capturable et reprenable.
+    """
+
+    def __init__(self, params=phys.PARAMETRES_DEFAUT, etat_initial=phys.ETAT_INITIAL,
+                 frequence=1000.0, pedales=(1.0, 0.0), profil=None, bruit_pedales=0.0,
+                 graine=None, periode_commande=PERIODE_COMMANDE, methode="rk4"):
+        """
+        Args:
+            params: Jeu de paramètres (champs scalaires)
+            etat_initial: [vx, w, temp_ext, temp_int, usure]
+            frequence: Fréquence de l'intégrateur en Hz
+            pedales: (accel, frein) constants si aucun profil
+            profil: ProfilPedales, ou chemin d'un fichier de profil (ouvert
+                par la simulation et refermé par fermer(); un ProfilPedales
+                passé tel quel reste à la charge de l'appelant)
+            bruit_pedales: Écart-type du bruit ajouté aux pédales (0 = aucun)
+            graine: Graine du générateur du bruit
+            periode_commande: Intervalle entre deux lectures des pédales (s)
+            methode: Méthode de IntegrateurFixe
+        """
+        self.params = params
+        self.pedales = tuple(pedales)
+        self.profil = None
+        self._profil_possede = False
+        self.remplacer_profil(profil)
+        self.bruit_pedales = bruit_pedales
+        self.rng = np.random.default_rng(graine)
+        self.periode_commande = periode_commande
+        self.integrateur = IntegrateurFixe(
+            phys.derivee, etat_initial, frequence=frequence, methode=methode,
+            sous_pas_max=max(1, int(round(periode_commande * frequence)) + 1))
+
+    def remplacer_profil(self, profil):
+        """
+        Change de profil de pédales; l'ancien est refermé s'il a été ouvert
+        par la simulation.
+
+        Args:
+            profil: ProfilPedales, chemin d'un fichier de profil, ou None
+        """
+        if self._profil_possede:
+            self.profil.fermer()
+        self._profil_possede = isinstance(profil, str)
+        self.profil = ProfilPedales(profil) if self._profil_possede else profil
+
+    def fermer(self):
+        """Referme le profil de pédales s'il a été ouvert par la simulation."""
+        self.remplacer_profil(None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    @property
+    def t(self):
+        return self.integrateur.t
+
+    @property
+    def etat(self):
+        return self.integrateur.etat
+
+    def _pedales(self):
+        if self.profil is not None:
+            accel, frein = self.profil.valeurs(self.integrateur.t)
+        else:
+            accel, frein = self.pedales
+        if self.bruit_pedales:
+            bruit = self.rng.normal(0.0, self.bruit_pedales, 2)
+            accel = min(1.0, max(0.0, accel + bruit[0]))
+            frein = min(1.0, max(0.0, frein + bruit[1]))
+        return accel, frein
+
+    def avancer(self, duree):
+        """
+        Avance de `duree` secondes (arrondie à un nombre de périodes de commande).
+
+        Returns:
+            L'état courant
+        """
+        p = self.params
+        for _ in range(int(round(duree / self.periode_commande))):
+            accel, frein = self._pedales()
+            self.integrateur.avancer(self.periode_commande, phys.get_couple_moteur(accel, p),
+                                     phys.get_couple_frein(frein, p), p)
+        return self.integrateur.etat
+
+    def executer(self, duree, chemin_instantane=None, intervalle_instantane=60.0):
+        """
+        Avance de `duree` secondes en écrivant un instantané de reprise tous
+        les `intervalle_instantane` secondes simulées.
+
+        Args:
+            duree: Durée à simuler en s
+            chemin_instantane: Fichier .npz réécrit à chaque instantané (None = aucun)
+            intervalle_instantane: Période des instantanés en s
+        Returns:
+            L'état courant
+        """
+        fin = self.t + duree
+        while fin - self.t > 0.5 * self.periode_commande:
+            self.avancer(min(intervalle_instantane, fin - self.t))
+            if chemin_instantane is not None:
+                ecrire_instantane(chemin_instantane, self.capturer())
+        return self.integrateur.etat
+
+    # ---------- Instantanés ----------
+
+    def capturer(self):
+        """
+        Fige l'état complet du roulage.
+
+        Returns:
+            Dictionnaire {"etat": tableau, "meta": dictionnaire sérialisable}
+        Raises:
+            ValueError: Si les paramètres contiennent des tableaux
+        """
+        parametres = asdict(self.params)
+        if any(np.ndim(valeur) for valeur in parametres.values()):
+            raise ValueError("Instantané impossible avec des paramètres empilés (tableaux)")
+
+        integrateur = self.integrateur
+        profil = None
+        if self.profil is not None:
+            profil = {"chemin": os.path.abspath(self.profil.chemin),
+                      "taille_bloc": self.profil.taille_bloc,
+                      "marge_retour": self.profil.marge_retour,
+                      "ligne": self.profil.curseur()}
+        return {
+            "etat": integrateur.etat.copy(),
+            "meta": {
+                "version": VERSION_INSTANTANE,
+                "parametres": parametres,
+                "integrateur": {"t": integrateur.t, "nombre_pas": integrateur.nombre_pas,
+                                "reste": integrateur.reste, "frequence": 1.0 / integrateur.pas,
+                                "methode": integrateur.methode},
+                "pedales": list(self.pedales),
+                "profil": profil,
+                "bruit_pedales": self.bruit_pedales,
+                "rng": self.rng.bit_generator.state,
+                "periode_commande": self.periode_commande,
+            },
+        }
+
+    @classmethod
+    def depuis_instantane(cls, instantane):
+        """Reprend un roulage exactement là où l'instantané l'a figé."""
+        meta = instantane["meta"]
+        if meta["version"] != VERSION_INSTANTANE:
+            raise ValueError(f"Version d'instantané non gérée: {meta['version']}")
+        etat_integrateur = meta["integrateur"]
+
+        profil = None
+        if meta["profil"] is not None:
+            p = meta["profil"]
+            profil = ProfilPedales(p["chemin"], taille_bloc=p["taille_bloc"],
+                                   marge_retour=p["marge_retour"], ligne_depart=p["ligne"])
+
+        simulation = cls(params=phys.Parametres(**meta["parametres"]),
+                         etat_initial=instantane["etat"],
+                         frequence=etat_integrateur["frequence"],
+                         pedales=meta["pedales"], profil=profil,
+                         bruit_pedales=meta["bruit_pedales"],
+                         periode_commande=meta["periode_commande"],
+                         methode=etat_integrateur["methode"])
+        simulation._profil_possede = profil is not None
+        simulation.rng.bit_generator.state = meta["rng"]
+        simulation.integrateur.t = etat_integrateur["t"]
+        simulation.integrateur.nombre_pas = etat_integrateur["nombre_pas"]
+        simulation.integrateur.reste = etat_integrateur["reste"]
+        return simulation
+
+
+def bifurquer(instantane, **modifications):
+    """
+    Nouvelle branche depuis un instantané, avec d'autres réglages.
+
+    Exemple: bifurquer(inst, pedales=(0.0, 0.6), mu_0=1.9)
+
+    Args:
+        instantane: Dictionnaire renvoyé par capturer() ou lire_instantane()
+        **modifications: Attributs de SimulationLongue (pedales, profil,
+            bruit_pedales) ou champs de Parametres
+    Returns:
+        SimulationLongue prête à avancer depuis l'instant figé (à fermer
+        avec fermer() ou un bloc with)
+    """
+    champs = {nom: modifications.pop(nom) for nom in list(modifications)
+              if nom in phys.Parametres.__dataclass_fields__}
+    for nom in modifications:
+        if nom not in ("pedales", "profil", "bruit_pedales"):
+            raise TypeError(f"Réglage inconnu pour une branche: {nom}")
+
+    simulation = SimulationLongue.depuis_instantane(instantane)
+    if champs:
+        simulation.params = replace(simulation.params, **champs)
+    if "profil" in modifications:
+        simulation.remplacer_profil(modifications.pop("profil"))
+    for nom, valeur in modifications.items():
+        setattr(simulation, nom, tuple(valeur) if nom == "pedales" else valeur)
+    return simulation
+
+
+def ecrire_instantane(chemin, instantane):
+    """
+    Écrit un instantané (.npz: état binaire + métadonnées JSON).
+    L'écriture passe par un fichier temporaire: un arrêt brutal laisse
+    toujours l'instantané précédent intact.
+    """
+    tampon = io.BytesIO()
+    np.savez(tampon, etat=instantane["etat"],
+             meta=np.frombuffer(json.dumps(instantane["meta"]).encode(), dtype=np.uint8))
+    temporaire = chemin + ".tmp"
+    with open(temporaire, "wb") as fichier:
+        fichier.write(tampon.getvalue())
+        fichier.flush()
+        os.fsync(fichier.fileno())
+    os.replace(temporaire, chemin)
+
+
+def lire_instantane(chemin):
+    """Relit un instantané écrit par ecrire_instantane."""
+    with np.load(chemin) as donnees:
+        return {"etat": donnees["etat"].copy(),
+                "meta": json.loads(donnees["meta"].tobytes().decode())}
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    chemin = os.path.join(tempfile.gettempdir(), "roulage.npz")
+
+    # Roulage de référence d'une traite, avec bruit de pédales
+    reference = SimulationLongue(pedales=(0.7, 0.0), bruit_pedales=0.05, graine=7)
+    reference.avancer(40.0)
+
+    # Même roulage interrompu à 20 s puis repris depuis le fichier
+    premier = SimulationLongue(pedales=(0.7, 0.0), bruit_pedales=0.05, graine=7)
+    premier.executer(20.0, chemin_instantane=chemin, intervalle_instantane=10.0)
+    print(f"Instantané: {os.path.getsize(chemin)} octets")
+    reprise = SimulationLongue.depuis_instantane(lire_instantane(chemin))
+    reprise.avancer(20.0)
+    print(f"Reprise identique au bit près: {np.array_equal(reprise.etat, reference.etat)}")
+
+    # Branches depuis le même instantané: freinage plus ou moins appuyé
+    instantane = lire_instantane(chemin)
+    debut = time.perf_counter()
+    for frein in (0.3, 0.6, 0.9):
+        branche = bifurquer(instantane, pedales=(0.0, frein))
+        branche.avancer(3.0)
+        print(f"  frein {frein:.1f}: {branche.etat[0]*3.6:6.1f} km/h, "
+              f"surface {branche.etat[2]:.1f}°C à t={branche.t:.2f}s")
+    print(f"3 branches de 3 s en {time.perf_counter() - debut:.2f}s (préfixe de 20 s partagé)")
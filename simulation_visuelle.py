@@ -1,20 +1,21 @@
 import pygame
 import sys
 import math
-import random
+from collections import OrderedDict
+import numpy as np
+import compteurs
 import physique_roue as phys
-from scipy.integrate import solve_ivp
-
-pygame.init()
-pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+from fil_physique import FilPhysique
 
 # ========== CONFIG ==========
 LARGEUR = 800
 HAUTEUR = 620
 FPS = 30
+FREQUENCE_PHYSIQUE = 1000   # Sous-pas de l'intégrateur en Hz
 
-screen = pygame.display.set_mode((LARGEUR, HAUTEUR))
-pygame.display.set_caption("Simulation Roue F1")
+# Fenêtre, polices, particules et tableau de bord sont créés par
+# initialiser(): importer le module n'ouvre ni SDL ni l'audio
+screen = None
 
 # ========== COULEURS ==========
 BLANC      = (255, 255, 255)
@@ -28,8 +29,35 @@ BLEU       = (50, 150, 255)
 ORANGE     = (255, 140, 0)
 
 # ========== POLICES ==========
-font       = pygame.font.SysFont("Arial", 20, bold=True)
-font_small = pygame.font.SysFont("Arial", 16)
+font       = None
+font_small = None
+
+# Textes rendus, réutilisés tant qu'ils ne changent pas (LRU borné)
+TAILLE_CACHE_TEXTE = 256
+_cache_texte = OrderedDict()
+
+
+def rendre_texte(police, texte, couleur):
+    """
+    Rendu antialiasé d'un texte, mis en cache par (police, texte, couleur).
+
+    Args:
+        police: pygame.font.Font
+        texte: Chaîne à rendre
+        couleur: Couleur RGB
+    Returns:
+        Surface du texte (partagée: ne pas modifier)
+    """
+    cle = (police, texte, couleur)
+    surface = _cache_texte.get(cle)
+    if surface is None:
+        surface = police.render(texte, True, couleur)
+        _cache_texte[cle] = surface
+        if len(_cache_texte) > TAILLE_CACHE_TEXTE:
+            _cache_texte.popitem(last=False)
+    else:
+        _cache_texte.move_to_end(cle)
+    return surface
 
 # ========== PARAMÈTRES ==========
 RAYON_ROUE      = 100
@@ -46,31 +74,117 @@ LARGEUR_BOUTON = 220
 HAUTEUR_BOUTON = 55
 RAYON_ARRONDI  = 10
 
+CAPACITE_PARTICULES  = 512
+TAILLE_MAX_PARTICULE = 8      # Rayon max d'une particule (px)
+NIVEAUX_ALPHA        = 16     # Opacités distinctes dans le cache de sprites
+
+# Disposition des cadres fixes: (x, y, largeur, nombre de lignes) et jauges
+INFO_VITESSE = (20, 20, 250, 2)
+INFO_PNEU    = (20, 115, 250, 3)
+JAUGE_ACCEL  = (40, 490, "Accélération")
+JAUGE_FREIN  = (520, 490, "Freinage")
+
+# Surimpression des compteurs (touche F3), rafraîchie deux fois par seconde
+LIGNES_COMPTEURS  = 10
+PERIODE_COMPTEURS = 0.5
+
+# Relecture de télémétrie (--relecture DOSSIER)
+VITESSES_LECTURE = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 50.0)
+SAUT_COURT = 5.0              # Saut de ← / → en s
+SAUT_LONG  = 60.0             # Saut de Maj + ← / → en s
+
 
 # ──────────────────────────────────────────────
-class Particule:
-    def __init__(self, x, y, direction):
-        self.x, self.y = x, y
-        self.vx  = direction * random.uniform(1.0, 3.0)
-        self.vy  = random.uniform(-2.0, -0.5)
-        self.vie = random.randint(20, 40)
-        self.vie_max = self.vie
-        self.taille  = random.randint(3, 8)
+class PoolParticules:
+    """
+    Particules de fumée en tableaux NumPy de capacité fixe.
+    Les particules vivantes occupent les indices [0, n): la mise à jour est
+    une seule passe vectorisée, et le rendu copie des sprites précalculés
+    (quantifiés par rayon et par opacité) au lieu de créer une surface par
+    particule et par image.
+    """
+
+    def __init__(self, capacite=CAPACITE_PARTICULES, graine=None):
+        self.capacite = capacite
+        self.n = 0
+        self.rng = np.random.default_rng(graine)
+        self.x       = np.zeros(capacite)
+        self.y       = np.zeros(capacite)
+        self.vx      = np.zeros(capacite)
+        self.vy      = np.zeros(capacite)
+        self.vie     = np.zeros(capacite)
+        self.vie_max = np.ones(capacite)
+        self.taille  = np.zeros(capacite)
+
+        # sprites[rayon][niveau]: disque gris de rayon donné, opacité quantifiée
+        self.sprites = [[self._creer_sprite(r, niveau) for niveau in range(NIVEAUX_ALPHA)]
+                        for r in range(TAILLE_MAX_PARTICULE + 1)]
+
+    @staticmethod
+    def _creer_sprite(rayon, niveau):
+        alpha = int(255 * (niveau + 1) / NIVEAUX_ALPHA)
+        s = pygame.Surface((rayon*2+2, rayon*2+2), pygame.SRCALPHA)
+        pygame.draw.circle(s, (120, 120, 120, alpha), (rayon+1, rayon+1), rayon)
+        return s
+
+    def emettre(self, x, y, direction, nombre, dispersion=15):
+        """Ajoute `nombre` particules autour de (x, y); l'excédent est ignoré."""
+        nombre = min(nombre, self.capacite - self.n)
+        if nombre <= 0:
+            return
+        i = slice(self.n, self.n + nombre)
+        self.x[i]       = x + self.rng.integers(-dispersion, dispersion + 1, nombre)
+        self.y[i]       = y
+        self.vx[i]      = direction * self.rng.uniform(1.0, 3.0, nombre)
+        self.vy[i]      = self.rng.uniform(-2.0, -0.5, nombre)
+        self.vie[i]     = self.rng.integers(20, 41, nombre)
+        self.vie_max[i] = self.vie[i]
+        self.taille[i]  = self.rng.integers(3, TAILLE_MAX_PARTICULE + 1, nombre)
+        self.n += nombre
 
     def update(self):
-        self.x += self.vx; self.y += self.vy; self.vy += 0.05
-        self.vie -= 1; self.taille = max(1, self.taille - 0.1)
-        return self.vie > 0
+        n = self.n
+        if not n:
+            return
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.vy[:n] += 0.05
+        self.vie[:n] -= 1
+        np.maximum(self.taille[:n] - 0.1, 1.0, out=self.taille[:n])
+
+        # Compactage: les survivantes sont ramenées en tête des tableaux
+        vivantes = self.vie[:n] > 0
+        m = int(np.count_nonzero(vivantes))
+        if m < n:
+            for tableau in (self.x, self.y, self.vx, self.vy,
+                            self.vie, self.vie_max, self.taille):
+                tableau[:m] = tableau[:n][vivantes]
+        self.n = m
 
     def draw(self, surface):
-        a = int(255 * self.vie / self.vie_max)
-        s = pygame.Surface((self.taille*2+2, self.taille*2+2), pygame.SRCALPHA)
-        pygame.draw.circle(s, (120, 120, 120, a),
-                           (int(self.taille)+1, int(self.taille)+1), int(self.taille))
-        surface.blit(s, (int(self.x - self.taille), int(self.y - self.taille)))
+        """Dessine les particules; renvoie le rectangle qui les englobe (ou None)."""
+        n = self.n
+        if not n:
+            return None
+        rayons = self.taille[:n].astype(np.intp)
+        niveaux = (self.vie[:n] * NIVEAUX_ALPHA / self.vie_max[:n]).astype(np.intp) - 1
+        np.clip(niveaux, 0, NIVEAUX_ALPHA - 1, out=niveaux)
+        px = (self.x[:n] - self.taille[:n]).astype(np.intp).tolist()
+        py = (self.y[:n] - self.taille[:n]).astype(np.intp).tolist()
+        sprites = self.sprites
+        surface.blits([(sprites[r][a], (x, y))
+                       for r, a, x, y in zip(rayons.tolist(), niveaux.tolist(), px, py)],
+                      doreturn=False)
+
+        cote = 2 * TAILLE_MAX_PARTICULE + 2
+        x0, y0 = min(px), min(py)
+        return pygame.Rect(x0, y0, max(px) - x0 + cote, max(py) - y0 + cote)
 
+    def vider(self):
+        self.n = 0
 
-particules = []
+
+particules = None
 
 
 # ──────────────────────────────────────────────
@@ -94,8 +208,14 @@ class Slider:
         elif event.type == pygame.MOUSEMOTION and self.drag:
             self.val = max(0.0, min(1.0, (event.pos[0] - self.x) / self.largeur))
 
+    @property
+    def zone(self):
+        """Rectangle couvert par le slider (libellé et poignée compris)."""
+        return pygame.Rect(self.x - self.R, self.y - 22,
+                           self.largeur + 2 * self.R + 1, 22 + self.R + 1)
+
     def draw(self, surface):
-        lbl = font_small.render(f"{self.label} : {int(self.val*100)} %", True, NOIR)
+        lbl = rendre_texte(font_small, f"{self.label} : {int(self.val*100)} %", NOIR)
         surface.blit(lbl, (self.x, self.y - 22))
 
         pygame.draw.rect(surface, GRIS,
@@ -114,22 +234,36 @@ class Slider:
 
 
 # ──────────────────────────────────────────────
-def dessiner_jauge(x, y, largeur, hauteur, valeur, couleur, titre):
+def dessiner_jauge(x, y, largeur, hauteur, valeur, couleur, titre=None):
     pygame.draw.rect(screen, GRIS, (x, y, largeur, hauteur), border_radius=5)
     pygame.draw.rect(screen, couleur, (x, y, int(largeur * valeur), hauteur), border_radius=5)
     pygame.draw.rect(screen, NOIR, (x, y, largeur, hauteur), 2, border_radius=5)
-    screen.blit(font_small.render(titre, True, NOIR), (x, y - 20))
+    if titre is not None:
+        screen.blit(rendre_texte(font_small, titre, NOIR), (x, y - 20))
 
 
-def dessiner_info_box(x, y, largeur, textes):
-    hauteur = len(textes) * 30 + 20
+def dessiner_cadre_info(x, y, largeur, nombre_lignes):
+    hauteur = nombre_lignes * 30 + 20
     pygame.draw.rect(screen, GRIS_CLAIR, (x, y, largeur, hauteur), border_radius=10)
     pygame.draw.rect(screen, NOIR, (x, y, largeur, hauteur), 2, border_radius=10)
+
+
+def dessiner_textes_info(x, y, textes):
     for i, (label, valeur, couleur) in enumerate(textes):
-        t = font_small.render(f"{label}: {valeur}", True, couleur)
+        t = rendre_texte(font_small, f"{label}: {valeur}", couleur)
         screen.blit(t, (x + 15, y + 15 + i * 30))
 
 
+def dessiner_info_box(x, y, largeur, textes):
+    dessiner_cadre_info(x, y, largeur, len(textes))
+    dessiner_textes_info(x, y, textes)
+
+
+def interieur_info(x, y, largeur, nombre_lignes):
+    """Zone des textes d'un cadre d'info (bordure exclue)."""
+    return pygame.Rect(x + 10, y + 10, largeur - 20, nombre_lignes * 30)
+
+
 def get_couleur_temp(temp, t_min, t_max, t_ideal):
     if temp > t_max:             return ORANGE
     if temp < t_min:             return ROUGE
@@ -166,64 +300,235 @@ def dessiner_roue(centre, rayon, angle, kappa):
 
 # Centre de la zone roue (panneau droit, x 290-780 → cx=535, zone y 20-390 → cy=205)
 CX, CY = 535, 210
+ZONE_ROUE = pygame.Rect(CX - RAYON_ROUE, CY - RAYON_ROUE,
+                        2 * RAYON_ROUE + 1, 2 * RAYON_ROUE + 11)   # Trace de glissement comprise
+ZONE_GLISSEMENT = None        # Hauteurs tirées des polices (initialiser())
+ZONE_COMPTEURS = None
+ZONE_LECTURE = pygame.Rect(290, 390, 490, 60)
+BARRE_LECTURE = pygame.Rect(ZONE_LECTURE.x + 10, ZONE_LECTURE.y + 34, ZONE_LECTURE.w - 20, 12)
+
+
+# ──────────────────────────────────────────────
+class TableauDeBord:
+    """
+    Rendu par zones sales. Le fond (cadres, titres) est dessiné une fois;
+    chaque élément dynamique est une zone (nom, rectangle, signature,
+    dessin) qui n'est redessinée que si sa signature change, ou si elle
+    chevauche une zone redessinée ou la fumée de l'image précédente.
+    Seuls les rectangles modifiés sont envoyés à l'écran.
+    """
+
+    def __init__(self, surface):
+        self.surface = surface
+        self.fond = self._dessiner_fond()
+        self.signatures = {}
+        self.sales = []
+        self.zone_particules = None
+        self.invalider()
+
+    def _dessiner_fond(self):
+        self.surface.fill(BLANC)
+        for x, y, largeur, lignes in (INFO_VITESSE, INFO_PNEU):
+            dessiner_cadre_info(x, y, largeur, lignes)
+        for x, y, titre in (JAUGE_ACCEL, JAUGE_FREIN):
+            self.surface.blit(rendre_texte(font_small, titre, NOIR), (x, y - 20))
+        return self.surface.copy()
+
+    def invalider(self):
+        """Force un redessin complet (première image, fenêtre exposée)."""
+        self.surface.blit(self.fond, (0, 0))
+        self.signatures.clear()
+        self.sales = [self.surface.get_rect()]
+
+    def dessiner(self, zones):
+        """
+        Redessine les zones qui ont changé, dans l'ordre donné.
+
+        Args:
+            zones: Liste de (nom, rect, signature, fonction de dessin)
+        """
+        a_redessiner = [self.signatures.get(nom) != signature
+                        for nom, _, signature, _ in zones]
+        rects = [rect for (_, rect, _, _), sale in zip(zones, a_redessiner) if sale]
+        if self.zone_particules is not None:
+            rects.append(self.zone_particules)
+
+        # Une zone qui en chevauche une autre à effacer doit être redessinée
+        propagation = True
+        while propagation:
+            propagation = False
+            for i, (_, rect, _, _) in enumerate(zones):
+                if not a_redessiner[i] and rect.collidelist(rects) != -1:
+                    a_redessiner[i] = True
+                    rects.append(rect)
+                    propagation = True
+
+        for rect in rects:
+            self.surface.blit(self.fond, rect, rect)
+        for (nom, _, signature, dessin), sale in zip(zones, a_redessiner):
+            if sale:
+                dessin()
+                self.signatures[nom] = signature
+        self.sales.extend(rects)
+
+    def afficher(self, zone_particules=None):
+        """
+        Envoie les zones modifiées à l'écran.
+
+        Args:
+            zone_particules: Rectangle de la fumée dessinée par-dessus
+                (effacé à l'image suivante)
+        """
+        if zone_particules is not None:
+            self.sales.append(zone_particules)
+        self.zone_particules = zone_particules
+        pygame.display.update(self.sales)
+        self.sales = []
+
+
+tableau = None
+
+
+def initialiser():
+    """
+    Initialise pygame, ouvre la fenêtre et crée les objets qui en dépendent
+    (polices, zones mesurées sur les polices, particules, tableau de bord).
+    Sans effet si c'est déjà fait.
+    """
+    global screen, font, font_small, particules, tableau, ZONE_GLISSEMENT, ZONE_COMPTEURS
+    if screen is not None:
+        return
+    pygame.init()
+    pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+    screen = pygame.display.set_mode((LARGEUR, HAUTEUR))
+    pygame.display.set_caption("Simulation Roue F1")
+
+    font       = pygame.font.SysFont("Arial", 20, bold=True)
+    font_small = pygame.font.SysFont("Arial", 16)
+    ZONE_GLISSEMENT = pygame.Rect(20, 255, 250, font.get_linesize())
+    ZONE_COMPTEURS = pygame.Rect(20, 290, 250, LIGNES_COMPTEURS * font_small.get_linesize() + 10)
+
+    particules = PoolParticules()
+    tableau = TableauDeBord(screen)
+
+
+def dessiner_bouton(btn, couleur, texte, decalage_x):
+    pygame.draw.rect(screen, couleur, btn, border_radius=RAYON_ARRONDI)
+    pygame.draw.rect(screen, NOIR,    btn, 3, border_radius=RAYON_ARRONDI)
+    screen.blit(rendre_texte(font, texte, BLANC), (btn.x + decalage_x, btn.y + 16))
+
+
+def dessiner_compteurs(lignes):
+    pygame.draw.rect(screen, GRIS_CLAIR, ZONE_COMPTEURS)
+    pygame.draw.rect(screen, GRIS_FONCE, ZONE_COMPTEURS, 1)
+    for i, ligne in enumerate(lignes[:LIGNES_COMPTEURS]):
+        screen.blit(rendre_texte(font_small, ligne, GRIS_FONCE),
+                    (ZONE_COMPTEURS.x + 8, ZONE_COMPTEURS.y + 5 + i * font_small.get_linesize()))
+
+
+def format_duree(secondes):
+    minutes, secondes = divmod(max(secondes, 0.0), 60.0)
+    heures, minutes = divmod(int(minutes), 60)
+    return f"{heures}:{minutes:02d}:{secondes:04.1f}" if heures else f"{minutes}:{secondes:04.1f}"
+
+
+def dessiner_lecture(t, debut, fin, vitesse, pause):
+    fraction = (t - debut) / (fin - debut) if fin > debut else 1.0
+    etat = "pause" if pause else f"×{vitesse:g}"
+    texte = f"{format_duree(t - debut)} / {format_duree(fin - debut)}   {etat}"
+    screen.blit(rendre_texte(font_small, texte, NOIR), (ZONE_LECTURE.x + 10, ZONE_LECTURE.y + 8))
+    pygame.draw.rect(screen, GRIS, BARRE_LECTURE, border_radius=4)
+    pygame.draw.rect(screen, BLEU, (BARRE_LECTURE.x, BARRE_LECTURE.y,
+                                    int(BARRE_LECTURE.w * fraction), BARRE_LECTURE.h),
+                     border_radius=4)
+    pygame.draw.rect(screen, GRIS_FONCE, BARRE_LECTURE, 1, border_radius=4)
+
 
 def dessiner_interface(etat, kappa, accel_val, frein_val,
                         sl_accel, sl_frein,
                         btn_accel, btn_frein,
                         input_accel, input_frein,
-                        w_reelle=None):
-    screen.fill(BLANC)
+                        w_reelle=None, lignes_compteurs=None, lecture=None):
     vx, _, temp_ext, temp_int, usure = etat
 
     # ── Info vitesse ───────────────────────────
     vr_str = f"{w_reelle * phys.RAYON * 3.6:.1f} km/h" if w_reelle is not None else "--"
-    dessiner_info_box(20, 20, 250, [
+    textes_vitesse = (
         ("Vitesse véhicule", f"{vx*3.6:.1f} km/h", BLEU),
         ("Vitesse roue",     vr_str,                BLEU),
-    ])
+    )
 
     # ── Info temp / usure ──────────────────────
     c_ext = get_couleur_temp(temp_ext, 80, 110, phys.TEMP_IDEALE)
     c_int = get_couleur_temp(temp_int, 70, 100, 90)
     c_usu = ROUGE if usure > 0.5 else ORANGE if usure > 0.2 else VERT
-    dessiner_info_box(20, 115, 250, [
+    textes_pneu = (
         ("Temp. surface",  f"{temp_ext:.1f} °C",  c_ext),
         ("Temp. carcasse", f"{temp_int:.1f} °C",  c_int),
         ("Usure pneu",     f"{usure*100:.1f} %",  c_usu),
-    ])
+    )
 
     # ── Glissement ─────────────────────────────
     c_k = ORANGE if abs(kappa) > SEUIL_GLISS_COL else BLEU if kappa < -0.05 else GRIS_FONCE
-    screen.blit(font.render(f"Glissement: {kappa*100:.1f} %", True, c_k), (20, 255))
-
-    # ── Roue (centrée dans la moitié droite) ───
-    dessiner_roue((CX, CY), RAYON_ROUE, etat[1], kappa)
+    texte_k = f"Glissement: {kappa*100:.1f} %"
 
-    # ── Jauges ─────────────────────────────────
-    dessiner_jauge(40,  490, LARGEUR_JAUGE, HAUTEUR_JAUGE, accel_val, VERT,  "Accélération")
-    dessiner_jauge(520, 490, LARGEUR_JAUGE, HAUTEUR_JAUGE, frein_val, ROUGE, "Freinage")
-
-    # ── Sliders ────────────────────────────────
-    sl_accel.draw(screen)
-    sl_frein.draw(screen)
+    # ── Roue: les rayons sont identiques à 1/NOMBRE_RAYONS de tour près
+    angle = etat[1] % (2 * math.pi / NOMBRE_RAYONS)
 
     # ── Boutons ────────────────────────────────
     col_a = VERT  if accel_val > 0 else GRIS
     col_f = ROUGE if frein_val > 0 else GRIS
-    pygame.draw.rect(screen, col_a, btn_accel, border_radius=RAYON_ARRONDI)
-    pygame.draw.rect(screen, NOIR,  btn_accel, 3, border_radius=RAYON_ARRONDI)
-    pygame.draw.rect(screen, col_f, btn_frein, border_radius=RAYON_ARRONDI)
-    pygame.draw.rect(screen, NOIR,  btn_frein, 3, border_radius=RAYON_ARRONDI)
-    screen.blit(font.render("ACCÉLÉRER", True, BLANC),
-                (btn_accel.x + 52, btn_accel.y + 16))
-    screen.blit(font.render("FREINER",   True, BLANC),
-                (btn_frein.x  + 65, btn_frein.y  + 16))
+
+    xa, ya, _ = JAUGE_ACCEL
+    xf, yf, _ = JAUGE_FREIN
+    zones = [
+        ("vitesse", interieur_info(*INFO_VITESSE), textes_vitesse,
+         lambda: dessiner_textes_info(INFO_VITESSE[0], INFO_VITESSE[1], textes_vitesse)),
+        ("pneu", interieur_info(*INFO_PNEU), textes_pneu,
+         lambda: dessiner_textes_info(INFO_PNEU[0], INFO_PNEU[1], textes_pneu)),
+        ("glissement", ZONE_GLISSEMENT, (texte_k, c_k),
+         lambda: screen.blit(rendre_texte(font, texte_k, c_k), ZONE_GLISSEMENT.topleft)),
+        ("roue", ZONE_ROUE, (round(angle, 3), round(kappa, 3)),
+         lambda: dessiner_roue((CX, CY), RAYON_ROUE, etat[1], kappa)),
+        ("jauge_accel", pygame.Rect(xa, ya, LARGEUR_JAUGE, HAUTEUR_JAUGE),
+         int(LARGEUR_JAUGE * accel_val),
+         lambda: dessiner_jauge(xa, ya, LARGEUR_JAUGE, HAUTEUR_JAUGE, accel_val, VERT)),
+        ("jauge_frein", pygame.Rect(xf, yf, LARGEUR_JAUGE, HAUTEUR_JAUGE),
+         int(LARGEUR_JAUGE * frein_val),
+         lambda: dessiner_jauge(xf, yf, LARGEUR_JAUGE, HAUTEUR_JAUGE, frein_val, ROUGE)),
+        ("slider_accel", sl_accel.zone, sl_accel.val, lambda: sl_accel.draw(screen)),
+        ("slider_frein", sl_frein.zone, sl_frein.val, lambda: sl_frein.draw(screen)),
+        ("bouton_accel", btn_accel, col_a,
+         lambda: dessiner_bouton(btn_accel, col_a, "ACCÉLÉRER", 52)),
+        ("bouton_frein", btn_frein, col_f,
+         lambda: dessiner_bouton(btn_frein, col_f, "FREINER", 65)),
+    ]
+    if lignes_compteurs is not None:
+        zones.append(("compteurs", ZONE_COMPTEURS, tuple(lignes_compteurs),
+                      lambda: dessiner_compteurs(lignes_compteurs)))
+    if lecture is not None:
+        # lecture = (t, debut, fin, vitesse, pause); redessinée au dixième de seconde
+        zones.append(("lecture", ZONE_LECTURE, (round(lecture[0], 1), *lecture[1:]),
+                      lambda: dessiner_lecture(*lecture)))
+    tableau.dessiner(zones)
 
 
 # ──────────────────────────────────────────────
-def main():
+def main(arguments=None):
+    """
+    Simulation interactive.
+
+    Args:
+        arguments: Options de la ligne de commande (sys.argv[1:] par défaut)
+    """
+    if arguments is None:
+        arguments = sys.argv[1:]
+    initialiser()
     clock = pygame.time.Clock()
-    etat  = phys.ETAT_INITIAL.copy()
+
+    # Physique à pas fixe dans son propre fil, indépendante du rendu
+    fil = FilPhysique(phys.ETAT_INITIAL, frequence=FREQUENCE_PHYSIQUE)
+    fil.start()
 
     accel_val    = 0.0
     frein_val    = 0.0
@@ -238,13 +543,31 @@ def main():
     sl_accel = Slider(40,  510, LARGEUR_BOUTON, val=0.5, couleur=VERT,  label="Seuil gaz")
     sl_frein = Slider(520, 510, LARGEUR_BOUTON, val=0.5, couleur=ROUGE, label="Seuil frein")
 
+    # Compteurs: F3 affiche la surimpression; --compteurs FICHIER les relève
+    # dès le départ et écrit le rapport à la fermeture
+    fichier_compteurs = None
+    if "--compteurs" in arguments:
+        fichier_compteurs = arguments[arguments.index("--compteurs") + 1]
+        compteurs.activer()
+    afficher_compteurs = False
+    lignes_compteurs = []
+    prochain_resume = 0.0
+
     running = True
     while running:
         dt = clock.tick(FPS) / 1000.0
+        compteurs.debut_image()
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                tableau.invalider()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                afficher_compteurs = not afficher_compteurs
+                compteurs.activer(afficher_compteurs or fichier_compteurs is not None)
+                prochain_resume = 0.0
+                tableau.invalider()
 
             sl_accel.handle_event(event)
             sl_frein.handle_event(event)
@@ -263,41 +586,36 @@ def main():
                 if event.key in (pygame.K_w, pygame.K_UP):   input_accel = False
                 if event.key in (pygame.K_s, pygame.K_DOWN): input_frein = False
 
+        compteurs.fin_phase("evenements")
+
         # Cible = valeur du slider si bouton enfoncé, sinon 0
         cible_a = sl_accel.val if input_accel else 0.0
         cible_f = sl_frein.val if input_frein else 0.0
         accel_val += (cible_a - accel_val) * VITESSE_LISSAGE
         frein_val += (cible_f - frein_val) * VITESSE_LISSAGE
 
-        # Physique
-        m_a = phys.get_couple_moteur(accel_val)
-        m_f = phys.get_couple_frein(frein_val)
-
-        def wrapper(t, y):
-            y[0] = max(0, y[0])
-            y[4] = max(0, min(1, y[4]))
-            return phys.derivee(t, y, m_a, m_f)
-
-        try:
-            sol = solve_ivp(wrapper, (0, dt), etat, method='RK45', max_step=dt/5)
-            if sol.success:
-                etat = sol.y[:, -1].tolist()
-        except Exception:
-            pass
-
-        vx, w = etat[0], etat[1]
-        v_ref = max(abs(vx), abs(phys.RAYON * w), 0.5)
-        kappa = (phys.RAYON * w - vx) / v_ref
+        # Physique: pédales envoyées au fil, lecture du dernier instantané
+        fil.envoyer_pedales(accel_val, frein_val)
+        if fil.erreur is not None:
+            raise fil.erreur
+        instantane = fil.instantane
+
+        etat = list(instantane.etat)
+        w = etat[1]
+        kappa = instantane.kappa
         angle_cumule += w * dt
 
         if abs(kappa) > SEUIL_GLISS:
-            for _ in range(int(abs(kappa) * 5)):
-                px = CX + random.randint(-15, 15)
-                py = CY + RAYON_ROUE
-                particules.append(Particule(px, py, -1 if kappa > 0 else 1))
+            particules.emettre(CX, CY + RAYON_ROUE, -1 if kappa > 0 else 1,
+                               int(abs(kappa) * 5))
 
         etat_aff    = etat.copy()
         etat_aff[1] = angle_cumule
+        compteurs.fin_phase("physique")
+
+        if afficher_compteurs and instantane.t >= prochain_resume:
+            lignes_compteurs = compteurs.lignes_resume()
+            prochain_resume = instantane.t + PERIODE_COMPTEURS
 
         dessiner_interface(
             etat_aff, kappa,
@@ -305,17 +623,172 @@ def main():
             sl_accel, sl_frein,
             btn_accel, btn_frein,
             input_accel, input_frein,
-            w_reelle=etat[1]
+            w_reelle=etat[1],
+            lignes_compteurs=lignes_compteurs if afficher_compteurs else None
         )
+        compteurs.fin_phase("dessin")
+
+        particules.update()
+        zone_particules = particules.draw(screen)
+        compteurs.fin_phase("particules")
+        tableau.afficher(zone_particules)
+        compteurs.fin_phase("flip")
+
+    fil.arreter()
+    if fichier_compteurs is not None:
+        compteurs.ecrire(fichier_compteurs)
+    pygame.quit()
+    sys.exit()
+
+
+# ──────────────────────────────────────────────
+def relecture(dossier):
+    """
+    Rejoue un enregistrement de télémétrie sans re-simuler.
+
+    Contrôles: Espace pause (reprise au début en fin d'enregistrement),
+    + / - vitesse (0.1× à 50×), ← / → saut de SAUT_COURT s (Maj:
+    SAUT_LONG), Début / Fin, , / . échantillon précédent / suivant (met en
+    pause), clic ou glisser sur la barre de temps.
+
+    Args:
+        dossier: Dossier écrit par EnregistreurTelemetrie
+    """
+    from telemetrie import LecteurTelemetrie
+    lecteur = LecteurTelemetrie(dossier)
+    initialiser()
+    pygame.display.set_caption(f"Simulation Roue F1 — relecture {dossier}")
+    clock = pygame.time.Clock()
+
+    btn_accel = pygame.Rect(40,  540, LARGEUR_BOUTON, HAUTEUR_BOUTON)
+    btn_frein = pygame.Rect(520, 540, LARGEUR_BOUTON, HAUTEUR_BOUTON)
+    # Les sliders montrent les pédales enregistrées (sans effet en relecture)
+    sl_accel = Slider(40,  510, LARGEUR_BOUTON, val=0.0, couleur=VERT,  label="Gaz")
+    sl_frein = Slider(520, 510, LARGEUR_BOUTON, val=0.0, couleur=ROUGE, label="Frein")
+
+    t = lecteur.debut
+    indice_vitesse = VITESSES_LECTURE.index(1.0)
+    pause = False
+    glisser = False
+    angle_cumule = 0.0
+    afficher_compteurs = False
+    lignes_compteurs = []
+    prochain_resume = 0.0
+
+    def instant_barre(x):
+        fraction = (x - BARRE_LECTURE.x) / BARRE_LECTURE.w
+        return lecteur.debut + max(0.0, min(1.0, fraction)) * (lecteur.fin - lecteur.debut)
+
+    running = True
+    while running:
+        dt = clock.tick(FPS) / 1000.0
+        compteurs.debut_image()
+        t_precedent = t
+        saut = False
 
-        particules[:] = [p for p in particules if p.update()]
-        for p in particules: p.draw(screen)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                tableau.invalider()
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                if BARRE_LECTURE.inflate(0, 16).collidepoint(event.pos):
+                    glisser = True
+                    t, saut = instant_barre(event.pos[0]), True
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                glisser = False
+            elif event.type == pygame.MOUSEMOTION and glisser:
+                t, saut = instant_barre(event.pos[0]), True
+            elif event.type == pygame.KEYDOWN:
+                long = event.mod & pygame.KMOD_SHIFT
+                if event.key == pygame.K_SPACE:
+                    pause = not pause
+                    if not pause and t >= lecteur.fin:
+                        t, saut = lecteur.debut, True
+                elif event.key in (pygame.K_PLUS, pygame.K_KP_PLUS, pygame.K_EQUALS):
+                    indice_vitesse = min(indice_vitesse + 1, len(VITESSES_LECTURE) - 1)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    indice_vitesse = max(indice_vitesse - 1, 0)
+                elif event.key == pygame.K_RIGHT:
+                    t, saut = t + (SAUT_LONG if long else SAUT_COURT), True
+                elif event.key == pygame.K_LEFT:
+                    t, saut = t - (SAUT_LONG if long else SAUT_COURT), True
+                elif event.key == pygame.K_HOME:
+                    t, saut = lecteur.debut, True
+                elif event.key == pygame.K_END:
+                    t, saut = lecteur.fin, True
+                elif event.key in (pygame.K_PERIOD, pygame.K_COMMA):
+                    # Image par image: échantillon enregistré suivant / précédent
+                    pause = True
+                    i = lecteur.indice(t)
+                    if event.key == pygame.K_PERIOD:
+                        i = min(i + 1, lecteur.nombre_lignes - 1)
+                    elif float(lecteur.t[i]) >= t:
+                        i = max(i - 1, 0)
+                    t, saut = float(lecteur.t[i]), True
+                elif event.key == pygame.K_F3:
+                    afficher_compteurs = not afficher_compteurs
+                    compteurs.activer(afficher_compteurs)
+                    prochain_resume = 0.0
+                    tableau.invalider()
+
+        compteurs.fin_phase("evenements")
+
+        if not pause and not saut:
+            t += dt * VITESSES_LECTURE[indice_vitesse]
+        t = min(max(t, lecteur.debut), lecteur.fin)
+        if t >= lecteur.fin and not saut:
+            pause = True
+        valeurs = lecteur.echantillon(t)
+
+        etat = [valeurs["vx"], valeurs["w"], valeurs["temp_ext"],
+                valeurs["temp_int"], valeurs["usure"]]
+        kappa = valeurs["kappa"]
+        sl_accel.val, sl_frein.val = valeurs["accel"], valeurs["frein"]
+
+        # Angle et fumée suivent le temps rejoué; figés en pause et aux sauts
+        if not saut:
+            angle_cumule += etat[1] * (t - t_precedent)
+        anime = t != t_precedent and not saut
+        if anime and abs(kappa) > SEUIL_GLISS:
+            particules.emettre(CX, CY + RAYON_ROUE, -1 if kappa > 0 else 1,
+                               int(abs(kappa) * 5))
+        elif saut:
+            particules.vider()
+
+        etat_aff    = etat.copy()
+        etat_aff[1] = angle_cumule
+        compteurs.fin_phase("lecture")
+
+        if afficher_compteurs and t >= prochain_resume:
+            lignes_compteurs = compteurs.lignes_resume()
+            prochain_resume = t + PERIODE_COMPTEURS
+
+        dessiner_interface(
+            etat_aff, kappa,
+            valeurs["accel"], valeurs["frein"],
+            sl_accel, sl_frein,
+            btn_accel, btn_frein,
+            valeurs["accel"] > 0, valeurs["frein"] > 0,
+            w_reelle=etat[1],
+            lignes_compteurs=lignes_compteurs if afficher_compteurs else None,
+            lecture=(t, lecteur.debut, lecteur.fin, VITESSES_LECTURE[indice_vitesse], pause)
+        )
+        compteurs.fin_phase("dessin")
 
-        pygame.display.flip()
+        if anime:
+            particules.update()
+        zone_particules = particules.draw(screen)
+        compteurs.fin_phase("particules")
+        tableau.afficher(zone_particules)
+        compteurs.fin_phase("flip")
 
     pygame.quit()
     sys.exit()
 
 
 if __name__ == "__main__":
+    # Relecture: python simulation_visuelle.py --relecture telemetrie/
+    if "--relecture" in sys.argv[1:]:
+        relecture(sys.argv[sys.argv.index("--relecture") + 1])
     main()
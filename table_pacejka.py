@@ -0,0 +1,151 @@
+import functools
+
+import numpy as np
+
+
+# ==================== TABLES DE LA MAGIC FORMULA ====================
+# La courbe normalisée sin(C atan(B k - E (B k - atan(B k)))) ne dépend que
+# de (B, C, E). On la tabule une fois sur kappa ∈ [-1, 1] puis on interpole
+# linéairement, ce qui remplace deux atan et un sin par une lecture de table.
+#
+# La force vaut D * courbe(kappa) avec D = friction * charge * g: elle est
+# linéaire en friction, donc une table (kappa, friction) se réduit exactement
+# à la table 1D multipliée par la friction (voir force_normalisee).
+
+KAPPA_MIN = -1.0
+KAPPA_MAX = 1.0
+POINTS_INITIAUX = 257           # Taille de départ (2^n + 1 points)
+POINTS_MAX = 2**20 + 1          # Taille au-delà de laquelle on abandonne
+TOLERANCE_DEFAUT = 1e-4         # Erreur max tolérée sur la courbe normalisée
+SUR_ECHANTILLONNAGE = 8         # Points de contrôle par intervalle de la table
+
+
+def courbe_normalisee(kappa, pac_b, pac_c, pac_e):
+    """
+    Magic Formula normalisée (pic à 1), calcul analytique.
+
+    Args:
+        kappa: Taux de glissement (scalaire ou tableau)
+        pac_b, pac_c, pac_e: Coefficients de Pacejka
+    Returns:
+        Force normalisée entre -1 et 1
+    """
+    argument = pac_b * kappa
+    correction = pac_e * (argument - np.atan(argument))
+    return np.sin(pac_c * np.atan(argument - correction))
+
+
+class TablePacejka:
+    """
+    Courbe de Pacejka normalisée tabulée sur une grille régulière de kappa.
+    L'erreur d'interpolation maximale est mesurée à la construction.
+    """
+
+    def __init__(self, pac_b, pac_c, pac_e, nombre_points=POINTS_INITIAUX):
+        self.pac_b, self.pac_c, self.pac_e = pac_b, pac_c, pac_e
+        self.nombre_points = nombre_points
+        self.kappa = np.linspace(KAPPA_MIN, KAPPA_MAX, nombre_points)
+        self.valeurs = courbe_normalisee(self.kappa, pac_b, pac_c, pac_e)
+        self.pas = (KAPPA_MAX - KAPPA_MIN) / (nombre_points - 1)
+
+        # Copie en liste Python pour le chemin scalaire (évite l'indexation NumPy)
+        self._valeurs_liste = self.valeurs.tolist()
+        self._inverse_pas = 1.0 / self.pas
+        self._position_max = float(nombre_points - 1)
+        self.erreur_max = self._mesurer_erreur()
+
+    def _mesurer_erreur(self):
+        controle = np.linspace(KAPPA_MIN, KAPPA_MAX,
+                               (self.nombre_points - 1) * SUR_ECHANTILLONNAGE + 1)
+        exact = courbe_normalisee(controle, self.pac_b, self.pac_c, self.pac_e)
+        return float(np.max(np.abs(self.evaluer_vectorise(controle) - exact)))
+
+    def evaluer(self, kappa):
+        """
+        Interpolation scalaire de la courbe normalisée.
+
+        Args:
+            kappa: Taux de glissement (float, borné à [-1, 1])
+        Returns:
+            Force normalisée
+        """
+        # Comparaisons directes plutôt que min/max: c'est le chemin de derivee()
+        valeurs = self._valeurs_liste
+        position = (kappa - KAPPA_MIN) * self._inverse_pas
+        if not 0.0 < position < self._position_max:
+            return valeurs[-1] if position > 0.0 else valeurs[0]
+        i = int(position)
+        v0 = valeurs[i]
+        return v0 + (position - i) * (valeurs[i + 1] - v0)
+
+    def evaluer_vectorise(self, kappa):
+        """
+        Interpolation vectorisée de la courbe normalisée.
+
+        Args:
+            kappa: Tableau de taux de glissement (borné à [-1, 1])
+        Returns:
+            Tableau des forces normalisées
+        """
+        # Grille régulière: l'indice se calcule directement, sans recherche
+        position = (np.clip(kappa, KAPPA_MIN, KAPPA_MAX) - KAPPA_MIN) / self.pas
+        i = np.minimum(position.astype(np.intp), self.nombre_points - 2)
+        v0 = self.valeurs[i]
+        return v0 + (position - i) * (self.valeurs[i + 1] - v0)
+
+    def force_normalisee(self, kappa, friction):
+        """
+        Force divisée par (charge * g) pour des couples (kappa, friction).
+        Équivaut à une table 2D puisque la courbe est linéaire en friction.
+
+        Args:
+            kappa: Taux de glissement (scalaire ou tableau)
+            friction: Coefficient de friction (scalaire ou tableau)
+        Returns:
+            friction * courbe(kappa), diffusé selon les règles NumPy
+        """
+        return friction * self.evaluer_vectorise(kappa)
+
+
+@functools.lru_cache(maxsize=64)
+def obtenir_table(pac_b, pac_c, pac_e, tolerance=TOLERANCE_DEFAUT):
+    """
+    Renvoie la table de (B, C, E), construite au premier appel puis mise en
+    cache. La grille est raffinée jusqu'à ce que l'erreur maximale mesurée
+    contre la formule analytique passe sous `tolerance`.
+
+    Args:
+        pac_b, pac_c, pac_e: Coefficients de Pacejka (scalaires)
+        tolerance: Erreur maximale tolérée sur la courbe normalisée
+    Returns:
+        TablePacejka (attribut erreur_max: erreur effectivement atteinte)
+    Raises:
+        ValueError: Si la tolérance n'est pas atteinte avant POINTS_MAX
+    """
+    nombre_points = POINTS_INITIAUX
+    while True:
+        table = TablePacejka(pac_b, pac_c, pac_e, nombre_points)
+        if table.erreur_max <= tolerance:
+            return table
+        nombre_points = 2 * nombre_points - 1
+        if nombre_points > POINTS_MAX:
+            raise ValueError(f"Tolérance {tolerance} inatteignable "
+                             f"(erreur {table.erreur_max:.2e} avec {table.nombre_points} points)")
+
+
+if __name__ == "__main__":
+    import timeit
+
+    table = obtenir_table(12.0, 1.65, 0.97)
+    print(f"Table: {table.nombre_points} points, erreur max {table.erreur_max:.2e}")
+
+    kappa = 0.0731
+    n = 200000
+    t_table = timeit.timeit(lambda: table.evaluer(kappa), number=n) / n
+    t_exact = timeit.timeit(lambda: courbe_normalisee(kappa, 12.0, 1.65, 0.97), number=n) / n
+    print(f"Scalaire: table {t_table*1e6:.2f} µs, analytique {t_exact*1e6:.2f} µs")
+
+    kappas = np.random.default_rng(0).uniform(-1, 1, 100000)
+    t_table = timeit.timeit(lambda: table.evaluer_vectorise(kappas), number=20) / 20
+    t_exact = timeit.timeit(lambda: courbe_normalisee(kappas, 12.0, 1.65, 0.97), number=20) / 20
+    print(f"Vectorisé (1e5): table {t_table*1e3:.2f} ms, analytique {t_exact*1e3:.2f} ms")
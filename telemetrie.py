@@ -0,0 +1,270 @@
+import json
+import os
+
+import numpy as np
+
+import physique_roue as phys
+
+
+# ==================== TÉLÉMÉTRIE ====================
+# Enregistre l'état et les pédales dans un bloc NumPy préalloué; les
+# grandeurs intermédiaires de la physique (kappa, force, puissance, mu) sont
+# calculées d'un coup sur tout le bloc quand il est vidé, hors de la boucle
+# de simulation. Chaque bloc plein est ajouté à un fichier .npy par
+# colonne. Rien n'est gardé en listes Python: un relais de plusieurs heures
+# à 1 kHz tient sur disque, et se relit sans copie (mémoire projetée).
+#
+# Structure d'un dossier de télémétrie:
+#   <colonne>.npy   un tableau float64 (N,) par colonne de COLONNES
+#   meta.json       colonnes, nombre de lignes, décimation
+
+COLONNES = (
+    "t",                        # s
+    "vx",                       # m/s
+    "w",                        # rad/s
+    "temp_ext",                 # °C
+    "temp_int",                 # °C
+    "usure",                    # 0 à 1
+    "accel",                    # Pédale 0 à 1
+    "frein",                    # Pédale 0 à 1
+    "kappa",                    # Taux de glissement
+    "force_traction",           # N par roue
+    "puissance_friction",       # W
+    "friction",                 # Coefficient mu
+)
+
+TAILLE_BLOC = 8192              # Lignes gardées en mémoire avant écriture
+FICHIER_META = "meta.json"
+
+
+def _entete_npy(fichier, nombre_lignes):
+    # NumPy réserve de la place dans l'en-tête pour réécrire la dimension
+    # en place: on l'écrit vide à l'ouverture et on la corrige à la fermeture.
+    np.lib.format.write_array_header_1_0(fichier, {
+        "descr": np.lib.format.dtype_to_descr(np.dtype(np.float64)),
+        "fortran_order": False,
+        "shape": (nombre_lignes,),
+    })
+
+
+class EnregistreurTelemetrie:
+    """
+    Enregistreur par blocs, une colonne par fichier .npy.
+    S'utilise aussi comme gestionnaire de contexte (fermeture automatique).
+    """
+
+    def __init__(self, dossier, taille_bloc=TAILLE_BLOC, decimation=1,
+                 params=phys.PARAMETRES_DEFAUT):
+        """
+        Args:
+            dossier: Dossier de sortie (créé si besoin)
+            taille_bloc: Nombre de lignes par bloc en mémoire
+            decimation: Ne garde qu'un échantillon sur `decimation`
+            params: Jeu de paramètres utilisé pour les grandeurs calculées
+        """
+        if decimation < 1:
+            raise ValueError(f"Décimation invalide: {decimation}")
+        os.makedirs(dossier, exist_ok=True)
+        self.dossier = dossier
+        self.decimation = decimation
+        self.params = params
+        self.nombre_lignes = 0
+
+        # Bloc en lignes: ajouter() écrit une ligne contiguë
+        self._bloc = np.empty((taille_bloc, len(COLONNES)))
+        self._n = 0
+        self._compteur = 0
+
+        self._fichiers = []
+        for nom in COLONNES:
+            fichier = open(os.path.join(dossier, nom + ".npy"), "wb")
+            _entete_npy(fichier, 0)
+            self._fichiers.append(fichier)
+        self._taille_entete = self._fichiers[0].tell()
+
+    def ajouter(self, t, etat, pourcentage_accel=0.0, pourcentage_frein=0.0):
+        """
+        Ajoute un échantillon (ignoré s'il tombe entre deux décimations).
+
+        Args:
+            t: Temps en s
+            etat: [vx, w, temp_ext, temp_int, usure]
+            pourcentage_accel: Pédale d'accélérateur entre 0 et 1
+            pourcentage_frein: Pédale de frein entre 0 et 1
+        """
+        self._compteur += 1
+        if self.decimation > 1 and (self._compteur - 1) % self.decimation:
+            return
+
+        # Copie brute seulement: les grandeurs sont calculées par vider()
+        ligne = self._bloc[self._n]
+        ligne[0] = t
+        ligne[1:6] = etat
+        ligne[6] = pourcentage_accel
+        ligne[7] = pourcentage_frein
+
+        self._n += 1
+        if self._n == len(self._bloc):
+            self.vider()
+
+    def ajouter_trajectoire(self, t, y, pourcentage_accel=0.0, pourcentage_frein=0.0):
+        """
+        Ajoute une trajectoire complète (par exemple la sortie de solve_ivp).
+
+        Args:
+            t: Tableau (n,) des temps
+            y: Tableau (5, n) des états, comme solution.y
+            pourcentage_accel: Pédale d'accélérateur (scalaire ou tableau (n,))
+            pourcentage_frein: Pédale de frein (scalaire ou tableau (n,))
+        """
+        accel = np.broadcast_to(pourcentage_accel, np.shape(t))
+        frein = np.broadcast_to(pourcentage_frein, np.shape(t))
+        for i, etat in enumerate(np.asarray(y).T):
+            self.ajouter(float(t[i]), etat, float(accel[i]), float(frein[i]))
+
+    def vider(self):
+        """
+        Calcule les grandeurs du bloc courant (vectorisé) et l'écrit à la
+        fin des fichiers de colonnes.
+        """
+        if not self._n:
+            return
+        p = self.params
+        bloc = self._bloc[:self._n]
+        grandeurs = phys.calculer_grandeurs_vectorise(
+            bloc[:, 1:6], phys.get_couple_moteur(bloc[:, 6], p),
+            phys.get_couple_frein(bloc[:, 7], p), p)
+        for i, colonne in enumerate(grandeurs, start=8):
+            bloc[:, i] = colonne
+        for i, fichier in enumerate(self._fichiers):
+            np.ascontiguousarray(self._bloc[:self._n, i]).tofile(fichier)
+        self.nombre_lignes += self._n
+        self._n = 0
+
+    def fermer(self):
+        """Vide le dernier bloc, fixe la taille des fichiers et écrit meta.json."""
+        if not self._fichiers:
+            return
+        self.vider()
+        for fichier in self._fichiers:
+            fichier.seek(0)
+            _entete_npy(fichier, self.nombre_lignes)
+            if fichier.tell() != self._taille_entete:
+                raise RuntimeError(f"En-tête .npy redimensionné: {fichier.name}")
+            fichier.close()
+        self._fichiers = []
+
+        with open(os.path.join(self.dossier, FICHIER_META), "w") as fichier:
+            json.dump({"colonnes": list(COLONNES),
+                       "lignes": self.nombre_lignes,
+                       "decimation": self.decimation}, fichier, indent=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+
+def ouvrir_telemetrie(dossier):
+    """
+    Ouvre un enregistrement en mémoire projetée (lecture seule, sans copie).
+
+    Args:
+        dossier: Dossier écrit par EnregistreurTelemetrie
+    Returns:
+        Dictionnaire nom de colonne -> np.memmap (N,)
+    """
+    with open(os.path.join(dossier, FICHIER_META)) as fichier:
+        meta = json.load(fichier)
+    return {nom: np.load(os.path.join(dossier, nom + ".npy"), mmap_mode="r")
+            for nom in meta["colonnes"]}
+
+
+class LecteurTelemetrie:
+    """
+    Relecture d'un enregistrement par le temps, sans le charger. Les
+    colonnes restent en mémoire projetée: seules les pages lues quittent le
+    disque, et trouver un instant est une dichotomie sur la colonne t
+    (O(log n) lectures), quelle que soit la longueur du roulage.
+    """
+
+    # Colonnes nécessaires à la relecture (état, pédales, glissement)
+    COLONNES_RELECTURE = ("t", "vx", "w", "temp_ext", "temp_int", "usure",
+                          "accel", "frein", "kappa")
+
+    def __init__(self, dossier):
+        """
+        Args:
+            dossier: Dossier écrit par EnregistreurTelemetrie
+        Raises:
+            ValueError: Si une colonne nécessaire manque ou si
+                l'enregistrement est vide
+        """
+        self.colonnes = ouvrir_telemetrie(dossier)
+        manquantes = set(self.COLONNES_RELECTURE) - set(self.colonnes)
+        if manquantes:
+            raise ValueError(f"Colonnes absentes de la télémétrie: {', '.join(sorted(manquantes))}")
+        self.t = self.colonnes["t"]
+        self.nombre_lignes = len(self.t)
+        if not self.nombre_lignes:
+            raise ValueError(f"Enregistrement vide: {dossier}")
+        self.debut = float(self.t[0])
+        self.fin = float(self.t[-1])
+
+    def indice(self, t):
+        """Indice du dernier échantillon à l'instant t ou avant (borné au fichier)."""
+        i = int(np.searchsorted(self.t, t, side="right")) - 1
+        return min(max(i, 0), self.nombre_lignes - 1)
+
+    def ligne(self, i):
+        """Échantillon i: dictionnaire colonne -> valeur."""
+        return {nom: float(self.colonnes[nom][i]) for nom in self.COLONNES_RELECTURE}
+
+    def echantillon(self, t):
+        """
+        Valeurs à l'instant t, interpolées linéairement entre les deux
+        échantillons qui l'encadrent.
+
+        Args:
+            t: Instant en s (ramené dans [debut, fin])
+        Returns:
+            Dictionnaire colonne -> valeur (colonnes de COLONNES_RELECTURE)
+        """
+        t = min(max(t, self.debut), self.fin)
+        i = self.indice(t)
+        if i + 1 >= self.nombre_lignes:
+            return self.ligne(i)
+        avant, apres = self.ligne(i), self.ligne(i + 1)
+        ecart = apres["t"] - avant["t"]
+        fraction = (t - avant["t"]) / ecart if ecart > 0.0 else 0.0
+        return {nom: avant[nom] + fraction * (apres[nom] - avant[nom]) for nom in avant}
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from integrateur import IntegrateurFixe
+
+    dossier = os.path.join(tempfile.gettempdir(), "telemetrie_demo")
+    integrateur = IntegrateurFixe(phys.derivee, phys.ETAT_INITIAL, frequence=1000.0)
+    moment_accel = phys.get_couple_moteur(1.0)
+
+    debut = time.perf_counter()
+    with EnregistreurTelemetrie(dossier, decimation=10) as enregistreur:
+        for _ in range(20000):
+            etat = integrateur.avancer(integrateur.pas, moment_accel, 0.0)
+            enregistreur.ajouter(integrateur.t, etat, 1.0, 0.0)
+    print(f"20 s à 1 kHz enregistrés en {time.perf_counter() - debut:.2f}s "
+          f"({enregistreur.nombre_lignes} lignes)")
+
+    colonnes = ouvrir_telemetrie(dossier)
+    lecteur = LecteurTelemetrie(dossier)
+    instants = np.random.default_rng(0).uniform(lecteur.debut, lecteur.fin, 10000)
+    debut = time.perf_counter()
+    for t in instants:
+        lecteur.echantillon(t)
+    print(f"Accès aléatoire par le temps: {(time.perf_counter() - debut) / len(instants) * 1e6:.1f} µs")
+    print(f"Vitesse max {colonnes['vx'].max()*3.6:.1f} km/h, "
+          f"kappa max {colonnes['kappa'].max():.3f}, "
+          f"surface max {colonnes['temp_ext'].max():.1f}°C")
@@ -0,0 +1,47 @@
+from dataclasses import replace
+
+import numpy as np
+
+import calibration as cal
+import physique_roue as phys
+from integrateur import IntegrateurFixe
+
+
+# Un jeu de paramètres qui diverge dans la population ne doit pas arrêter
+# l'évaluation: il reçoit COUT_INVALIDE et l'ajustement va à son terme.
+
+def mesures_synthetiques(duree=0.5, intervalle=0.05):
+    t = np.arange(0.0, duree + 0.5 * intervalle, intervalle)
+    integrateur = IntegrateurFixe(phys.derivee, phys.ETAT_INITIAL, frequence=1000.0)
+    etats = [np.array(phys.ETAT_INITIAL, dtype=float)]
+    for _ in t[1:]:
+        etats.append(integrateur.avancer(intervalle, phys.get_couple_moteur(1.0), 0.0).copy())
+    etats = np.array(etats)
+    return {"t": t, "accel": np.ones_like(t), "frein": np.zeros_like(t),
+            "vx": etats[:, 0], "w": etats[:, 1], "temp_ext": etats[:, 2]}
+
+
+def test_jeu_divergent_invalide():
+    mesures = mesures_synthetiques()
+    params = replace(phys.PARAMETRES_DEFAUT, capacite_surface=np.array([3000.0, 1e-3]))
+    erreurs = cal.erreurs_normalisees(cal.simuler_traces(params, mesures), mesures)
+    assert np.all(erreurs[0] < 1e-6)
+    assert np.all(erreurs[1] == cal.COUT_INVALIDE)
+
+
+def test_calibration_avec_candidats_divergents(monkeypatch):
+    couts = []
+    erreurs_normalisees = cal.erreurs_normalisees
+
+    def erreurs_relevees(traces, mesures):
+        erreurs = erreurs_normalisees(traces, mesures)
+        couts.extend(erreurs.mean(axis=1))
+        return erreurs
+
+    monkeypatch.setattr(cal, "erreurs_normalisees", erreurs_relevees)
+    # Capacité de surface sous ~0.05: la température de surface diverge
+    resultat = cal.calibrer(mesures_synthetiques(), {"capacite_surface": (1e-3, 0.2)},
+                            population=4, iterations_max=2)
+    assert cal.COUT_INVALIDE in couts
+    assert np.isfinite(resultat["cout"])
+    assert resultat["cout"] < cal.COUT_INVALIDE
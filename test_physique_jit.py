@@ -0,0 +1,100 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+import physique_jit as jit
+import physique_roue as phys
+
+
+# Parité des noyaux de physique_jit avec physique_roue. Sans Numba, les
+# noyaux tournent en Python pur et sont testés de la même façon.
+
+P = jit.vecteur_parametres(phys.PARAMETRES_DEFAUT)
+
+
+def etats_aleatoires(n, graine=0):
+    rng = np.random.default_rng(graine)
+    etats = np.column_stack([
+        rng.uniform(0.0, 90.0, n),
+        rng.uniform(0.0, 300.0, n),
+        rng.uniform(40.0, 150.0, n),
+        rng.uniform(40.0, 130.0, n),
+        rng.uniform(0.0, 0.8, n),
+    ])
+    # Une partie en basse vitesse et à l'arrêt
+    etats[: n // 4, :2] *= 0.004
+    etats[n // 4: n // 4 + 5, :2] = 0.0
+    return etats
+
+
+def test_fonctions_elementaires():
+    for vx, w, temp, usure in etats_aleatoires(200)[:, [0, 1, 2, 4]]:
+        mu = phys.calculer_friction(temp, usure)
+        kappa = phys.calculer_glissement(vx, w)
+        assert jit.friction(temp, usure, P) == pytest.approx(mu, rel=1e-13)
+        assert jit.glissement(vx, w, P) == pytest.approx(kappa, rel=1e-13, abs=1e-15)
+        assert jit.force_traction(kappa, 250.0, mu, P) == pytest.approx(
+            phys.calculer_force_traction(kappa, 250.0, mu), rel=1e-12, abs=1e-9)
+
+
+@pytest.mark.parametrize("accel, frein", [(1.0, 0.0), (0.3, 0.0), (0.0, 1.0), (0.5, 0.5)])
+def test_derivee(accel, frein):
+    moment_accel = phys.get_couple_moteur(accel)
+    moment_frein = phys.get_couple_frein(frein)
+    D = np.empty(5)
+    for X in etats_aleatoires(300):
+        attendu = phys.derivee(0.0, X.tolist(), moment_accel, moment_frein)
+        jit.derivee_noyau(X, moment_accel, moment_frein, P, D)
+        np.testing.assert_allclose(D, attendu, rtol=1e-12, atol=1e-12)
+
+
+def test_derivee_autres_parametres():
+    params = replace(phys.PARAMETRES_DEFAUT, pac_b=9.0, mu_0=1.5, transfert_air=80.0)
+    D = np.empty(5)
+    for X in etats_aleatoires(100, graine=1):
+        jit.derivee_noyau(X, 3000.0, 100.0, jit.vecteur_parametres(params), D)
+        np.testing.assert_allclose(D, phys.derivee(0.0, X.tolist(), 3000.0, 100.0, params),
+                                   rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("etat, accel, frein", [
+    (phys.ETAT_INITIAL, 1.0, 0.0),
+    ([60.0, 60.0 / phys.RAYON, 95.0, 85.0, 0.0], 0.0, 1.0),
+])
+def test_integration(etat, accel, frein):
+    moment_accel = phys.get_couple_moteur(accel)
+    moment_frein = phys.get_couple_frein(frein)
+    reference, trajectoire_ref = jit.integrer(etat, 3.0, moment_accel, moment_frein,
+                                              decimation=100, backend="python")
+    # Noyau appelé directement: integrer(backend="numba") exige Numba
+    X = np.array(etat, dtype=float)
+    trajectoire = np.empty((30, 5))
+    assert jit.integrer_noyau(X, moment_accel, moment_frein, P, 1e-3, 3000, 100,
+                              trajectoire) == 30
+    np.testing.assert_allclose(X, reference, rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(trajectoire, trajectoire_ref, rtol=1e-9, atol=1e-9)
+
+
+def test_selection_backend():
+    with pytest.raises(ValueError):
+        jit.definir_backend("fortran")
+    with pytest.raises(ValueError):
+        jit.integrer(phys.ETAT_INITIAL, 0.01, 1000.0, 0.0, backend="fortran")
+    if not jit.NUMBA_DISPONIBLE:
+        with pytest.raises(ValueError):
+            jit.integrer(phys.ETAT_INITIAL, 0.01, 1000.0, 0.0, backend="numba")
+    jit.definir_backend("python")
+    try:
+        assert jit.backend_actif() == "python"
+        assert jit.derivee(0.0, phys.ETAT_INITIAL, 1000.0, 0.0) == \
+            phys.derivee(0.0, phys.ETAT_INITIAL, 1000.0, 0.0)
+    finally:
+        jit.definir_backend("auto")
+
+
+def test_pacejka_tabulee_reste_en_python():
+    params = replace(phys.PARAMETRES_DEFAUT, pacejka_tabulee=True)
+    X = [30.0, 95.0, 100.0, 90.0, 0.0]
+    assert list(jit.derivee(0.0, X, 2000.0, 0.0, params)) == \
+        list(phys.derivee(0.0, X, 2000.0, 0.0, params))
@@ -1,48 +1,188 @@
+import sys
 import physique_roue as phys
-from scipy.integrate import solve_ivp
 import numpy as np
 
-# Paramètres de simulation
-temps_simulation = 10.0
-intervalle_temps = (0, temps_simulation)
-t_eval = np.linspace(0, temps_simulation, 1000)
-
-# État initial
-etat_initial = phys.ETAT_INITIAL
-
-# Pourcentages des pédales (entre 0 et 1)
-pourcentage_accel = 1.0
-pourcentage_frein = 0.0
-
-
-def wrapper_derivee(t, X):
-    X_corrige = list(X)
-    X_corrige[4] = max(0, min(1, abs(X_corrige[4])))
-    
-    accel = phys.get_couple_moteur(pourcentage_accel)
-    frein = phys.get_couple_frein(pourcentage_frein)
-    
-    return phys.derivee(t, X_corrige, accel, frein)
-
-
-# Résolution
-solution = solve_ivp(
-    wrapper_derivee,
-    intervalle_temps,
-    etat_initial,
-    method='RK45',
-    t_eval=t_eval,
-    max_step=0.01
-)
-
-# Résultats
-if solution.success:
-    print("✓ Simulation réussie!")
-    print(f"\nRésultats après {temps_simulation}s:")
-    print(f"  Vitesse véhicule: {solution.y[0][-1]*3.6:.1f} km/h")
-    print(f"  Vitesse angulaire: {solution.y[1][-1]:.2f} rad/s")
-    print(f"  Température surface: {solution.y[2][-1]:.1f}°C")
-    print(f"  Température carcasse: {solution.y[3][-1]:.1f}°C")
-    print(f"  Usure pneu: {abs(solution.y[4][-1])*100:.2f}%")
-else:
-    print("✗ Échec de la simulation:", solution.message)
+
+def main(arguments=None):
+    """
+    Simulation en ligne de commande (SciPy n'est importé que par les modes
+    qui l'utilisent).
+
+    Args:
+        arguments: Options de la ligne de commande (sys.argv[1:] par défaut)
+    """
+    if arguments is None:
+        arguments = sys.argv[1:]
+
+    # Paramètres de simulation
+    temps_simulation = 10.0
+    if "--duree" in arguments:
+        temps_simulation = float(arguments[arguments.index("--duree") + 1])
+    intervalle_temps = (0, temps_simulation)
+    t_eval = np.linspace(0, temps_simulation, 1000)
+
+    # État initial
+    etat_initial = phys.ETAT_INITIAL
+
+    # Pourcentages des pédales (entre 0 et 1)
+    pourcentage_accel = 1.0
+    pourcentage_frein = 0.0
+
+    # Mode raide: python test_simulation.py --raide [Radau|BDF]
+    # Solveur implicite avec jacobienne analytique, intégré par segments
+    mode_raide = "--raide" in arguments
+    methode_raide = "BDF" if "BDF" in arguments else "Radau"
+
+    # Profil de pédales enregistré: python test_simulation.py --profil trace.csv
+    # (colonnes t, accel, frein; lu par blocs, remplace les pourcentages fixes)
+    profil = None
+    if "--profil" in arguments:
+        from profils_pilote import ProfilPedales
+        profil = ProfilPedales(arguments[arguments.index("--profil") + 1])
+
+    # Instrumentation: python test_simulation.py --compteurs rapport.json
+    # (appels de la dérivée par régime, bornages, pas et rejets du solveur)
+    fichier_compteurs = None
+    methode, methode_raide_classe = 'RK45', methode_raide
+    if "--compteurs" in arguments:
+        import compteurs
+        import scipy.integrate
+        fichier_compteurs = arguments[arguments.index("--compteurs") + 1]
+        compteurs.activer()
+        methode = compteurs.solveur_compte(scipy.integrate.RK45)
+        methode_raide_classe = compteurs.solveur_compte(getattr(scipy.integrate, methode_raide))
+
+
+    def wrapper_derivee(t, X):
+        X_corrige = list(X)
+        X_corrige[4] = max(0, min(1, abs(X_corrige[4])))
+
+        if profil is not None:
+            accel, frein = profil.couples(t)
+        else:
+            accel = phys.get_couple_moteur(pourcentage_accel)
+            frein = phys.get_couple_frein(pourcentage_frein)
+
+        return phys.derivee(t, X_corrige, accel, frein)
+
+
+    # Résolution
+    if mode_raide and profil is not None:
+        succes, message = False, "le mode raide utilise des pédales constantes (pas de --profil)"
+    elif mode_raide:
+        from integration_evenements import integrer_par_segments
+        try:
+            solution = integrer_par_segments(
+                etat_initial,
+                temps_simulation,
+                phys.get_couple_moteur(pourcentage_accel),
+                phys.get_couple_frein(pourcentage_frein),
+                method=methode_raide_classe,
+                jacobienne=True
+            )
+            succes, message = True, ""
+        except RuntimeError as erreur:
+            succes, message = False, str(erreur)
+    else:
+        from scipy.integrate import solve_ivp
+        solution = solve_ivp(
+            wrapper_derivee,
+            intervalle_temps,
+            etat_initial,
+            method=methode,
+            t_eval=t_eval,
+            max_step=0.01
+        )
+        succes, message = solution.success, solution.message
+    if profil is not None:
+        profil.fermer()
+
+    # Résultats
+    if succes:
+        print("✓ Simulation réussie!")
+        print(f"\nRésultats après {temps_simulation}s:")
+        print(f"  Vitesse véhicule: {solution.y[0][-1]*3.6:.1f} km/h")
+        print(f"  Vitesse angulaire: {solution.y[1][-1]:.2f} rad/s")
+        print(f"  Température surface: {solution.y[2][-1]:.1f}°C")
+        print(f"  Température carcasse: {solution.y[3][-1]:.1f}°C")
+        print(f"  Usure pneu: {abs(solution.y[4][-1])*100:.2f}%")
+        print(f"  Évaluations de la dérivée: {solution.nfev}")
+
+        if fichier_compteurs is not None:
+            compteurs.compter("evaluations_solveur", solution.nfev)
+            compteurs.ecrire(fichier_compteurs)
+            print("\nCompteurs:")
+            for ligne in compteurs.lignes_resume():
+                print(f"  {ligne}")
+            print(f"  Rapport complet: {fichier_compteurs}")
+
+        # Télémétrie: python test_simulation.py --enregistrer DOSSIER
+        if "--enregistrer" in arguments:
+            from telemetrie import EnregistreurTelemetrie
+            dossier = arguments[arguments.index("--enregistrer") + 1]
+            if profil is not None:
+                # Relecture depuis le début (le profil de la résolution est fermé)
+                relecture = ProfilPedales(profil.chemin)
+                try:
+                    pedales = np.array([relecture.valeurs(t) for t in solution.t])
+                finally:
+                    relecture.fermer()
+                accel_trace, frein_trace = pedales[:, 0], pedales[:, 1]
+            else:
+                accel_trace, frein_trace = pourcentage_accel, pourcentage_frein
+            with EnregistreurTelemetrie(dossier) as enregistreur:
+                enregistreur.ajouter_trajectoire(solution.t, solution.y, accel_trace, frein_trace)
+            print(f"  Télémétrie: {enregistreur.nombre_lignes} lignes dans {dossier}")
+    else:
+        print("✗ Échec de la simulation:", message)
+
+    # Incertitude: python test_simulation.py --monte-carlo 1000
+    # (paramètres pneu et thermiques tirés selon monte_carlo.DISTRIBUTIONS_DEFAUT)
+    if "--monte-carlo" in arguments:
+        from monte_carlo import executer_monte_carlo
+        nombre = int(arguments[arguments.index("--monte-carlo") + 1])
+        bandes = executer_monte_carlo(nombre, temps_simulation, intervalle=temps_simulation,
+                                      pourcentage_accel=pourcentage_accel,
+                                      pourcentage_frein=pourcentage_frein, processus=None)
+        v, T, u = bandes["vitesse"][-1] * 3.6, bandes["temp_surface"][-1], bandes["usure"][-1] * 100
+        print(f"\nMonte Carlo ({nombre} tirages), percentiles 5 / 50 / 95 à {temps_simulation}s:")
+        print(f"  Vitesse véhicule: {v[0]:.1f} / {v[2]:.1f} / {v[4]:.1f} km/h")
+        print(f"  Température surface: {T[0]:.1f} / {T[2]:.1f} / {T[4]:.1f}°C")
+        print(f"  Usure pneu: {u[0]:.2f} / {u[2]:.2f} / {u[4]:.2f}%")
+        if bandes["divergees"][-1]:
+            print(f"  Tirages divergés (exclus): {bandes['divergees'][-1]}")
+
+    # Régime permanent: python test_simulation.py --equilibre 250 [--glissement 0.08]
+    # (point fixe thermique à vitesse constante, glissement de croisière par défaut)
+    if "--equilibre" in arguments:
+        from equilibre import regime_permanent
+        vitesse = float(arguments[arguments.index("--equilibre") + 1]) / 3.6
+        glissement = (float(arguments[arguments.index("--glissement") + 1])
+                      if "--glissement" in arguments else None)
+        try:
+            regime = regime_permanent(vitesse, glissement)
+            print(f"\nRégime permanent à {vitesse * 3.6:.1f} km/h "
+                  f"({regime['iterations']} itérations de Newton):")
+            print(f"  Glissement: {regime['kappa']:.4f}, friction {regime['friction']:.3f}, "
+                  f"puissance {regime['puissance_friction'] / 1e3:.2f} kW")
+            print(f"  Température surface: {regime['etat'][2]:.1f}°C, "
+                  f"carcasse {regime['etat'][3]:.1f}°C")
+        except (ValueError, RuntimeError) as erreur:
+            print(f"\n✗ Régime permanent introuvable: {erreur}")
+
+    # Avance rapide: python test_simulation.py --avance-rapide 600
+    # (croisière de 600 s à la vitesse atteinte en fin de simulation)
+    if "--avance-rapide" in arguments and succes:
+        from equilibre import avance_rapide
+        duree = float(arguments[arguments.index("--avance-rapide") + 1])
+        try:
+            fin = avance_rapide(solution.y[:, -1], duree)
+            print(f"\nAvance rapide: {duree:.0f}s de croisière à {fin[0] * 3.6:.1f} km/h")
+            print(f"  Température surface: {fin[2]:.1f}°C, carcasse {fin[3]:.1f}°C")
+            print(f"  Usure pneu: {fin[4] * 100:.2f}%")
+        except RuntimeError as erreur:
+            print(f"\n✗ Avance rapide impossible: {erreur}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+import numpy as np
+from scipy.linalg import solve_banded
+
+import physique_roue as phys
+from integrateur import IntegrateurMultiCadence
+
+
+# ==================== THERMIQUE RADIALE À N NOEUDS ====================
+# La gomme est découpée en N couches dans son épaisseur. Le noeud 0 est la
+# surface: il reçoit la puissance de glissement et cède de la chaleur à
+# l'air. Le noeud N est la carcasse (avec la jante), en contact avec la
+# dernière couche de gomme et refroidie par l'air comme dans le modèle à
+# deux masses.
+#
+#   air ── [0] ── [1] ── ... ── [N-1] ── [carcasse] ── air
+#          ↑ puissance_friction
+#
+# La conduction est raide quand N grandit: chaque pas est implicite (Euler
+# arrière), et la matrice (C/h + K) est tridiagonale, résolue par
+# solve_banded en O(N). Avec N = 1 et une conductance de bande infinie, on
+# retrouve le modèle à deux masses de physique_roue.
+
+NOEUDS = 50
+CONDUCTANCE_BANDE = 600.0       # Conductance de toute l'épaisseur de gomme en W/K
+FREQUENCE_THERMIQUE = 100.0     # Pas thermiques par seconde (IntegrateurRadial)
+
+
+class ThermiqueRadiale:
+    """
+    Profil de température à travers la bande de roulement, plus la carcasse.
+    """
+
+    def __init__(self, noeuds=NOEUDS, temp_surface=phys.ETAT_INITIAL[2],
+                 temp_carcasse=phys.ETAT_INITIAL[3], params=phys.PARAMETRES_DEFAUT,
+                 conductance_bande=CONDUCTANCE_BANDE):
+        """
+        Args:
+            noeuds: Nombre de couches de gomme N
+            temp_surface: Température initiale de la surface en °C
+            temp_carcasse: Température initiale de la carcasse en °C
+            params: Jeu de paramètres (capacités et transferts du modèle à
+                deux masses, répartis sur les couches)
+            conductance_bande: Conductance de l'épaisseur de gomme en W/K
+                (np.inf: gomme isotherme, seulement avec noeuds=1)
+        Raises:
+            ValueError: Nombre de noeuds invalide, ou conductance infinie
+                avec plusieurs couches
+        """
+        if noeuds < 1:
+            raise ValueError(f"Nombre de noeuds invalide: {noeuds}")
+        if np.isinf(conductance_bande) and noeuds > 1:
+            raise ValueError("Conductance de bande infinie possible avec un seul noeud")
+        self.noeuds = noeuds
+        self.params = params
+
+        # Profil initial linéaire de la surface vers la carcasse
+        self.temperatures = np.empty(noeuds + 1)
+        self.temperatures[:noeuds] = np.linspace(temp_surface, temp_carcasse, noeuds + 1)[:-1]
+        self.temperatures[noeuds] = temp_carcasse
+
+        self.capacites = np.full(noeuds + 1, params.capacite_surface / noeuds)
+        self.capacites[noeuds] = params.capacite_carcasse
+
+        # Liens i -> i+1: couches pleines entre deux noeuds de gomme, puis
+        # demi-couche en série avec le contact gomme/carcasse
+        self.conductances = np.full(noeuds, conductance_bande * noeuds)
+        self.conductances[-1] = 1.0 / (1.0 / (2.0 * conductance_bande * noeuds)
+                                       + 1.0 / params.transfert_interne)
+
+        # Diagonale de K (conduction + convection), constante
+        self.diagonale = np.zeros(noeuds + 1)
+        self.diagonale[:-1] += self.conductances
+        self.diagonale[1:] += self.conductances
+        self.diagonale[0] += params.transfert_air
+        self.diagonale[noeuds] += params.transfert_air
+
+        self._pas_matrice = None
+        self._matrice = np.empty((3, noeuds + 1))
+        self._second_membre = np.empty(noeuds + 1)
+
+    @property
+    def temp_surface(self):
+        return self.temperatures[0]
+
+    @property
+    def temp_carcasse(self):
+        return self.temperatures[-1]
+
+    def _matrice_bande(self, h):
+        # (C/h + K) au format de solve_banded, recalculée si le pas change
+        if h != self._pas_matrice:
+            self._matrice[0, 0] = 0.0
+            self._matrice[0, 1:] = -self.conductances
+            self._matrice[1] = self.capacites / h + self.diagonale
+            self._matrice[2, :-1] = -self.conductances
+            self._matrice[2, -1] = 0.0
+            self._pas_matrice = h
+        return self._matrice
+
+    def pas(self, puissance_friction, h):
+        """
+        Avance le profil d'un pas implicite (Euler arrière).
+
+        Args:
+            puissance_friction: Puissance de glissement moyenne sur le pas en W
+            h: Durée du pas en s
+        Returns:
+            Tableau (N + 1,) des températures (surface ... carcasse), partagé
+        """
+        p = self.params
+        b = self._second_membre
+        np.multiply(self.capacites / h, self.temperatures, out=b)
+        b[0] += puissance_friction + p.transfert_air * p.temp_ambiante
+        b[-1] += p.transfert_air * p.temp_ambiante
+        self.temperatures[:] = solve_banded((1, 1), self._matrice_bande(h), b,
+                                            overwrite_b=True, check_finite=False)
+        return self.temperatures
+
+
+class IntegrateurRadial(IntegrateurMultiCadence):
+    """
+    Intégrateur multi-cadence dont le pas thermique est le modèle radial.
+    L'état [vx, w, temp_ext, temp_int, usure] reste celui du reste du code:
+    temp_ext est le noeud de surface, temp_int la carcasse.
+    """
+
+    def __init__(self, etat_initial, noeuds=NOEUDS, frequence_rapide=1000.0,
+                 frequence_lente=FREQUENCE_THERMIQUE, params=phys.PARAMETRES_DEFAUT,
+                 conductance_bande=CONDUCTANCE_BANDE, t0=0.0):
+        """
+        Args:
+            etat_initial: [vx, w, temp_ext, temp_int, usure]
+            noeuds: Nombre de couches de gomme N
+            frequence_rapide: Fréquence des sous-pas mécaniques en Hz
+            frequence_lente: Fréquence des pas thermiques implicites en Hz
+            params: Jeu de paramètres
+            conductance_bande: Conductance de l'épaisseur de gomme en W/K
+            t0: Temps initial en s
+        """
+        super().__init__(etat_initial, frequence_rapide, frequence_lente, params, t0)
+        self.thermique = ThermiqueRadiale(noeuds, etat_initial[2], etat_initial[3], params,
+                                          conductance_bande)
+
+    def _pas_thermique(self, etat, puissance):
+        temperatures = self.thermique.pas(puissance, self.pas_lent)
+        etat[2] = temperatures[0]
+        etat[3] = temperatures[-1]
+
+
+if __name__ == "__main__":
+    import time
+
+    # Pleine accélération 8 s puis freinage appuyé 4 s, comparé au modèle
+    # à deux masses (même intégrateur multi-cadence)
+    phases = ((8.0, phys.get_couple_moteur(1.0), 0.0), (4.0, 0.0, phys.get_couple_frein(0.9)))
+    deux_masses = IntegrateurMultiCadence(phys.ETAT_INITIAL, 1000.0, FREQUENCE_THERMIQUE)
+    radial = IntegrateurRadial(phys.ETAT_INITIAL, NOEUDS)
+    for duree, moment_accel, moment_frein in phases:
+        deux_masses.avancer(duree, moment_accel, moment_frein)
+        radial.avancer(duree, moment_accel, moment_frein)
+
+    T = radial.thermique.temperatures
+    print(f"Deux masses : surface {deux_masses.etat[2]:6.1f}°C  carcasse {deux_masses.etat[3]:6.1f}°C")
+    print(f"Radial N={NOEUDS}: surface {T[0]:6.1f}°C  carcasse {T[-1]:6.1f}°C")
+    print("Profil dans l'épaisseur (surface -> carcasse): "
+          + " ".join(f"{t:.0f}" for t in T[:-1:NOEUDS // 10]) + f" | {T[-1]:.0f}")
+
+    # Équivalence N = 1 avec une gomme isotherme
+    un_noeud = IntegrateurRadial(phys.ETAT_INITIAL, 1, conductance_bande=np.inf)
+    un_noeud.avancer(8.0, phys.get_couple_moteur(1.0), 0.0)
+    reference = IntegrateurMultiCadence(phys.ETAT_INITIAL, 1000.0, FREQUENCE_THERMIQUE)
+    reference.avancer(8.0, phys.get_couple_moteur(1.0), 0.0)
+    print(f"N=1 isotherme contre deux masses: écart max "
+          f"{np.abs(un_noeud.etat - reference.etat).max():.2e}")
+
+    # Coût du pas thermique seul: linéaire en N
+    for noeuds in (10, 50, 200, 1000):
+        thermique = ThermiqueRadiale(noeuds)
+        debut = time.perf_counter()
+        for _ in range(2000):
+            thermique.pas(5000.0, 1.0 / FREQUENCE_THERMIQUE)
+        print(f"N={noeuds:5d}: {(time.perf_counter() - debut) / 2000 * 1e6:6.1f} µs par pas thermique")
+
+    # Budget temps réel: 1 s simulée (mécanique 1 kHz + thermique N=50)
+    debut = time.perf_counter()
+    radial.avancer(1.0, phys.get_couple_moteur(0.5), 0.0)
+    print(f"1 s simulée avec N={NOEUDS} en {(time.perf_counter() - debut) * 1e3:.1f} ms")
@@ -0,0 +1,228 @@
+from dataclasses import fields, replace
+
+import numpy as np
+
+import physique_roue as phys
+
+
+# ==================== MODÈLE QUATRE ROUES ====================
+# Chaque roue a sa vitesse de rotation, ses deux températures et son usure;
+# le véhicule partage sa vitesse vx. Une grille de M voitures est un seul
+# tableau contigu (M, TAILLE_ETAT) intégré par une dérivée vectorisée:
+#
+#   colonne 0        vx
+#   colonnes 1-4     w         (AVG, AVD, ARG, ARD)
+#   colonnes 5-8     temp_ext
+#   colonnes 9-12    temp_int
+#   colonnes 13-16   usure
+#
+# Par rapport à derivee(): charge statique et appui répartis entre essieux,
+# transfert de charge longitudinal (hauteur du centre de gravité), couple
+# moteur et freinage répartis avant/arrière. Avec des répartitions à 0.5 et
+# une hauteur de CG nulle, chaque roue suit exactement derivee().
+
+ROUES = 4
+NOMS_ROUES = ("AVG", "AVD", "ARG", "ARD")
+TAILLE_ETAT = 1 + 4 * ROUES
+
+VX = 0
+W = slice(1, 5)
+TEMP_EXT = slice(5, 9)
+TEMP_INT = slice(9, 13)
+USURE = slice(13, 17)
+
+# Masques d'essieu, appliqués à une part "avant" f: [f/2, f/2, (1-f)/2, (1-f)/2]
+AVANT = np.array([1.0, 1.0, 0.0, 0.0])
+ARRIERE = np.array([0.0, 0.0, 1.0, 1.0])
+
+
+def repartir(part_avant):
+    """
+    Répartition par roue d'une part avant/arrière.
+
+    Args:
+        part_avant: Part sur l'essieu avant (scalaire ou tableau (M, 1))
+    Returns:
+        Tableau (4,) ou (M, 4) dont chaque ligne somme à 1
+    """
+    return AVANT * (0.5 * part_avant) + ARRIERE * (0.5 - 0.5 * part_avant)
+
+
+def etats_initiaux(nombre_voitures, etat_roue=phys.ETAT_INITIAL):
+    """
+    Construit le tableau d'état d'une grille de voitures identiques.
+
+    Args:
+        nombre_voitures: M
+        etat_roue: État [vx, w, temp_ext, temp_int, usure] copié sur chaque roue
+    Returns:
+        Tableau (M, TAILLE_ETAT) contigu
+    """
+    vx, w, temp_ext, temp_int, usure = etat_roue
+    X = np.empty((nombre_voitures, TAILLE_ETAT))
+    X[:, VX] = vx
+    X[:, W] = w
+    X[:, TEMP_EXT] = temp_ext
+    X[:, TEMP_INT] = temp_int
+    X[:, USURE] = usure
+    return X
+
+
+def borner_vehicules(X):
+    """Projection de IntegrateurFixe pour un tableau (M, TAILLE_ETAT) (sur place)."""
+    np.maximum(X[:, VX], 0.0, out=X[:, VX])
+    np.clip(X[:, USURE], 0.0, 1.0, out=X[:, USURE])
+
+
+# Dernier jeu converti (source, résultat): un intégrateur rappelle la dérivée
+# avec le même objet à chaque sous-pas; la source est gardée en référence
+# pour que son id ne puisse pas être réutilisé.
+_dernier_params = (None, None)
+
+
+def _params_par_voiture(params):
+    # Les champs tableaux (M,) de empiler_parametres deviennent (M, 1) pour
+    # se diffuser sur les colonnes de roues
+    global _dernier_params
+    source, resultat = _dernier_params
+    if source is params:
+        return resultat
+    tableaux = {champ.name: np.asarray(getattr(params, champ.name))[:, None]
+                for champ in fields(params) if np.ndim(getattr(params, champ.name)) == 1}
+    resultat = replace(params, **tableaux) if tableaux else params
+    _dernier_params = (params, resultat)
+    return resultat
+
+
+def derivee_vehicules(X, moment_accel, moment_frein, params=phys.PARAMETRES_DEFAUT):
+    """
+    Dérivées d'une grille de M voitures à quatre roues en une passe.
+
+    Args:
+        X: Tableau (M, TAILLE_ETAT) des états
+        moment_accel: Couple moteur total en N.m, scalaire ou tableau (M,)
+        moment_frein: Couple de frein nominal par roue en N.m (comme
+            derivee), scalaire ou tableau (M,); réparti selon repartition_frein
+        params: Jeu de paramètres (champs scalaires ou tableaux (M,))
+    Returns:
+        Tableau (M, TAILLE_ETAT) des dérivées temporelles
+    """
+    p = _params_par_voiture(params)
+    X = np.asarray(X, dtype=float)
+    vx = X[:, VX:VX + 1]                     # (M, 1)
+    w = X[:, W]                              # (M, 4)
+    temp_ext, temp_int, usure = X[:, TEMP_EXT], X[:, TEMP_INT], X[:, USURE]
+    moment_accel = np.reshape(np.asarray(moment_accel, dtype=float), (-1, 1))
+    moment_frein = np.reshape(np.asarray(moment_frein, dtype=float), (-1, 1))
+
+    # Régime par voiture: basse vitesse si le véhicule et toutes ses roues
+    # sont sous le seuil
+    basse_vitesse = ((vx < p.vitesse_min_dynamique) &
+                     (p.rayon * w.max(axis=1, keepdims=True) < p.vitesse_min_dynamique))
+
+    mu = phys.calculer_friction(temp_ext, usure, p)
+    charge_statique = p.masse_vehicule * repartir(p.repartition_masse)
+    moments_frein = moment_frein * ROUES * repartir(p.repartition_frein)
+
+    # ---------- Régime basse vitesse (roues solidaires du véhicule) ----------
+    force_friction_max = np.sum(mu * charge_statique, axis=1, keepdims=True) * p.gravite
+    force_nette = (moment_accel / p.rayon
+                   - np.sum(moments_frein, axis=1, keepdims=True) / p.rayon
+                   - p.coeff_roulement * p.masse_vehicule * p.gravite)
+    force_nette = np.clip(force_nette, -force_friction_max, force_friction_max)
+    dvx_bv = np.where((vx > p.vitesse_min_mouvement) | (force_nette > 0),
+                      force_nette / p.masse_vehicule, 0.0)
+    dw_bv = np.where(vx > p.vitesse_min_rotation, dvx_bv / p.rayon, 0.0)
+
+    # ---------- Régime dynamique ----------
+    charge = charge_statique + (p.coeff_appui * vx**2 / p.gravite) * repartir(p.repartition_appui)
+    kappa = phys.calculer_glissement_vectorise(vx, w, p)
+
+    force_trainee = p.coeff_trainee * vx**2
+    force_roulement = p.coeff_roulement * np.sum(charge, axis=1, keepdims=True) * p.gravite
+
+    # Transfert de charge: l'accélération dépend des forces, qui dépendent
+    # des charges. Une itération de point fixe depuis les charges sans
+    # transfert suffit (variation lente de vx devant la dynamique des roues).
+    force = phys.calculer_force_traction(kappa, charge, mu, p)
+    acceleration = (np.sum(force, axis=1, keepdims=True) - force_trainee
+                    - force_roulement) / p.masse_vehicule
+    transfert = p.masse_vehicule * acceleration * p.hauteur_cg / (p.empattement * p.gravite)
+    charge = np.maximum(charge + 0.5 * transfert * (ARRIERE - AVANT), 0.0)
+    force = phys.calculer_force_traction(kappa, charge, mu, p)
+
+    # Couple moteur limité en puissance (vitesse moyenne des roues motrices)
+    repartition_couple = repartir(p.repartition_couple)
+    w_motrices = np.sum(w * repartition_couple, axis=1, keepdims=True)
+    en_rotation = w_motrices > p.vitesse_min_rotation
+    w_sur = np.where(en_rotation, w_motrices, 1.0)
+    moment_effectif = np.where(en_rotation,
+                               np.minimum(moment_accel, p.puissance_max / w_sur),
+                               moment_accel)
+    moments_moteur = moment_effectif * repartition_couple
+
+    dvx_dyn = (np.sum(force, axis=1, keepdims=True) - force_trainee
+               - force_roulement) / p.masse_vehicule
+    dw_dyn = (moments_moteur - moments_frein - force * p.rayon) / p.inertie
+
+    # Sécurités anti-vitesses négatives
+    dw_dyn = np.where((w <= p.vitesse_min_rotation) & (dw_dyn < 0), 0.0, dw_dyn)
+    dvx_dyn = np.where((vx <= p.vitesse_min_rotation) & (dvx_dyn < 0), 0.0, dvx_dyn)
+
+    puissance_friction = np.where(basse_vitesse, 0.0, np.abs(force * (p.rayon * w - vx)))
+    abs_kappa = np.abs(kappa)
+    dusure = np.where(~basse_vitesse & (abs_kappa > p.seuil_usure),
+                      abs_kappa**2 / p.facteur_usure, 0.0)
+
+    # ---------- Assemblage ----------
+    D = np.empty_like(X)
+    D[:, VX:VX + 1] = np.where(basse_vitesse, dvx_bv, dvx_dyn)
+    D[:, W] = np.where(basse_vitesse, dw_bv, dw_dyn)
+    D[:, TEMP_EXT], D[:, TEMP_INT] = phys.calculer_flux_thermiques(
+        temp_ext, temp_int, puissance_friction, p)
+    D[:, USURE] = dusure
+    return D
+
+
+def derivee_plate(t, y, moment_accel, moment_frein, params=phys.PARAMETRES_DEFAUT):
+    """
+    derivee_vehicules sur un vecteur plat (M * TAILLE_ETAT,), pour solve_ivp.
+    """
+    return derivee_vehicules(y.reshape(-1, TAILLE_ETAT), moment_accel, moment_frein,
+                             params).ravel()
+
+
+if __name__ == "__main__":
+    import time
+    from integrateur import IntegrateurFixe
+
+    # Équivalence avec derivee() en configuration symétrique
+    symetrique = replace(phys.PARAMETRES_DEFAUT, hauteur_cg=0.0, repartition_masse=0.5,
+                         repartition_appui=0.5, repartition_couple=0.5,
+                         repartition_frein=0.5)
+    etat = [40.0, 40.0 / phys.RAYON * 1.05, 98.0, 88.0, 0.01]
+    reference = phys.derivee(0.0, etat, 3000.0, 200.0, symetrique)
+    D = derivee_vehicules(etats_initiaux(1, etat), 3000.0, 200.0, symetrique)[0]
+    ecart = max(abs(D[VX] - reference[0]),
+                *(abs(D[bloc] - reference[i + 1]).max()
+                  for i, bloc in enumerate((W, TEMP_EXT, TEMP_INT, USURE))))
+    print(f"Écart avec derivee() en configuration symétrique: {ecart:.1e}")
+
+    # Grille: freinage depuis 80 m/s, répartition de freinage balayée
+    repartitions = np.linspace(0.4, 0.8, 256)
+    params = phys.empiler_parametres([replace(phys.PARAMETRES_DEFAUT, repartition_frein=r)
+                                      for r in repartitions])
+    X0 = etats_initiaux(len(repartitions), [80.0, 80.0 / phys.RAYON, 95.0, 85.0, 0.0])
+    integrateur = IntegrateurFixe(
+        lambda t, X, *args: derivee_vehicules(X, *args), X0,
+        frequence=1000.0, projection=borner_vehicules, sous_pas_max=10**6)
+
+    debut = time.perf_counter()
+    X = integrateur.avancer(3.0, 0.0, phys.get_couple_frein(0.8), params)
+    print(f"{len(repartitions)} voitures x 4 roues, 3 s à 1 kHz en "
+          f"{time.perf_counter() - debut:.2f}s")
+
+    print("rép. AV   vx fin.   " + "  ".join(f"T {nom}" for nom in NOMS_ROUES))
+    for i in range(0, len(repartitions), 51):
+        temperatures = "  ".join(f"{T:5.1f}" for T in X[i, TEMP_EXT])
+        print(f"  {repartitions[i]:.2f}  {X[i, VX]*3.6:6.1f}    {temperatures}")